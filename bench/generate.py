@@ -0,0 +1,96 @@
+"""Synthetic tox.ini generators, each knob scales one dimension the formatter has to deal with."""
+
+from __future__ import annotations
+
+import itertools
+
+PYTHONS = [f"py3{i}" for i in range(15, 7, -1)]
+
+
+def env_list(*, width: int, depth: int) -> str:
+    """
+    Brace-factor env list that explodes to ``width ** depth`` environments.
+
+    :param width: number of values within a factor group
+    :param depth: number of factor groups (the first one is always the python version)
+    """
+    groups = [[PYTHONS[i % len(PYTHONS)] for i in range(width)]]
+    groups.extend([f"f{level}v{i}" for i in range(width)] for level in range(1, depth))
+    return "-".join(f"{{{','.join(group)}}}" for group in groups)
+
+
+def env_names(*, width: int, depth: int) -> list[str]:
+    """
+    Exploded form of :func:`env_list`.
+
+    :param width: number of values within a factor group
+    :param depth: number of factor groups
+    """
+    groups = [[PYTHONS[i % len(PYTHONS)] for i in range(width)]]
+    groups.extend([f"f{level}v{i}" for i in range(width)] for level in range(1, depth))
+    return ["-".join(i) for i in itertools.product(*groups)]
+
+
+def deps(count: int) -> str:
+    """
+    Unsorted dependency list with version pins, markers, a factor condition and a substitution.
+
+    :param count: number of dependencies
+    """
+    lines = [f"pkg{i}>={i % 7}.{i % 3}.0" for i in range(count, 0, -1)]
+    lines[::5] = [f'{line}; python_version > "3.9"' for line in lines[::5]]
+    lines.extend(("py313: coverage>=7.0", "{[testenv]deps}"))
+    return "\n    ".join(lines)
+
+
+def pass_env(count: int) -> str:
+    """
+    Space separated, reverse ordered environment variable names.
+
+    :param count: number of variables
+    """
+    return " ".join(f"VAR_{i}" for i in range(count, 0, -1))
+
+
+def set_env(count: int) -> str:
+    """
+    Reverse ordered environment variable assignments with irregular spacing.
+
+    :param count: number of variables
+    """
+    return "\n    ".join(f"KEY_{i}={i}" if i % 2 else f"KEY_{i} =  {i}" for i in range(count, 0, -1))
+
+
+def tox_ini(  # ruff:ignore[too-many-arguments]
+    *,
+    sections: int = 4,
+    factor_width: int = 2,
+    factor_depth: int = 2,
+    deps_count: int = 8,
+    pass_env_count: int = 4,
+    set_env_count: int = 4,
+) -> str:
+    """
+    Generate an unformatted tox.ini.
+
+    :param sections: number of ``testenv:*`` sections
+    :param factor_width: values per factor group of the env list
+    :param factor_depth: number of factor groups in the env list
+    :param deps_count: dependencies per test environment
+    :param pass_env_count: pass_env entries per test environment
+    :param set_env_count: set_env entries per test environment
+    """
+    names = env_names(width=factor_width, depth=factor_depth)
+    body = (
+        f"deps={deps(deps_count)}\n"
+        f"passenv={pass_env(pass_env_count)}\n"
+        f"setenv={set_env(set_env_count)}\n"
+        "commands=pytest {posargs} \\\n  --cov\n  coverage report\n"
+    )
+    envs = "".join(f"[testenv:{names[at % len(names)]}{at // len(names) or ''}]\n{body}" for at in range(sections))
+    return (
+        "[pytest]\naddopts = -ra\n"
+        f"{envs}"
+        f"[tox]\nminversion=3.20\nenvlist={env_list(width=factor_width, depth=factor_depth)}\nisolated_build=true\n"
+        f"[testenv]\nusedevelop=True\nbasepython=python3\n{body}"
+    )
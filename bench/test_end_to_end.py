@@ -0,0 +1,72 @@
+"""
+End to end throughput of formatting whole files, reported as bytes per second in the extra info.
+
+The transform caches are warm after the first round, as when formatting many similar files in one process; the cold
+variant clears them before every round.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from generate import tox_ini
+
+from tox_ini_fmt.formatter import format_tox_ini
+from tox_ini_fmt.formatter.memo import clear_caches
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+CORPUS = sorted((Path(__file__).parent / "corpus").glob("*.ini"))
+
+
+def _throughput(benchmark: BenchmarkFixture, text: str) -> None:
+    benchmark(format_tox_ini, text)
+    benchmark.extra_info["bytes"] = len(text.encode("utf-8"))
+    if benchmark.stats is not None:  # not measured when running with --benchmark-disable
+        benchmark.extra_info["bytes_per_second"] = round(benchmark.extra_info["bytes"] / benchmark.stats.stats.mean)
+
+
+@pytest.mark.parametrize("path", CORPUS, ids=[i.stem for i in CORPUS])
+def test_corpus(benchmark: BenchmarkFixture, path: Path) -> None:
+    benchmark.group = "end to end: corpus"
+    _throughput(benchmark, path.read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("path", CORPUS, ids=[i.stem for i in CORPUS])
+def test_corpus_cold(benchmark: BenchmarkFixture, path: Path) -> None:
+    benchmark.group = "end to end: corpus with cold caches"
+    text = path.read_text(encoding="utf-8")
+    benchmark.pedantic(format_tox_ini, setup=lambda: (clear_caches(), ((text,), {}))[1], rounds=50)
+
+
+@pytest.mark.parametrize("path", CORPUS, ids=[i.stem for i in CORPUS])
+def test_corpus_formatted(benchmark: BenchmarkFixture, path: Path) -> None:
+    benchmark.group = "end to end: corpus already formatted"
+    _throughput(benchmark, format_tox_ini(path))
+
+
+@pytest.mark.parametrize("sections", [1, 10, 100, 1000])
+def test_sections(benchmark: BenchmarkFixture, sections: int) -> None:
+    benchmark.group = "end to end: testenv sections"
+    _throughput(benchmark, tox_ini(sections=sections, factor_width=8, factor_depth=3))
+
+
+@pytest.mark.parametrize(("width", "depth"), [(2, 1), (2, 3), (4, 3), (8, 3), (4, 5)])
+def test_env_list_factors(benchmark: BenchmarkFixture, width: int, depth: int) -> None:
+    benchmark.group = "end to end: env list factor width and depth"
+    _throughput(benchmark, tox_ini(sections=1, factor_width=width, factor_depth=depth))
+
+
+@pytest.mark.parametrize("size", [1, 10, 100, 1000])
+def test_deps(benchmark: BenchmarkFixture, size: int) -> None:
+    benchmark.group = "end to end: deps per environment"
+    _throughput(benchmark, tox_ini(deps_count=size))
+
+
+@pytest.mark.parametrize("size", [1, 10, 100, 1000])
+def test_pass_env_and_set_env(benchmark: BenchmarkFixture, size: int) -> None:
+    benchmark.group = "end to end: pass_env and set_env entries per environment"
+    _throughput(benchmark, tox_ini(pass_env_count=size, set_env_count=size))
@@ -0,0 +1,42 @@
+"""Scaling of ``--jobs``: on free-threaded builds the wall time should drop as the thread count grows."""
+
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+from generate import tox_ini
+
+from tox_ini_fmt.__main__ import run
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+FILES = 64
+
+
+@pytest.fixture(scope="module")
+def tox_ini_files(tmp_path_factory: pytest.TempPathFactory) -> list[str]:
+    root = tmp_path_factory.mktemp("threads")
+    paths: list[Path] = []
+    for at in range(FILES):
+        path = root / f"tox{at}.ini"
+        path.write_text(tox_ini(sections=6 + at % 4, factor_width=6), encoding="utf-8")
+        paths.append(path)
+    return [str(i) for i in paths]
+
+
+@pytest.mark.parametrize("jobs", [1, 2, 4, 8])
+def test_jobs_scaling(
+    benchmark: BenchmarkFixture,
+    capsys: pytest.CaptureFixture[str],
+    tox_ini_files: list[str],
+    jobs: int,
+) -> None:
+    benchmark.group = f"jobs (gil {'enabled' if getattr(sys, '_is_gil_enabled', lambda: True)() else 'disabled'})"
+    benchmark.extra_info["jobs"] = jobs
+    assert benchmark(run, [*tox_ini_files, "--check", "--jobs", str(jobs)]) == 1
+    capsys.readouterr()
@@ -0,0 +1,147 @@
+"""Micro benchmarks of the individual value transforms, memoized transforms are measured through ``__wrapped__``."""
+
+from __future__ import annotations
+
+from configparser import ConfigParser
+from typing import TYPE_CHECKING
+
+import pytest
+from generate import deps, env_list, env_names, pass_env, set_env, tox_ini
+
+from tox_ini_fmt.formatter.requires import normalize_req, requires
+from tox_ini_fmt.formatter.section_order import explode_env_list, order_sections
+from tox_ini_fmt.formatter.test_env import format_test_env, to_commands, to_ordered_list, to_pass_env, to_set_env
+from tox_ini_fmt.formatter.tox_section import format_tox_section
+from tox_ini_fmt.formatter.util import (
+    _to_list_of_env_values,
+    collect_multi_line,
+    fmt_list,
+    is_substitute,
+    order_env_list,
+    to_boolean,
+    to_py_dependencies,
+)
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+SIZES = [10, 100, 1000]
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_to_py_dependencies(benchmark: BenchmarkFixture, size: int) -> None:
+    benchmark.group = "to_py_dependencies"
+    benchmark(to_py_dependencies.__wrapped__, deps(size))
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_to_py_dependencies_memo_hit(benchmark: BenchmarkFixture, size: int) -> None:
+    benchmark.group = "to_py_dependencies"
+    value = deps(size)
+    to_py_dependencies(value)
+    benchmark(to_py_dependencies, value)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_requires(benchmark: BenchmarkFixture, size: int) -> None:
+    benchmark.group = "requires"
+    benchmark(requires, deps(size).split("\n    "))
+
+
+@pytest.mark.parametrize("value", ["pytest>=7.0.0", 'xonsh>=0.9.16.0; python_version > "3.4"', "not a req!"])
+def test_normalize_req(benchmark: BenchmarkFixture, value: str) -> None:
+    benchmark.group = "normalize_req"
+    benchmark(normalize_req, value)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_collect_multi_line(benchmark: BenchmarkFixture, size: int) -> None:
+    benchmark.group = "collect_multi_line"
+    benchmark(collect_multi_line, pass_env(size))
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_to_pass_env(benchmark: BenchmarkFixture, size: int) -> None:
+    benchmark.group = "to_pass_env"
+    benchmark(to_pass_env.__wrapped__, pass_env(size))
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_to_set_env(benchmark: BenchmarkFixture, size: int) -> None:
+    benchmark.group = "to_set_env"
+    benchmark(to_set_env.__wrapped__, set_env(size))
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_to_ordered_list(benchmark: BenchmarkFixture, size: int) -> None:
+    benchmark.group = "to_ordered_list"
+    benchmark(to_ordered_list.__wrapped__, ",".join(f"extra{i}" for i in range(size, 0, -1)))
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_to_commands(benchmark: BenchmarkFixture, size: int) -> None:
+    benchmark.group = "to_commands"
+    benchmark(to_commands.__wrapped__, "\n".join(f"  cmd{i} --flag \\\n  arg{i}" for i in range(size)))
+
+
+@pytest.mark.parametrize(("width", "depth"), [(2, 2), (4, 3), (8, 3)])
+def test_to_list_of_env_values(benchmark: BenchmarkFixture, width: int, depth: int) -> None:
+    benchmark.group = "to_list_of_env_values"
+    benchmark(_to_list_of_env_values.__wrapped__, (), ",".join(env_names(width=width, depth=depth)), compact=False)
+
+
+@pytest.mark.parametrize(("width", "depth"), [(2, 2), (4, 3), (8, 3)])
+def test_explode_env_list(benchmark: BenchmarkFixture, width: int, depth: int) -> None:
+    benchmark.group = "explode_env_list"
+    benchmark(explode_env_list, env_list(width=width, depth=depth))
+
+
+@pytest.mark.parametrize(("width", "depth"), [(2, 2), (4, 3), (8, 3)])
+def test_order_env_list(benchmark: BenchmarkFixture, width: int, depth: int) -> None:
+    benchmark.group = "order_env_list"
+    names = env_names(width=width, depth=depth)
+    benchmark(order_env_list, names, [names[-1]])
+
+
+@pytest.mark.parametrize("value", ["{[testenv]deps}", "{env:HOME}", "pytest"])
+def test_is_substitute(benchmark: BenchmarkFixture, value: str) -> None:
+    benchmark.group = "is_substitute"
+    benchmark(is_substitute, value)
+
+
+def test_to_boolean(benchmark: BenchmarkFixture) -> None:
+    benchmark.group = "to_boolean"
+    benchmark(to_boolean, "True")
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_fmt_list(benchmark: BenchmarkFixture, size: int) -> None:
+    benchmark.group = "fmt_list"
+    benchmark(fmt_list, [f"v{i}" for i in range(size)], ["{[a]b}", "{[c]d}"])
+
+
+def _parser(text: str) -> ConfigParser:
+    parser = ConfigParser(interpolation=None)
+    parser.read_string(text)
+    return parser
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_format_test_env(benchmark: BenchmarkFixture, size: int) -> None:
+    benchmark.group = "format_test_env"
+    text = tox_ini(sections=0, deps_count=size, pass_env_count=size, set_env_count=size)
+    benchmark.pedantic(format_test_env, setup=lambda: ((_parser(text), "testenv"), {}), rounds=20)
+
+
+@pytest.mark.parametrize(("width", "depth"), [(2, 2), (4, 3), (8, 3)])
+def test_format_tox_section(benchmark: BenchmarkFixture, width: int, depth: int) -> None:
+    benchmark.group = "format_tox_section"
+    text = tox_ini(sections=0, factor_width=width, factor_depth=depth)
+    benchmark.pedantic(format_tox_section, setup=lambda: ((_parser(text), []), {}), rounds=20)
+
+
+@pytest.mark.parametrize("sections", [10, 100, 1000])
+def test_order_sections(benchmark: BenchmarkFixture, sections: int) -> None:
+    benchmark.group = "order_sections"
+    text = tox_ini(sections=sections, factor_width=8, factor_depth=3, deps_count=1, pass_env_count=1, set_env_count=1)
+    benchmark.pedantic(order_sections, setup=lambda: ((_parser(text), []), {}), rounds=20)
@@ -2,16 +2,44 @@
 
 from __future__ import annotations
 
+import configparser
 import difflib
+import os
 import sys
+import tarfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, suppress
+from copy import copy
+from functools import partial
+from io import BytesIO, TextIOWrapper
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
-from tox_ini_fmt.cli import cli_args
-from tox_ini_fmt.formatter import format_tox_ini
+from tox_ini_fmt.archive import tox_ini_members
+from tox_ini_fmt.cli import cli_args, tox_ini_path_error
+from tox_ini_fmt.deadline import FileTimeoutError, deadline
+from tox_ini_fmt.files_from import read_paths
+from tox_ini_fmt.formatter import (
+    SemanticChangeError,
+    format_tox_ini,
+    format_tox_ini_document,
+    to_tox_toml,
+    verify_tox_ini,
+)
+from tox_ini_fmt.git import BlobReader, toplevel, tox_ini_in_revision
+from tox_ini_fmt.memory import MemoryReport
+from tox_ini_fmt.metrics import Metrics
+from tox_ini_fmt.pipeline import ordered_map, pipeline
+from tox_ini_fmt.shard import in_shard
+from tox_ini_fmt.tracing import ChromeTracer, combine
+from tox_ini_fmt.watch import watch
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Sequence
+    from collections.abc import Callable, Generator, Iterable, Sequence
+
+    from tox_ini_fmt.cli import ToxIniFmtNamespace
+    from tox_ini_fmt.tracing import Tracer
 
 GREEN = "\u001b[32m"
 RED = "\u001b[31m"
@@ -33,6 +61,12 @@ def color_diff(diff: Iterable[str]) -> Iterable[str]:
             yield line
 
 
+class _Outcome(NamedTuple):
+    changed: bool  # the file was not formatted
+    output: str  # what to report for the file
+    error: str | None = None  # why the file could not be formatted, with --keep-going
+
+
 def run(args: Sequence[str] | None = None) -> int:
     """
     Run the formatter.
@@ -41,38 +75,256 @@ def run(args: Sequence[str] | None = None) -> int:
     :return: exit code
     """
     opts = cli_args(sys.argv[1:] if args is None else args)
-    changed = False
-    for tox_ini in opts.tox_ini:
-        with tox_ini.open("rt", encoding="utf-8") as file:
-            before = file.read()
-            original_newlines = file.newlines
-        if isinstance(original_newlines, tuple):
-            original_newlines = original_newlines[0]
-        formatted = format_tox_ini(before, opts)
-        changed |= before != formatted
-        if opts.stdout:  # stdout just prints new format to stdout
-            print(formatted, end="")  # ruff:ignore[print]
-        else:
-            if before != formatted and not opts.check:
-                with tox_ini.open("wt", encoding="utf-8", newline=original_newlines) as file:
-                    file.write(formatted)
-            try:
-                name = str(tox_ini.relative_to(Path.cwd()))
-            except ValueError:
-                name = str(tox_ini)
-            diff = (
-                difflib.unified_diff(before.splitlines(), formatted.splitlines(), fromfile=name, tofile=name)
-                if changed
-                else []
-            )
-            if diff:
-                diff_text = "\n".join(color_diff(diff))
-                print(diff_text)  # print diff on change  # ruff:ignore[print]
-            else:
-                print(f"no change for {name}")  # ruff:ignore[print]
+    tracer = combine(_tracers(opts))
+    try:
+        changed, errors = _report(opts, tracer)
+        if opts.watch:
+            with suppress(KeyboardInterrupt):
+                _watch(opts, tracer)
+            return 0
+    finally:
+        tracer.close()
+    if errors:  # argparse exits with 2 on a usage error
+        return 3
     # exit with non success on change
     return 1 if changed else 0
 
 
+def _report(opts: ToxIniFmtNamespace, tracer: Tracer) -> tuple[bool, list[str]]:
+    changed, errors = False, []
+    with closing(_format_files(opts, tracer)) as outcomes:  # closing cancels the files not yet started
+        for outcome in outcomes:
+            changed |= outcome.changed
+            print(outcome.output, end="")  # ruff:ignore[print]
+            if outcome.changed:
+                tracer.count("files_changed")
+            if outcome.error is not None:
+                tracer.count("files_failed")
+                errors.append(outcome.error)
+            if changed and opts.fail_fast:
+                break
+    if errors:
+        print(f"failed to format {len(errors)} file(s):", *errors, sep="\n  ", file=sys.stderr)  # ruff:ignore[print]
+    return changed, errors
+
+
+def _watch(opts: ToxIniFmtNamespace, tracer: Tracer) -> None:
+    # the process stays warm, so the imports and the memoized transforms are reused by every batch of changes
+    for changed in watch(opts.tox_ini):
+        batch = copy(opts)
+        batch.tox_ini = changed
+        batch.keep_going = True  # editors save mid-edit, so a file that cannot be formatted must not end the watch
+        _report(batch, tracer)
+
+
+def _tracers(opts: ToxIniFmtNamespace) -> list[Tracer]:
+    tracers: list[Tracer] = []
+    if opts.profile is not None:
+        tracers.append(ChromeTracer(opts.profile))
+    if opts.memory_report:
+        tracers.append(MemoryReport())
+    if opts.metrics is not None:
+        tracers.append(Metrics(opts.metrics))
+    return tracers
+
+
+def _format_files(opts: ToxIniFmtNamespace, tracer: Tracer) -> Generator[_Outcome]:
+    if opts.rev is not None:
+        yield from _format_revisions(opts, tracer)
+        return
+    if opts.archive:
+        yield from _format_archives(opts, tracer)
+        return
+    if opts.files_from is None:
+        yield from _format_paths(opts.tox_ini, opts, tracer)
+        return
+    invalid: list[str] = []
+    yield from _format_paths(_listed(opts, invalid), opts, tracer)
+    yield from (_Outcome(changed=False, output="", error=error) for error in invalid)
+
+
+def _listed(opts: ToxIniFmtNamespace, invalid: list[str]) -> Generator[Path]:
+    # validated as reached, as the list may be too long to hold; the ones that cannot be formatted are set aside
+    writable = not (opts.check or opts.stdout or opts.to_toml)
+    for path in read_paths(opts.files_from or "-"):
+        if opts.shard is not None and not in_shard(path, *opts.shard):
+            continue
+        if (reason := tox_ini_path_error(path, writable=writable)) is None:
+            yield path
+        else:
+            invalid.append(f"{_display_name(path)}: {reason}")
+
+
+def _format_paths(paths: Iterable[Path], opts: ToxIniFmtNamespace, tracer: Tracer) -> Generator[_Outcome]:
+    if opts.io_window is not None:
+        yield from pipeline(
+            paths,
+            window=opts.io_window,
+            load=partial(_load, tracer=tracer),
+            process=partial(_process_file, opts=opts, tracer=tracer),
+        )
+        return
+    # files share only the thread-safe transform caches and requirement parse counter, so on free-threaded builds the
+    # files can be processed in parallel; results are still yielded in the input order so the output stays deterministic
+    format_file = partial(_format_file, opts=opts, tracer=tracer)
+    if opts.jobs == 1:
+        yield from map(format_file, paths)
+        return
+    with ThreadPoolExecutor(max_workers=opts.jobs) as executor:
+        yield from ordered_map(executor, format_file, paths, window=opts.jobs * 2)
+
+
+def _format_file(tox_ini: Path, opts: ToxIniFmtNamespace, tracer: Tracer) -> _Outcome:
+    with tracer.span(str(tox_ini), "file"):
+        outcome, write = _process(tox_ini, _load(tox_ini, tracer), opts, tracer)
+        if write is not None:
+            write()
+        return outcome
+
+
+def _process_file(
+    tox_ini: Path,
+    loaded: tuple[str, str | None] | Exception,
+    opts: ToxIniFmtNamespace,
+    tracer: Tracer,
+) -> tuple[_Outcome, Callable[[], None] | None]:
+    with tracer.span(str(tox_ini), "file"):  # the load and the write back run on the I/O threads, outside of it
+        return _process(tox_ini, loaded, opts, tracer)
+
+
+def _load(tox_ini: Path, tracer: Tracer) -> tuple[str, str | None] | Exception:
+    try:
+        return _read(tox_ini, tracer)
+    except (OSError, UnicodeDecodeError) as exc:  # handed over, to be reported as the file's outcome
+        return exc
+
+
+def _read(tox_ini: Path, tracer: Tracer) -> tuple[str, str | None]:
+    with tracer.span("read", "phase", file=str(tox_ini)), tox_ini.open("rt", encoding="utf-8") as file:
+        before = file.read()
+        original_newlines = file.newlines
+        tracer.count("read_bytes", os.fstat(file.fileno()).st_size)
+    if isinstance(original_newlines, tuple):
+        original_newlines = original_newlines[0]
+    return before, original_newlines
+
+
+def _process(
+    tox_ini: Path,
+    loaded: tuple[str, str | None] | Exception,
+    opts: ToxIniFmtNamespace,
+    tracer: Tracer,
+) -> tuple[_Outcome, Callable[[], None] | None]:
+    if isinstance(loaded, Exception):
+        return _failed(_display_name(tox_ini), loaded, opts), None
+    before, original_newlines = loaded
+    outcome, formatted = _check(_display_name(tox_ini), str(tox_ini), before, opts, tracer)
+    if not outcome.changed or opts.check or opts.stdout:
+        return outcome, None
+    return outcome, partial(_write, tox_ini, formatted, original_newlines, tracer)
+
+
+def _check(name: str, source: str, before: str, opts: ToxIniFmtNamespace, tracer: Tracer) -> tuple[_Outcome, str]:
+    try:
+        with deadline(opts.timeout_per_file):  # the write back is left out, so an aborted file is never truncated
+            return _compare(name, source, before, opts, tracer)
+    except (FileTimeoutError, SemanticChangeError) as exc:  # reported as failed, whether or not --keep-going is set
+        return _Outcome(changed=False, output="", error=f"{name}: {exc}"), before
+    except (RuntimeError, ValueError, configparser.Error) as exc:
+        return _failed(name, exc, opts), before
+
+
+def _failed(name: str, exc: Exception, opts: ToxIniFmtNamespace) -> _Outcome:
+    if not opts.keep_going:
+        raise exc
+    reason = str(exc).replace("\n", " ")  # one line per file in the summary, parse errors span multiple
+    return _Outcome(changed=False, output="", error=f"{name}: {reason}")
+
+
+def _compare(name: str, source: str, before: str, opts: ToxIniFmtNamespace, tracer: Tracer) -> tuple[_Outcome, str]:
+    if opts.to_toml:  # a conversion, the file is neither compared nor written back
+        document = format_tox_ini_document(before, opts, tracer=tracer)
+        with tracer.span("convert", "phase"):
+            return _Outcome(changed=False, output=to_tox_toml(document)), before
+    formatted = format_tox_ini(before, opts, tracer=tracer)
+    changed = before != formatted
+    if changed and opts.verify:  # a file the formatting left as it was needs no proof
+        with tracer.span("verify", "phase", file=source):
+            verify_tox_ini(before, formatted)
+    if opts.stdout:  # stdout just prints new format to stdout
+        return _Outcome(changed, formatted), formatted
+    if not changed:
+        return _Outcome(changed, "" if opts.quiet else f"no change for {name}\n"), formatted
+    if opts.quiet:  # the diff is the costliest output, skip it when only the path is needed
+        return _Outcome(changed, f"{name}\n"), formatted
+    with tracer.span("diff", "phase", file=source):
+        diff = difflib.unified_diff(before.splitlines(), formatted.splitlines(), fromfile=name, tofile=name)
+        return _Outcome(changed, "\n".join(color_diff(diff)) + "\n"), formatted
+
+
+def _format_revisions(opts: ToxIniFmtNamespace, tracer: Tracer) -> Generator[_Outcome]:
+    root = toplevel(Path.cwd())
+    selected = [path.as_posix() for path in opts.tox_ini]
+    with BlobReader(root) as blobs:
+        for rev in opts.rev or []:
+            for path in selected or tox_ini_in_revision(rev, root):
+                name = f"{rev}:{path}"
+                with tracer.span(name, "file"):
+                    with tracer.span("read", "phase", file=name):
+                        content = blobs.read(rev, path)
+                    tracer.count("read_bytes", len(content or b""))
+                    if content is None:
+                        outcome = _Outcome(changed=False, output="" if opts.quiet else f"{name} does not exist\n")
+                    else:
+                        outcome = _check_content(name, content, opts, tracer)
+                yield outcome
+
+
+def _format_archives(opts: ToxIniFmtNamespace, tracer: Tracer) -> Generator[_Outcome]:
+    for archive in opts.tox_ini:
+        archive_name = _display_name(archive)
+        try:
+            for member, content in tox_ini_members(archive):
+                name = f"{archive_name}:{member}"
+                tracer.count("read_bytes", len(content))
+                with tracer.span(name, "file"):
+                    outcome = _check_content(name, content, opts, tracer)
+                yield outcome  # ruff:ignore[unnecessary-assign-before-yield] # the span ends before it is consumed
+        except (tarfile.TarError, zipfile.BadZipFile, OSError, EOFError) as exc:  # a corrupt or truncated archive
+            if not opts.keep_going:
+                raise
+            yield _Outcome(changed=False, output="", error=f"{archive_name}: {exc}")
+
+
+def _check_content(name: str, content: bytes, opts: ToxIniFmtNamespace, tracer: Tracer) -> _Outcome:
+    try:
+        before = _decode(content)
+    except UnicodeDecodeError as exc:
+        return _failed(name, exc, opts)
+    outcome, _ = _check(name, name, before, opts, tracer)
+    return outcome
+
+
+def _display_name(path: Path) -> str:
+    try:
+        return str(path.relative_to(Path.cwd()))
+    except ValueError:
+        return str(path)
+
+
+def _decode(content: bytes) -> str:  # as reading the file would, with universal newlines
+    return TextIOWrapper(BytesIO(content), encoding="utf-8").read()
+
+
+def _write(tox_ini: Path, formatted: str, newlines: str | None, tracer: Tracer) -> None:
+    with (
+        tracer.span("write", "phase", file=str(tox_ini)),
+        tox_ini.open("wt", encoding="utf-8", newline=newlines) as file,
+    ):
+        file.write(formatted)
+        file.flush()
+        tracer.count("written_bytes", os.fstat(file.fileno()).st_size)
+
+
 if __name__ == "__main__":
     raise SystemExit(run())
@@ -0,0 +1,39 @@
+"""Read tox.ini files out of archives, such as source distributions."""
+
+from __future__ import annotations
+
+import tarfile
+import zipfile
+from typing import IO, TYPE_CHECKING, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+def tox_ini_members(path: Path) -> Iterator[tuple[str, bytes]]:
+    """
+    Stream the tox.ini members of an archive in memory, without extracting it.
+
+    :param path: a zip file, or a tar file - optionally compressed with gzip, bz2 or xz
+    :return: the name and content of the tox.ini members, in the order of the archive
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and _is_tox_ini(info.filename):
+                    yield info.filename, archive.read(info)
+        return
+    with tarfile.open(path, mode="r|*") as archive:  # as a stream, the members are read in a single pass
+        for member in archive:
+            if member.isfile() and _is_tox_ini(member.name):
+                yield member.name, cast("IO[bytes]", archive.extractfile(member)).read()  # a file, so never None
+
+
+def _is_tox_ini(name: str) -> bool:
+    return name.rpartition("/")[2] == "tox.ini"
+
+
+__all__ = [
+    "tox_ini_members",
+]
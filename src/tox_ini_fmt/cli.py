@@ -5,8 +5,13 @@ from __future__ import annotations
 import os
 from argparse import Action, ArgumentParser, ArgumentTypeError, Namespace
 from pathlib import Path
+from stat import S_ISREG
 from typing import TYPE_CHECKING, Any
 
+from .deadline import SUPPORTED as DEADLINE_SUPPORTED
+from .git import GitError, changed_tox_ini, toplevel, verify_commit
+from .shard import select_shard
+
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
@@ -14,33 +19,114 @@ if TYPE_CHECKING:
 class ToxIniFmtNamespace(Namespace):
     """Options for tox-ini-fmt tool."""
 
-    tox_ini: list[Path]
+    tox_ini: list[Path]  # relative to the root of the repository with --rev
     stdout: bool
     check: bool
+    to_toml: bool
+    verify: bool
+    fail_fast: bool
+    keep_going: bool
+    timeout_per_file: float | None
+    quiet: bool
     pin_toxenvs: list[str]
+    compact_envlist: bool = False  # opt-in, so also for namespaces created by API callers
+    jobs: int
+    io_window: int | None
+    profile: Path | None
+    memory_report: bool
+    metrics: Path | None
+    changed_since: str | None
+    watch: bool
+    rev: list[str] | None
+    archive: bool
+    shard: tuple[int, int] | None
+    shard_by: str
+    files_from: str | None
 
 
 def tox_ini_path_creator(argument: str) -> Path:
     """
-    Validate that tox.ini can be formatted.
+    Convert the argument to a tox.ini path.
+
+    The path is validated only once all arguments are parsed (see :func:`tox_ini_path_error`), so that all invalid
+    paths can be reported together and the write check can be skipped when not writing back.
 
     :param argument: the string argument passed in
     :return: the tox.ini path
     """
-    path = Path(argument).absolute()
-    if not path.exists():
-        msg = "path does not exists"
+    return Path(argument).absolute()
+
+
+def tox_ini_path_error(path: Path, *, writable: bool) -> str | None:
+    """
+    Validate that tox.ini can be formatted.
+
+    :param path: the tox.ini path
+    :param writable: the path must also be writable
+    :return: the reason the path cannot be formatted, ``None`` if it can be
+    """
+    try:
+        mode = path.stat().st_mode
+    except OSError:
+        return "path does not exists"
+    if not S_ISREG(mode):
+        return "path is not a file"
+    if not os.access(path, os.R_OK | os.W_OK if writable else os.R_OK):
+        # only pay for the second check to tell the two failures apart
+        return "cannot read path" if not os.access(path, os.R_OK) else "cannot write path"
+    return None
+
+
+def positive_int(argument: str) -> int:
+    """
+    Validate that the argument is a positive integer.
+
+    :param argument: the string argument passed in
+    :return: the parsed value
+    """
+    try:
+        value = int(argument)
+    except ValueError:
+        value = 0
+    if value < 1:
+        msg = f"must be a positive integer, got {argument!r}"
         raise ArgumentTypeError(msg)
-    if not path.is_file():
-        msg = "path is not a file"
+    return value
+
+
+def positive_float(argument: str) -> float:
+    """
+    Validate that the argument is a positive number.
+
+    :param argument: the string argument passed in
+    :return: the parsed value
+    """
+    try:
+        value = float(argument)
+    except ValueError:
+        value = 0.0
+    if not value > 0 or value == float("inf"):
+        msg = f"must be a positive number, got {argument!r}"
         raise ArgumentTypeError(msg)
-    if not os.access(path, os.R_OK):
-        msg = "cannot read path"
-        raise ArgumentTypeError(msg)  # pragma: no cover
-    if not os.access(path, os.W_OK):
-        msg = "cannot write path"
-        raise ArgumentTypeError(msg)  # pragma: no cover
-    return path
+    return value
+
+
+def shard_spec(argument: str) -> tuple[int, int]:
+    """
+    Validate that the argument selects a shard.
+
+    :param argument: the string argument passed in, as ``INDEX/COUNT``
+    :return: the index (starting from 1) and the count of shards
+    """
+    index, _, count = argument.partition("/")
+    try:
+        result = int(index), int(count)
+    except ValueError:
+        result = 0, 0
+    if not 1 <= result[0] <= result[1]:
+        msg = f"must be INDEX/COUNT with 1 <= INDEX <= COUNT, got {argument!r}"
+        raise ArgumentTypeError(msg)
+    return result
 
 
 def cli_args(args: Sequence[str]) -> ToxIniFmtNamespace:
@@ -63,6 +149,41 @@ def cli_args(args: Sequence[str]) -> ToxIniFmtNamespace:
         action="store_true",
         help="check files are formatted without writing them back (exit code 1 on change)",
     )
+    output_mode.add_argument(
+        "--to-toml",
+        action="store_true",
+        help="print the formatted configuration converted to the equivalent tox.toml to the stdout (instead of "
+        "update in-place)",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="verify the formatting kept the meaning of the files, by comparing what tox reads from each changed "
+        "section before and after; the files that fail are not written back and are listed at the end (exit code 3)",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="stop at the first file not formatted (requires --check)",
+    )
+    parser.add_argument(
+        "--keep-going",
+        action="store_true",
+        help="continue with the other files when one cannot be formatted, list such files at the end (exit code 3)",
+    )
+    parser.add_argument(
+        "--timeout-per-file",
+        type=positive_float,
+        metavar="SECONDS",
+        help="abort the formatting of a file running for longer than SECONDS and report it as timed out, the other "
+        "files are still processed (exit code 3)",
+    )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="print only the paths of the files not formatted, instead of their diff",
+    )
 
     class CommaSeparatedStr(Action):
         def __call__(
@@ -83,7 +204,188 @@ def cli_args(args: Sequence[str]) -> ToxIniFmtNamespace:
         default=[],
         help="tox environments that pin to the start of the envlist (comma separated)",
     )
-    parser.add_argument("tox_ini", nargs="+", type=tox_ini_path_creator, help="tox ini files to format")
+    parser.add_argument(
+        "--compact-envlist",
+        action="store_true",
+        help="fold the env_list environments forming cartesian products into brace groups (e.g. py39-a, py39-b, "
+        "py38-a and py38-b into {py39, py38}-{a, b})",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=positive_int,
+        default=1,
+        metavar="N",
+        help="format files concurrently on N threads (scales on free-threaded Python builds)",
+    )
+    parser.add_argument(
+        "--io-window",
+        type=positive_int,
+        metavar="N",
+        help="read files ahead and write them back in the background, with at most N files in flight each way "
+        "(for high latency file systems)",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="PATH",
+        help="write a Chrome trace-event JSON with per file, phase and section spans to PATH",
+    )
+    parser.add_argument(
+        "--memory-report",
+        action="store_true",
+        help="report the peak and retained memory allocations per formatting phase to the stderr",
+    )
+    parser.add_argument(
+        "--metrics",
+        type=Path,
+        metavar="PATH",
+        help="write the counters of the run (files, bytes, requirement parses, transform cache hits and the time per "
+        "phase and formatter) to PATH at exit, as JSON if it ends with .json and in the Prometheus text format "
+        "otherwise",
+    )
+    parser.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="only format the tox.ini files git reports as modified, added or renamed since REF (all of them in the "
+        "repository if no tox_ini is passed)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and re-format the files whenever their content changes (stop with Ctrl+C)",
+    )
+    parser.add_argument(
+        "--rev",
+        action="append",
+        metavar="REV",
+        help="check the tox.ini files of the git revision REV instead of the working tree, which is never touched "
+        "(can be repeated; all of them in the revision if no tox_ini is passed)",
+    )
+    parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="check the tox.ini members of the tox_ini arguments, which are tar (optionally compressed) or zip "
+        "archives such as source distributions, without extracting them",
+    )
+    parser.add_argument(
+        "--shard",
+        type=shard_spec,
+        metavar="INDEX/COUNT",
+        help="format only the files of shard INDEX (from 1) out of COUNT, to split the work across runners",
+    )
+    parser.add_argument(
+        "--shard-by",
+        choices=["hash", "size"],
+        default="hash",
+        help="assign the files to shards by a stable hash of their path relative to the working directory, or "
+        "balance the shards by file size (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--files-from",
+        metavar="FILE",
+        help="format the files listed in FILE (- for the stdin), separated by newlines or NUL characters; they are "
+        "read and validated as the formatting reaches them, the ones that cannot be formatted are listed at the end "
+        "(exit code 3)",
+    )
+    parser.add_argument("tox_ini", nargs="*", type=tox_ini_path_creator, help="tox ini files to format")
     ns = ToxIniFmtNamespace()
     parser.parse_args(namespace=ns, args=args)
+    _check_combinations(parser, ns)
+    if ns.rev is not None:
+        _check_revisions(parser, ns)
+        return ns
+    if ns.files_from is not None:  # the list is streamed while formatting, see read_paths
+        _check_files_from(parser, ns)
+        return ns
+    if ns.changed_since is not None:
+        _select_changed(parser, ns)
+    elif not ns.tox_ini:
+        parser.error("the following arguments are required: tox_ini")
+    writable = not (ns.check or ns.stdout or ns.to_toml or ns.archive)
+    errors = [
+        f"argument tox_ini: {reason}: {path}"
+        for path in ns.tox_ini
+        if (reason := tox_ini_path_error(path, writable=writable)) is not None
+    ]
+    if errors:
+        parser.error("\n".join(errors))
+    if ns.shard is not None:
+        ns.tox_ini = select_shard(ns.tox_ini, *ns.shard, by_size=ns.shard_by == "size")
     return ns
+
+
+def _select_changed(parser: ArgumentParser, ns: ToxIniFmtNamespace) -> None:
+    try:
+        changed = changed_tox_ini(ns.changed_since or "", Path.cwd())
+    except GitError as exc:
+        parser.error(f"argument --changed-since: {exc}")
+    if ns.tox_ini:
+        resolved = {i.resolve() for i in changed}
+        ns.tox_ini = [i for i in ns.tox_ini if i.resolve() in resolved]
+    else:
+        ns.tox_ini = changed
+
+
+def _check_files_from(parser: ArgumentParser, ns: ToxIniFmtNamespace) -> None:
+    if ns.tox_ini or ns.changed_since is not None or ns.watch or ns.archive:
+        parser.error("argument --files-from: not allowed with arguments tox_ini, --changed-since, --watch or --archive")
+    if ns.shard is not None and ns.shard_by == "size":  # balancing needs the size of all the files up front
+        parser.error("argument --shard-by: size not allowed with argument --files-from")
+    if ns.files_from != "-" and not os.access(ns.files_from or "", os.R_OK):
+        parser.error(f"argument --files-from: cannot read path: {ns.files_from}")
+
+
+def _check_revisions(parser: ArgumentParser, ns: ToxIniFmtNamespace) -> None:
+    if ns.files_from is not None:
+        parser.error("argument --files-from: not allowed with argument --rev")
+    cwd = Path.cwd()
+    try:
+        root = toplevel(cwd).resolve()
+        for rev in ns.rev or []:
+            verify_commit(rev, cwd)
+    except GitError as exc:
+        parser.error(f"argument --rev: {exc}")
+    resolved = [path.resolve() for path in ns.tox_ini]
+    if outside := [str(path) for path, real in zip(ns.tox_ini, resolved, strict=True) if not real.is_relative_to(root)]:
+        parser.error("\n".join(f"argument tox_ini: path is outside of the repository: {path}" for path in outside))
+    ns.tox_ini = [real.relative_to(root) for real in resolved]
+
+
+def _check_output(parser: ArgumentParser, ns: ToxIniFmtNamespace) -> None:
+    if ns.quiet and (ns.stdout or ns.to_toml):
+        parser.error(f"argument -q/--quiet: not allowed with argument {'-s/--stdout' if ns.stdout else '--to-toml'}")
+    if ns.verify and ns.to_toml:  # the conversion is not a formatting to verify
+        parser.error("argument --verify: not allowed with argument --to-toml")
+
+
+def _check_timeout(parser: ArgumentParser, ns: ToxIniFmtNamespace) -> None:
+    if ns.timeout_per_file is None:
+        return
+    if not DEADLINE_SUPPORTED:  # pragma: win32 cover
+        parser.error("argument --timeout-per-file: not supported on this platform")
+    if ns.jobs > 1:  # the budget is enforced by a timer signal, delivered to the main thread only
+        parser.error("argument --timeout-per-file: not allowed with argument -j/--jobs above 1")
+
+
+def _check_combinations(parser: ArgumentParser, ns: ToxIniFmtNamespace) -> None:
+    if ns.fail_fast and not ns.check:
+        parser.error("argument --fail-fast: only allowed with argument --check")
+    # the files checked in memory are processed in a single sequential pass and never written
+    for option, used in (("--rev", ns.rev is not None), ("--archive", ns.archive)):
+        if used and (ns.changed_since is not None or ns.watch or ns.io_window is not None or ns.jobs > 1):
+            parser.error(
+                f"argument {option}: not allowed with arguments --changed-since, --watch, --io-window or -j/--jobs"
+            )
+    if ns.rev is not None and ns.shard is not None:
+        parser.error("argument --shard: not allowed with argument --rev")
+    if ns.rev is not None and ns.archive:
+        parser.error("argument --archive: not allowed with argument --rev")
+    if ns.watch and ns.fail_fast:
+        parser.error("argument --watch: not allowed with argument --fail-fast")
+    _check_output(parser, ns)
+    if ns.io_window is not None and ns.jobs > 1:
+        parser.error("argument --io-window: not allowed with argument -j/--jobs above 1")
+    _check_timeout(parser, ns)
+    if ns.memory_report and (ns.jobs > 1 or ns.io_window is not None):
+        parser.error("argument --memory-report: not allowed with argument -j/--jobs above 1 or --io-window")
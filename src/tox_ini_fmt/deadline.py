@@ -0,0 +1,51 @@
+"""Abort the work on a file that runs over its time budget."""
+
+from __future__ import annotations
+
+import signal
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from types import FrameType
+
+SUPPORTED = hasattr(signal, "setitimer")  # not on Windows
+
+
+class FileTimeoutError(TimeoutError):
+    """The work on a file ran over its time budget."""
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Generator[None]:
+    """
+    Raise :class:`FileTimeoutError` in the block once it runs for longer than the budget.
+
+    The budget is enforced by a real time interval timer, so it must be entered on the main thread; the error is raised
+    at the next Python bytecode, so it cannot abort a single long running call into C code.
+
+    :param seconds: the time budget, ``None`` for no budget
+    """
+    if seconds is None:
+        yield
+        return
+
+    def expire(signum: int, frame: FrameType | None) -> None:  # ruff:ignore[unused-function-argument]
+        msg = f"timed out after {seconds:g} seconds"
+        raise FileTimeoutError(msg)
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+__all__ = [
+    "SUPPORTED",
+    "FileTimeoutError",
+    "deadline",
+]
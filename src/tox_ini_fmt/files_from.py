@@ -0,0 +1,51 @@
+"""Read the files to format from a list, for lists too long to pass as arguments."""
+
+from __future__ import annotations
+
+import os
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable
+
+
+def read_paths(source: str, *, chunk_size: int = 64 * 1024) -> Generator[Path]:
+    """
+    Stream the paths of a list, only a chunk of it is held in memory at a time.
+
+    The paths are separated by NUL characters when the first chunk contains one (as ``find -print0`` or
+    ``git ls-files -z`` emit, for paths containing newlines), by newlines otherwise. Empty entries are skipped.
+
+    :param source: the file listing the paths, ``-`` for the standard input
+    :param chunk_size: the number of bytes read at a time
+    :return: the absolute paths, in the order of the list
+    """
+    with nullcontext(sys.stdin.buffer) if source == "-" else Path(source).open("rb") as stream:
+        pending, separator = b"", None
+        while chunk := stream.read(chunk_size):
+            pending += chunk
+            if separator is None:
+                if b"\0" in pending:
+                    separator = b"\0"
+                elif len(pending) >= chunk_size:
+                    separator = b"\n"
+                else:
+                    continue
+            *entries, pending = pending.split(separator)
+            yield from _paths(entries, separator)
+        yield from _paths(pending.split(separator or b"\n"), separator or b"\n")
+
+
+def _paths(entries: Iterable[bytes], separator: bytes) -> Generator[Path]:
+    for entry in entries:
+        name = entry.removesuffix(b"\r") if separator == b"\n" else entry  # lists written on Windows
+        if name:
+            yield Path(os.fsdecode(name)).absolute()
+
+
+__all__ = [
+    "read_paths",
+]
@@ -2,45 +2,110 @@
 
 from __future__ import annotations
 
+import re
 from configparser import ConfigParser
-from io import StringIO
 from pathlib import Path
 
 from tox_ini_fmt.cli import ToxIniFmtNamespace
+from tox_ini_fmt.tracing import NO_TRACE, Tracer
 
+from .document import INDENTATION, Document, Section
 from .section_order import order_sections
+from .symbols import SymbolTable
 from .test_env import format_test_env
 from .tox_section import format_tox_section
+from .tox_toml import to_tox_toml
+from .verify import SemanticChangeError, verify_tox_ini
 
-INDENTATION = "    "
+_NEWLINE = re.compile(rb"\r\n|\r|\n")
 
 
-def format_tox_ini(tox_ini: str | Path, opts: ToxIniFmtNamespace | None = None) -> str:
+def format_tox_ini(tox_ini: str | Path, opts: ToxIniFmtNamespace | None = None, *, tracer: Tracer = NO_TRACE) -> str:
     """
     Format a tox ini file.
 
+    Every call works on its own parser; the only state shared with other calls are the process wide transform caches
+    and requirement parse counter, which are thread-safe, so it's safe to format multiple files concurrently from
+    multiple threads.
+
     :param tox_ini:
     :param opts:
+    :param tracer: receives a span per phase and section
     :return:
     """
+    document = format_tox_ini_document(tox_ini, opts, tracer=tracer)
+    with tracer.span("generate", "phase"):
+        return document.to_text()
+
+
+def format_tox_ini_bytes(
+    tox_ini: bytes | memoryview, opts: ToxIniFmtNamespace | None = None, *, tracer: Tracer = NO_TRACE
+) -> bytes:
+    """
+    Format the UTF-8 encoded content of a tox ini file, e.g. as received over a socket.
+
+    The newline style of the output is the first one found in the content (a line feed if there is none). When the
+    content is already formatted no text is encoded, the content itself is returned if passed as bytes.
+
+    :param tox_ini: the content of the tox ini file
+    :param opts: the formatting options
+    :param tracer: receives a span per phase and section
+    :return: the formatted content
+    """
+    newline = match.group().decode("ascii") if (match := _NEWLINE.search(tox_ini)) else "\n"
+    original = str(tox_ini, "utf-8")  # decodes from the buffer, a memoryview is not copied first
+    text = original if newline == "\n" and "\r" not in original else original.replace("\r\n", "\n").replace("\r", "\n")
+    formatted = format_tox_ini(text, opts, tracer=tracer)
+    if newline != "\n":
+        formatted = formatted.replace("\n", newline)
+    if formatted == original:
+        return tox_ini if isinstance(tox_ini, bytes) else tox_ini.tobytes()
+    return formatted.encode("utf-8")
+
+
+def format_tox_ini_document(
+    tox_ini: str | Path,
+    opts: ToxIniFmtNamespace | None = None,
+    *,
+    tracer: Tracer = NO_TRACE,
+    symbols: SymbolTable | None = None,
+) -> Document:
+    """
+    Format a tox ini file into a compact document, to hold many formatted files in memory and emit their text later.
+
+    :param tox_ini:
+    :param opts:
+    :param tracer: receives a span per phase and section
+    :param symbols: share the section names, keys and values with the other documents of a batch via this table
+    :return: the formatted document
+    """
     if opts is None:
         opts = ToxIniFmtNamespace(pin_toxenvs=[])
     parser = ConfigParser(interpolation=None)
     text = tox_ini.read_text(encoding="utf-8") if isinstance(tox_ini, Path) else tox_ini
-    parser.read_string(text)
-
-    format_tox_section(parser, opts.pin_toxenvs)
-    for section_name in parser.sections():
-        if section_name == "testenv" or section_name.startswith("testenv:"):
-            format_test_env(parser, section_name)
-    order_sections(parser, opts.pin_toxenvs)
+    with tracer.span("parse", "phase"):
+        parser.read_string(text)
 
-    return _generate_tox_ini(parser)
+    with tracer.span("format", "phase"):
+        with tracer.span("tox", "section"):
+            format_tox_section(parser, opts.pin_toxenvs, compact_env_list=opts.compact_envlist)
+        for section_name in parser.sections():
+            if section_name == "testenv" or section_name.startswith("testenv:"):
+                with tracer.span(section_name, "section"):
+                    format_test_env(parser, section_name)
+    with tracer.span("order", "phase"):
+        return order_sections(parser, opts.pin_toxenvs, symbols)
 
 
-def _generate_tox_ini(parser: ConfigParser) -> str:
-    output = StringIO()
-    parser.write(output)
-    result = output.getvalue().strip() + "\n"
-    result = result.replace("\t", INDENTATION)
-    return result.replace(" \n", "\n")
+__all__ = [
+    "INDENTATION",
+    "Document",
+    "Section",
+    "SemanticChangeError",
+    "SymbolTable",
+    "format_tox_ini",
+    "format_tox_ini_bytes",
+    "format_tox_ini_document",
+    "to_tox_toml",
+    "verify_tox_ini",
+]
@@ -0,0 +1,77 @@
+"""Compact representation of a formatted tox ini file."""
+
+from __future__ import annotations
+
+from io import StringIO
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from configparser import ConfigParser
+
+    from .symbols import SymbolTable
+
+INDENTATION = "    "
+
+
+class Section(NamedTuple):
+    """A section of a formatted document, its keys and values are stored as parallel tuples."""
+
+    name: str
+    keys: tuple[str, ...]
+    values: tuple[str, ...]
+
+
+class Document(NamedTuple):
+    """
+    A formatted tox ini file.
+
+    Unlike a :class:`~configparser.ConfigParser` this keeps no per section dictionaries or proxies, so many formatted
+    files can be held in memory at once; the text is emitted on demand via :meth:`to_text`.
+    """
+
+    sections: tuple[Section, ...]
+
+    @classmethod
+    def from_parser(cls, parser: ConfigParser, order: list[str], symbols: SymbolTable | None = None) -> Document:
+        """
+        Capture the sections of a parser.
+
+        :param parser: the INI parser
+        :param order: the names of the sections to capture in order, the ones missing from the parser are skipped
+        :param symbols: intern the section names, keys and values into this table
+        :return: the document
+        """
+        sections: list[Section] = []
+        if defaults := parser.defaults():
+            sections.append(_section(parser.default_section, defaults, symbols))
+        # like the parser, a section includes the default values
+        sections.extend(_section(name, parser[name], symbols) for name in order if parser.has_section(name))
+        return cls(tuple(sections))
+
+    def to_text(self) -> str:
+        """:return: the text of the document, as :meth:`configparser.ConfigParser.write` with our indentation"""
+        output = StringIO()
+        for section in self.sections:
+            output.write(f"[{section.name}]\n")
+            for key, value in zip(section.keys, section.values, strict=True):
+                indented = value.replace("\n", "\n\t")
+                output.write(f"{key} = {indented}\n")
+            output.write("\n")
+        result = output.getvalue().strip() + "\n"
+        result = result.replace("\t", INDENTATION)
+        return result.replace(" \n", "\n")
+
+
+def _section(name: str, items: Mapping[str, str], symbols: SymbolTable | None) -> Section:
+    if symbols is None:
+        return Section(name, tuple(items), tuple(items.values()))
+    intern = symbols.intern
+    return Section(intern(name), tuple(map(intern, items)), tuple(map(intern, items.values())))
+
+
+__all__ = [
+    "INDENTATION",
+    "Document",
+    "Section",
+]
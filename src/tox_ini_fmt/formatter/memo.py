@@ -0,0 +1,65 @@
+"""Memoize the pure value transforms, values such as common ``deps`` or ``pass_env`` blocks repeat across files."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from functools import _lru_cache_wrapper
+    from types import FunctionType
+
+MAX_SIZE = 1024  # per transform, bounds the memory used by the caches
+_CACHES: dict[str, _lru_cache_wrapper[str]] = {}
+
+
+def memoize(func: FunctionType) -> _lru_cache_wrapper[str]:
+    """
+    Memoize a pure transform on its (hashable) arguments, the cache is shared by all files formatted in the process.
+
+    :param func: the transform, a private one (behind a public helper taking unhashable arguments) is reported under
+        the public name
+    :return: the memoized transform, the original is available as ``__wrapped__``
+    """
+    cached = lru_cache(maxsize=MAX_SIZE)(func)
+    _CACHES[func.__name__.lstrip("_")] = cached
+    return cached
+
+
+class CacheStats(NamedTuple):
+    """Statistics of a transform cache."""
+
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """The ratio of the calls served from the cache."""
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+def cache_stats() -> dict[str, CacheStats]:
+    """:return: the statistics of the transform caches, by transform name"""
+    result: dict[str, CacheStats] = {}
+    for name, cached in _CACHES.items():
+        info = cached.cache_info()
+        result[name] = CacheStats(info.hits, info.misses, info.currsize, info.maxsize or 0)
+    return result
+
+
+def clear_caches() -> None:
+    """Empty the transform caches and reset their statistics."""
+    for cached in _CACHES.values():
+        cached.cache_clear()
+
+
+__all__ = [
+    "MAX_SIZE",
+    "CacheStats",
+    "cache_stats",
+    "clear_caches",
+    "memoize",
+]
@@ -5,32 +5,33 @@ from __future__ import annotations
 import itertools
 from typing import TYPE_CHECKING
 
+from .document import Document
 from .util import order_env_list
 
 if TYPE_CHECKING:
     from configparser import ConfigParser
 
+    from .symbols import SymbolTable
 
-def order_sections(parser: ConfigParser, pin_toxenvs: list[str]) -> None:
+
+def order_sections(parser: ConfigParser, pin_toxenvs: list[str], symbols: SymbolTable | None = None) -> Document:
     """
     Order sections.
 
     :param parser: the INI parsers
     :param pin_toxenvs: envs to pin
+    :param symbols: intern the strings of the document into this table
+    :return: the document with the sections in order
     """
     # Start with tox, then testenv. The testenv elements follow the order within envlist. Then all other testenv
     # elements and end it with any other sections present in the file (e.g. pytest/mypy configuration).
     order = ["tox", "testenv"]
     order.extend(f"testenv:{env}" for env in load_and_order_env_list(parser, pin_toxenvs))
-    order.extend(s for s in parser.sections() if s not in order and s.startswith("testenv:"))
-    order.extend(s for s in parser.sections() if s not in order and not s.startswith("testenv:"))
-    sections: dict[str, dict[str, str]] = {}
-    for section in order:
-        if parser.has_section(section):
-            sections[section] = dict(parser[section])
-            parser.pop(section)
-    for k, v in sections.items():
-        parser[k] = v
+    in_order = set(order)
+    rest = [s for s in parser.sections() if s not in in_order]
+    order.extend(s for s in rest if s.startswith("testenv:"))
+    order.extend(s for s in rest if not s.startswith("testenv:"))
+    return Document.from_parser(parser, order, symbols)
 
 
 def load_and_order_env_list(parser: ConfigParser, pin_toxenvs: list[str]) -> list[str]:
@@ -45,7 +46,8 @@ def load_and_order_env_list(parser: ConfigParser, pin_toxenvs: list[str]) -> lis
         (explode_env_list(parser["tox"][i]) for i in ("envlist", "env_list") if i in parser["tox"]),
         [],
     )
-    missing = [e for e in pin_toxenvs if e not in result]
+    envs = set(result)
+    missing = [e for e in pin_toxenvs if e not in envs]
     if missing:
         msg = f"missing tox environment(s) to pin {', '.join(missing)}"
         raise RuntimeError(msg)
@@ -0,0 +1,38 @@
+"""Share the identifiers repeated across the formatted files of a batch."""
+
+from __future__ import annotations
+
+
+class SymbolTable:
+    """
+    Interns strings, so equal section names, keys and values held by many documents are stored once.
+
+    Unlike :func:`sys.intern` the table belongs to a batch, it's released with it and counts the duplicates dropped. It
+    is not synchronized, use one table per thread.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty table."""
+        self._symbols: dict[str, str] = {}
+        self.deduplicated = 0  #: the number of strings replaced by an equal one already in the table
+
+    def __len__(self) -> int:
+        """:return: the number of distinct strings in the table"""
+        return len(self._symbols)
+
+    def intern(self, value: str) -> str:
+        """
+        Intern a string.
+
+        :param value: the string
+        :return: the string in the table equal to the value, the value itself if it's the first such string
+        """
+        symbol = self._symbols.setdefault(value, value)
+        if symbol is not value:
+            self.deduplicated += 1
+        return symbol
+
+
+__all__ = [
+    "SymbolTable",
+]
@@ -5,6 +5,7 @@ from __future__ import annotations
 from functools import partial
 from typing import TYPE_CHECKING
 
+from .memo import memoize
 from .util import (
     collect_multi_line,
     fix_and_reorder,
@@ -19,6 +20,26 @@ if TYPE_CHECKING:
     from configparser import ConfigParser
 
 
+TEST_ENV_UPGRADE = {  # legacy keys to the current ones
+    "alwayscopy": "always_copy",
+    "basepython": "base_python",
+    "changedir": "change_dir",
+    "envbindir": "env_bin_dir",
+    "envdir": "env_dir",
+    "envlogdir": "env_log_dir",
+    "envname": "env_name",
+    "envsitepackagesdir": "env_site_packages_dir",
+    "envtmpdir": "env_tmp_dir",
+    "ignore_basepython_conflict": "ignore_base_python_conflict",
+    "isolated_build_env": "package_env",
+    "passenv": "pass_env",
+    "setenv": "set_env",
+    "setupdir": "package_root",
+    "sitepackages": "system_site_packages",
+    "skipsdist": "no_package",
+}
+
+
 def format_test_env(parser: ConfigParser, name: str) -> None:
     """
     Format a tox test environment.
@@ -60,25 +81,7 @@ def format_test_env(parser: ConfigParser, name: str) -> None:
         "suicide_timeout": str,
         "interrupt_timeout": str,
         "terminate_timeout": str,
-        "depends": partial(to_list_of_env_values, []),
-    }
-    upgrade = {
-        "alwayscopy": "always_copy",
-        "basepython": "base_python",
-        "changedir": "change_dir",
-        "envbindir": "env_bin_dir",
-        "envdir": "env_dir",
-        "envlogdir": "env_log_dir",
-        "envname": "env_name",
-        "envsitepackagesdir": "env_site_packages_dir",
-        "envtmpdir": "env_tmp_dir",
-        "ignore_basepython_conflict": "ignore_base_python_conflict",
-        "isolated_build_env": "package_env",
-        "passenv": "pass_env",
-        "setenv": "set_env",
-        "setupdir": "package_root",
-        "sitepackages": "system_site_packages",
-        "skipsdist": "no_package",
+        "depends": partial(to_list_of_env_values, ()),
     }
 
     section = parser[name]
@@ -86,15 +89,17 @@ def format_test_env(parser: ConfigParser, name: str) -> None:
     if to_boolean(use_develop) == "true":
         parser[name]["package"] = "editable"
 
-    fix_and_reorder(parser, name, tox_section_cfg, upgrade)
+    fix_and_reorder(parser, name, tox_section_cfg, TEST_ENV_UPGRADE)
 
 
+@memoize
 def to_ordered_list(value: str) -> str:
     """Must be a line separated list - fix comma separated format."""
     extras, substitute = collect_multi_line(value)
     return fmt_list(extras, substitute)
 
 
+@memoize
 def to_pass_env(value: str) -> str:
     """
     Format the pass env sections.
@@ -106,6 +111,7 @@ def to_pass_env(value: str) -> str:
     return fmt_list(sorted(pass_env), substitute)
 
 
+@memoize
 def to_set_env(value: str) -> str:
     """
     Format the set env.
@@ -131,6 +137,7 @@ def to_set_env(value: str) -> str:
 _CMD_SEP = "\\"
 
 
+@memoize
 def to_commands(value: str) -> str:
     """
     Format the tox commands.
@@ -5,10 +5,9 @@ from __future__ import annotations
 from functools import partial
 from typing import TYPE_CHECKING
 
-from packaging.requirements import Requirement
 from packaging.version import Version
 
-from .requires import requires
+from .requires import parse_requirement, requires
 from .util import collect_multi_line, fix_and_reorder, to_boolean, to_list_of_env_values, to_py_dependencies
 
 if TYPE_CHECKING:
@@ -16,12 +15,24 @@ if TYPE_CHECKING:
     from configparser import ConfigParser, SectionProxy
 
 
-def format_tox_section(parser: ConfigParser, pin_toxenvs: list[str]) -> None:
+TOX_UPGRADE = {  # legacy keys to the current ones
+    "envlist": "env_list",
+    "toxinidir": "tox_root",
+    "toxworkdir": "work_dir",
+    "skipsdist": "no_package",
+    "isolated_build_env": "package_env",
+    "setupdir": "package_root",
+    "ignore_basepython_conflict": "ignore_base_python_conflict",
+}
+
+
+def format_tox_section(parser: ConfigParser, pin_toxenvs: list[str], *, compact_env_list: bool = False) -> None:
     """
     Format the core tox section.
 
     :param parser: the INI parser
     :param pin_toxenvs: environments to pin at start
+    :param compact_env_list: fold the env list into brace groups where it forms cartesian products
     """
     if not parser.has_section("tox"):
         parser.add_section("tox")
@@ -33,23 +44,14 @@ def format_tox_section(parser: ConfigParser, pin_toxenvs: list[str]) -> None:
         "min_version": str,
         "requires": to_py_dependencies,
         "provision_tox_env": str,
-        "env_list": partial(to_list_of_env_values, pin_toxenvs),
+        "env_list": partial(to_list_of_env_values, pin_toxenvs, compact=compact_env_list),
         "package_env": str,
         "isolated_build_env": str,
         "no_package": to_boolean,
         "skip_missing_interpreters": to_boolean,
         "ignore_base_python_conflict": to_boolean,
     }
-    upgrade = {
-        "envlist": "env_list",
-        "toxinidir": "tox_root",
-        "toxworkdir": "work_dir",
-        "skipsdist": "no_package",
-        "isolated_build_env": "package_env",
-        "setupdir": "package_root",
-        "ignore_basepython_conflict": "ignore_base_python_conflict",
-    }
-    fix_and_reorder(parser, "tox", tox_section_cfg, upgrade)
+    fix_and_reorder(parser, "tox", tox_section_cfg, TOX_UPGRADE)
 
 
 def _handle_min_version(tox: SectionProxy) -> None:
@@ -57,7 +59,7 @@ def _handle_min_version(tox: SectionProxy) -> None:
     if min_version is None or int(min_version.split(".")[0]) < 4:  # ruff:ignore[magic-value-comparison]
         min_version = "4.2"
     tox_requires = [
-        Requirement(i)
+        parse_requirement(i)
         for i in collect_multi_line(
             tox.get("requires", ""),
             line_split=None,
@@ -70,9 +72,9 @@ def _handle_min_version(tox: SectionProxy) -> None:
     else:
         at = -1
     if at == -1:
-        tox_requires.append(Requirement(f"tox>={min_version}"))
+        tox_requires.append(parse_requirement(f"tox>={min_version}"))
     else:
         specifiers = list(tox_requires[at].specifier)
         if len(specifiers) == 0 or Version(specifiers[0].version) < Version(min_version):
-            tox_requires[at] = Requirement(f"tox>={min_version}")
+            tox_requires[at] = parse_requirement(f"tox>={min_version}")
     tox["requires"] = "\n".join(str(i) for i in tox_requires)
@@ -0,0 +1,290 @@
+"""Convert a formatted tox ini document into the equivalent ``tox.toml``."""
+
+from __future__ import annotations
+
+import json
+import re
+import shlex
+from configparser import DEFAULTSECT
+from io import StringIO
+from typing import TYPE_CHECKING
+
+from .util import expand_env
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from typing import TypeAlias
+
+    from .document import Document
+
+    Value: TypeAlias = "str | bool | float | list[Value] | dict[str, Value]"
+
+_BOOLEANS = frozenset({
+    "always_copy",
+    "args_are_paths",
+    "constrain_package_deps",
+    "download",
+    "fresh_subprocess",
+    "ignore_base_python_conflict",
+    "ignore_errors",
+    "ignore_outcome",
+    "no_package",
+    "parallel_show_output",
+    "pip_pre",
+    "recreate",
+    "skip_install",
+    "skip_missing_interpreters",
+    "system_site_packages",
+    "use_frozen_constraints",
+})
+_TRUE = frozenset({"true", "1", "yes", "on"})  # as tox converts to boolean
+_FALSE = frozenset({"false", "0", "no", "off"})
+_FLOATS = frozenset({"interrupt_timeout", "suicide_timeout", "terminate_timeout"})
+_LISTS = frozenset({
+    "allowlist_externals",
+    "base",
+    "base_python",
+    "dependency_groups",
+    "deps",
+    "extras",
+    "labels",
+    "pass_env",
+    "requires",
+})
+_COMMA_SEPARATED = frozenset({"base", "base_python", "dependency_groups", "labels"})  # not normalized to lines
+_ENV_LISTS = frozenset({"depends", "env_list"})
+_COMMANDS = frozenset({"commands", "commands_post", "commands_pre"})
+_COMMAND = frozenset({"install_command", "list_dependencies_command"})  # a single command, not a list of them
+
+_FACTOR_CONDITION = re.compile(r"\s*!?[\w.{},!-]+:(\s|$)")
+_REFERENCE = re.compile(r"\{\[(?P<section>[^]]*)](?P<key>[\w-]+)}")
+_ENV = re.compile(r"\{env:(?P<name>[^:{}]+)(?::(?P<default>[^{}]*))?}")
+_POSARGS = re.compile(r"\{posargs(?::(?P<default>[^{}]*))?}")
+_SUBSTITUTION = re.compile(r"\{[^{}]*}")
+_TOP_LEVEL_COMMA = re.compile(r",(?![^{]*})")
+_BARE_KEY = re.compile(r"[A-Za-z0-9_-]+")
+_WIDTH = 120
+
+
+def to_tox_toml(document: Document) -> str:
+    """
+    Convert a formatted document into the equivalent ``tox.toml``, which tox loads without the ini substitution pass.
+
+    The values are taken as the formatter normalized them: the lists become arrays, the commands arrays of arguments,
+    the set env a table and the flags and timeouts native types. An entry that is a single posargs, environment
+    variable or setting substitution becomes the matching replacement table. The sections configuring other tools
+    (e.g. pytest) are left out.
+
+    :param document: the formatted document
+    :raises ValueError: the document uses a feature without a ``tox.toml`` equivalent (default section values,
+        generative section names, factor conditional lines, settings substituted within a value or flags that are not
+        a boolean)
+    :return: the ``tox.toml`` text
+    """
+    tables: list[str] = []
+    for section in document.sections:
+        if (path := _table(section.name)) is None:
+            continue
+        text = f"[{'.'.join(map(_key, path))}]\n" if path else ""
+        for key, value in zip(section.keys, section.values, strict=True):
+            text += "".join(f"{line}\n" for line in _assignments(section.name, key, value))
+        tables.append(text)
+    return "\n".join(tables)
+
+
+def _table(section: str) -> tuple[str, ...] | None:
+    if section == "tox":
+        return ()
+    if section == "testenv":
+        return ("env_run_base",)
+    if section.startswith("testenv:"):
+        if "{" in (env := section[len("testenv:") :]):
+            msg = f"[{section}]: generative section names have no tox.toml equivalent"
+            raise ValueError(msg)
+        return "env", env
+    if section == DEFAULTSECT:
+        msg = f"[{section}]: values inherited by every section have no tox.toml equivalent"
+        raise ValueError(msg)
+    return None  # configures another tool
+
+
+def _assignments(section: str, key: str, value: str) -> list[str]:
+    where = f"[{section}] {key}"
+    for line in value.splitlines():
+        if _FACTOR_CONDITION.match(line):
+            msg = f"{where}: factor conditional line {line.strip()!r} has no tox.toml equivalent"
+            raise ValueError(msg)
+    if key in {"set_env", "setenv"}:
+        return [f"set_env.{_key(name)} = {_dump(item, inline=True)}" for name, item in _set_env(where, value).items()]
+    if section == "tox" and key == "labels":  # the env lists of the labels, unlike the labels of an environment
+        return [f"labels.{_key(name)} = {_dump(envs, used=len(name) + 10)}" for name, envs in _labels(value).items()]
+    return [f"{_key(key)} = {_dump(_convert(where, key, value), used=len(key) + 3)}"]
+
+
+def _convert(where: str, key: str, value: str) -> Value:
+    if key in _BOOLEANS:
+        return _boolean(where, value)
+    if key in _FLOATS:
+        return _float(where, value)
+    if key in _COMMANDS:
+        return [_command(where, line) for line in _commands(value)]
+    if key in _COMMAND:
+        return _command(where, " ".join(_commands(value)))
+    if key in _LISTS or key in _ENV_LISTS:
+        return _array(where, value, explode=key in _ENV_LISTS, comma_separated=key in _COMMA_SEPARATED)
+    return _string(where, value)
+
+
+def _boolean(where: str, value: str) -> Value:
+    if (normalized := value.strip().lower()) in _TRUE:
+        return True
+    if normalized in _FALSE:
+        return False
+    msg = f"{where}: {value!r} is not a boolean"  # e.g. a substitution, tox.toml takes it only as a boolean
+    raise ValueError(msg)
+
+
+def _float(where: str, value: str) -> Value:
+    try:
+        return float(value)
+    except ValueError:
+        return _string(where, value)  # e.g. a substitution
+
+
+def _array(where: str, value: str, *, explode: bool, comma_separated: bool) -> list[Value]:
+    result: list[Value] = []
+    for line in _lines(value):
+        if _REFERENCE.fullmatch(line):
+            result.append(_reference(where, line))
+        elif explode:  # tox.toml lists the environments, it has no brace expansion
+            result.extend(expand_env(line))
+        elif comma_separated:  # tox also takes these comma separated
+            result.extend(_string(where, entry.strip()) for entry in _TOP_LEVEL_COMMA.split(line) if entry.strip())
+        else:
+            result.append(_string(where, line))
+    return result
+
+
+def _labels(value: str) -> dict[str, list[Value]]:
+    result: dict[str, list[Value]] = {}
+    for line in _lines(value):
+        name, _, envs = line.partition("=")
+        entries = (entry.strip() for entry in _TOP_LEVEL_COMMA.split(envs))
+        result[name.strip()] = [env for entry in entries if entry for env in expand_env(entry)]
+    return result
+
+
+def _lines(value: str) -> list[str]:
+    return [line.strip() for line in value.splitlines() if line.strip()]
+
+
+def _string(where: str, text: str) -> Value:
+    if match := _ENV.fullmatch(text):
+        result: dict[str, Value] = {"replace": "env", "name": match["name"]}
+        if match["default"] is not None:
+            result["default"] = match["default"]
+        return result
+    if _REFERENCE.search(text):  # tox.toml references a whole value, not a part of one
+        msg = f"{where}: substituting a setting within {text!r} has no tox.toml equivalent"
+        raise ValueError(msg)
+    return text
+
+
+def _reference(where: str, text: str) -> Value:
+    match = _REFERENCE.fullmatch(text)
+    assert match is not None  # ruff:ignore[assert] # the callers matched it
+    section, key = match["section"], match["key"]
+    if (path := _table(section)) is None:
+        msg = f"{where}: the section of {text!r} has no tox.toml equivalent"
+        raise ValueError(msg)
+    return {"replace": "ref", "of": [*path, key], "extend": True}
+
+
+def _set_env(where: str, value: str) -> dict[str, Value]:
+    result: dict[str, Value] = {}
+    for line in _lines(value):
+        if line.startswith("file|"):
+            if "file" in result:
+                msg = f"{where}: more than one environment file has no tox.toml equivalent"
+                raise ValueError(msg)
+            result["file"] = line[len("file|") :]
+        elif _REFERENCE.fullmatch(line):
+            msg = f"{where}: substituting {line!r} has no tox.toml equivalent"
+            raise ValueError(msg)
+        else:
+            name, _, item = line.partition("=")
+            result[name.strip()] = _string(where, item.strip())
+    return result
+
+
+def _commands(value: str) -> Iterator[str]:
+    command = ""
+    for line in _lines(value):
+        if line.endswith("\\"):  # continues on the next line
+            command += f"{line[:-1].strip()} "
+        else:
+            yield command + line
+            command = ""
+    if command:
+        yield command.strip()
+
+
+def _command(where: str, line: str) -> Value:
+    if _REFERENCE.fullmatch(line):
+        return _reference(where, line)
+    result: list[Value] = []
+    for arg in _split(line):
+        if match := _POSARGS.fullmatch(arg):
+            posargs: dict[str, Value] = {"replace": "posargs", "extend": True}
+            if match["default"]:
+                posargs["default"] = list(_split(match["default"]))
+            result.append(posargs)
+        else:
+            result.append(_string(where, arg))
+    return result
+
+
+def _split(command: str) -> list[str]:
+    # as tox splits a command, but substitutions are kept whole as tox expands them before splitting
+    substitutions = _SUBSTITUTION.findall(command)
+    masked = _SUBSTITUTION.sub("\0", command.replace(r"\#", "#"))
+    stream = StringIO(masked)
+    splitter = shlex.shlex(stream, posix=True)
+    splitter.whitespace_split = True
+    splitter.commenters = ""
+    args: list[str] = []
+    at = 0
+    try:
+        for arg in splitter:
+            args.append(arg)
+            at = stream.tell()
+    except ValueError:  # e.g. no closing quotation, tox keeps the rest as a single argument
+        args.append(masked[at:].strip())
+    unmasked = iter(substitutions)
+    return [re.sub(r"\x00", lambda _: next(unmasked), arg) for arg in args]
+
+
+def _key(key: str) -> str:
+    return key if _BARE_KEY.fullmatch(key) else _dump(key)
+
+
+def _dump(value: Value, *, used: int = 0, indent: int = 0, inline: bool = False) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False).replace("\x7f", "\\u007f")  # JSON strings are TOML basic strings
+    if isinstance(value, dict):  # inline tables must fit on a single line
+        return f"{{ {', '.join(f'{_key(key)} = {_dump(item, inline=True)}' for key, item in value.items())} }}"
+    pad = "  " * (indent + 1)
+    items = [_dump(item, used=len(pad), indent=indent + 1, inline=inline) for item in value]
+    flat = f"[ {', '.join(items)} ]" if items else "[]"
+    if inline or ("\n" not in flat and used + len(flat) <= _WIDTH):
+        return flat
+    return "[\n{}{}]".format("".join(f"{pad}{item},\n" for item in items), "  " * indent)
+
+
+__all__ = [
+    "to_tox_toml",
+]
@@ -8,11 +8,15 @@ from collections import defaultdict
 from functools import partial
 from typing import TYPE_CHECKING, TypedDict, cast
 
+from .memo import memoize
 from .requires import requires
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Mapping
+    from collections.abc import Callable, Mapping, Sequence
     from configparser import ConfigParser
+    from typing import TypeAlias
+
+    _Group: TypeAlias = tuple[tuple[str, ...], ...]  # the alternatives of each factor
 
 
 def to_boolean(payload: str) -> str:
@@ -82,12 +86,13 @@ def is_substitute(value: str) -> bool:
     return False
 
 
-def to_list_of_env_values(pin_toxenvs: list[str], payload: str) -> str:
+def to_list_of_env_values(pin_toxenvs: Sequence[str], payload: str, *, compact: bool = False) -> str:
     """
     Expand list of tox envs.
 
     :param pin_toxenvs: envs to pin at top.
     :param payload: the tox envs list
+    :param compact: fold the envs forming cartesian products into brace groups, see :func:`compact_env_list`
     :return: the expanded tox env list
 
     Example:
@@ -96,41 +101,112 @@ def to_list_of_env_values(pin_toxenvs: list[str], payload: str) -> str:
     envlist = {py37,py36}-django{20,21},{py37,py36}-mango{20,21},py38.
 
     """
+    return _to_list_of_env_values(tuple(pin_toxenvs), payload, compact=compact)  # memoized on hashable arguments
+
+
+@memoize
+def _to_list_of_env_values(pin_toxenvs: tuple[str, ...], payload: str, *, compact: bool) -> str:
     within_braces, values = False, []
-    cur_str, brace_str = "", ""
+    # collect characters into lists and join once, instead of growing strings one character at a time
+    cur: list[str] = []
+    brace: list[str] = []
     for char in payload:
         if char == "{":
             within_braces = True
         elif char == "}":
             within_braces = False
-            envs = [i.strip() for i in brace_str[1:].split(",")]
+            envs = [i.strip() for i in "".join(brace[1:]).split(",")]
             order_env_list(envs, pin_toxenvs)
-            cur_str += f"{{{', '.join(envs)}}}"
-            brace_str = ""
+            cur.append(f"{{{', '.join(envs)}}}")
+            brace.clear()
             continue
         elif char in {",", "\n"}:
             if within_braces:
                 pass
             else:
-                to_add = cur_str.strip()
+                to_add = "".join(cur).strip()
                 if to_add:
                     values.append(to_add)
-                cur_str = ""
+                cur.clear()
                 continue
         if within_braces:
-            brace_str += char
+            brace.append(char)
         else:
-            cur_str += char
+            cur.append(char)
     # avoid adding an empty value, caused e.g. by a trailing comma
-    last_entry = cur_str.strip()
+    last_entry = "".join(cur).strip()
     if last_entry:
         values.append(last_entry)
-    # start with higher python version
-    order_env_list(values, pin_toxenvs)
+    if compact:  # ordered as the envs would be, the groups explode to the same sequence
+        values = compact_env_list(values, pin_toxenvs)
+    else:  # start with higher python version
+        order_env_list(values, pin_toxenvs)
     # use newline instead of comma as separator, indent values one per newline (no value on key-row)
     return "\n{}".format("\n".join(f"{v}" for v in values))
 
 
+def compact_env_list(values: list[str], pin_toxenvs: Sequence[str]) -> list[str]:
+    """
+    Fold envs forming cartesian products into brace groups.
+
+    For example ``py39-a``, ``py39-b``, ``py38-a`` and ``py38-b`` become ``{py39, py38}-{a, b}``.
+
+    The envs are ordered as :func:`order_env_list` does, then each one is merged with the group before it while the two
+    differ in a single factor and every factor before that one has a single alternative; so the groups explode to the
+    same sequence of envs, in linear time. Envs with a single factor, or already holding braces, are kept as they are.
+
+    :param values: the envs
+    :param pin_toxenvs: envs to pin at the top
+    :return: the envs and brace groups, in the order of their envs
+    """
+    ordered = list(dict.fromkeys(values))
+    order_env_list(ordered, pin_toxenvs)
+    result: list[str | _Group] = []
+    for value in ordered:
+        factors = value.split("-")
+        if len(factors) == 1 or any(not factor or "{" in factor or "}" in factor for factor in factors):
+            result.append(value)
+            continue
+        group: _Group = tuple((factor,) for factor in factors)
+        while result and not isinstance(previous := result[-1], str) and (merged := _merge(previous, group)):
+            result.pop()
+            group = merged
+        result.append(group)
+    return [value if isinstance(value, str) else "-".join(map(_brace, value)) for value in result]
+
+
+def _merge(first: _Group, second: _Group) -> _Group | None:
+    # the product of the union explodes to the envs of the first group then of the second one, if the factors before the
+    # differing one have a single alternative
+    if len(first) != len(second):
+        return None
+    differ = [at for at, (one, other) in enumerate(zip(first, second, strict=True)) if one != other]
+    if len(differ) != 1 or any(len(factors) != 1 for factors in first[: differ[0]]):
+        return None
+    at = differ[0]
+    return (*first[:at], first[at] + second[at], *first[at + 1 :])
+
+
+def _brace(factors: tuple[str, ...]) -> str:
+    return factors[0] if len(factors) == 1 else f"{{{', '.join(factors)}}}"
+
+
+_BRACES = re.compile(r"\{([^{}]*)}")
+
+
+def expand_env(entry: str) -> list[str]:
+    """
+    Expand the brace groups of an env list entry.
+
+    :param entry: the entry, e.g. ``py{39, 38}-{a, b}``
+    :return: the envs it stands for, e.g. ``py39-a``, ``py39-b``, ``py38-a`` and ``py38-b``
+    """
+    if (match := _BRACES.search(entry)) is None:
+        return [entry]
+    before, after = entry[: match.start()], entry[match.end() :]
+    return [env for factor in match[1].split(",") for env in expand_env(f"{before}{factor.strip()}{after}")]
+
+
 _TOX_ENV_MATCHER = re.compile(r"((?P<major>\d)([.](?P<minor>\d+))?)|(?P<name>[a-zA-Z]*)(?P<version>\d*)")
 
 
@@ -141,7 +217,7 @@ class _ToxMatch(TypedDict):
     minor: int
 
 
-def _get_py_version(pin_toxenvs: list[str], env_list: str) -> tuple[int, ...]:
+def _get_py_version(pin_toxenvs: Sequence[str], env_list: str) -> tuple[int, ...]:
     for element in env_list.split("-"):
         if element in pin_toxenvs:
             return len(element) - pin_toxenvs.index(element), 0
@@ -153,7 +229,7 @@ def _get_py_version(pin_toxenvs: list[str], env_list: str) -> tuple[int, ...]:
     return -3, 0
 
 
-def order_env_list(values: list[str], pin_toxenvs: list[str]) -> None:
+def order_env_list(values: list[str], pin_toxenvs: Sequence[str]) -> None:
     """
     Order environment list.
 
@@ -184,6 +260,7 @@ def collect_multi_line(
     :return:
     """
     groups: defaultdict[str, list[str]] = defaultdict(list)
+    seen: set[str] = set()  # the values of the unconditional group, to drop duplicates in constant time
     substitute: list[str] = []
     for line in value.strip().splitlines():
         match = CONDITIONAL_MARKER.match(line)
@@ -196,7 +273,8 @@ def collect_multi_line(
                 if part:  # remove empty lines
                     if is_substitute(part):
                         substitute.append(part)
-                    elif part not in groups[""]:  # remove duplicates
+                    elif part not in seen:  # remove duplicates
+                        seen.add(part)
                         groups[""].append(part)
     normalized_group = normalize(groups) if normalize else groups
     result = list(
@@ -208,6 +286,7 @@ def collect_multi_line(
     return result, substitute
 
 
+@memoize
 def to_py_dependencies(value: str) -> str:
     """
     Format to list Python dependencies.
@@ -0,0 +1,234 @@
+"""Verify that formatting kept the meaning of a tox ini file."""
+
+from __future__ import annotations
+
+import re
+from configparser import DEFAULTSECT, ConfigParser
+from typing import TYPE_CHECKING
+
+from packaging.requirements import InvalidRequirement
+from packaging.utils import canonicalize_name, canonicalize_version
+
+from .memo import memoize
+from .requires import parse_requirement
+from .test_env import TEST_ENV_UPGRADE
+from .tox_section import TOX_UPGRADE
+from .util import expand_env
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+    from packaging.specifiers import Specifier
+
+# how tox reads the value of a key, any key not listed is taken as text
+_KINDS = {
+    **dict.fromkeys(
+        (
+            "always_copy",
+            "args_are_paths",
+            "download",
+            "ignore_base_python_conflict",
+            "ignore_errors",
+            "ignore_outcome",
+            "no_package",
+            "parallel_show_output",
+            "pip_pre",
+            "recreate",
+            "skip_install",
+            "skip_missing_interpreters",
+            "system_site_packages",
+        ),
+        "boolean",
+    ),
+    **dict.fromkeys(("allowlist_externals", "extras", "pass_env"), "set"),
+    **dict.fromkeys(("deps", "requires"), "requirements"),
+    **dict.fromkeys(("depends", "env_list"), "envs"),
+    **dict.fromkeys(("commands_pre", "commands", "commands_post"), "commands"),
+    "set_env": "set_env",
+}
+_TRUE = frozenset({"true", "1", "yes", "on"})  # as tox converts to boolean
+_FALSE = frozenset({"false", "0", "no", "off", ""})
+_PROVISION = frozenset({"min_version", "minversion", "isolated_build"})  # upgraded to tox 4 on purpose, not compared
+
+_CONDITION = re.compile(r"(?P<factors>[\w.!{}, -]+):(?:\s|$)")  # as tox finds a factor conditional line
+_SUBSTITUTION = re.compile(r"\{\[[^]]*][^{}]*}")
+_SEPARATORS = re.compile(r"[,\s]+")
+_TOP_LEVEL_COMMA = re.compile(r",(?![^{]*})")
+_VERSION_PADDED = frozenset({"==", "!=", "<=", ">=", "<", ">"})  # compare the versions padded with zeros
+
+
+class SemanticChangeError(ValueError):
+    """Formatting changed the meaning of a tox ini file."""
+
+
+def verify_tox_ini(before: str, after: str) -> None:
+    """
+    Verify that formatting kept the meaning of a tox ini file.
+
+    Both texts are parsed and each section that differs is compared through a model that holds what tox reads from it:
+    the legacy keys under their current names, the flags as booleans, the lists and dependencies as sets of normalized
+    entries, the set env as a mapping and the commands as arguments. Sections that parse to the same values are not
+    modeled, so the cost is proportional to what the formatting changed. The tox version requirement and the keys
+    formatting upgrades to tox 4 on purpose (``min_version`` and ``isolated_build``) are not compared.
+
+    :param before: the text that was formatted
+    :param after: the formatted text
+    :raises SemanticChangeError: the meaning of a key changed, all such keys are listed
+    """
+    original, formatted = _parse(before), _parse(after)
+    changes: list[str] = []
+    for name in dict.fromkeys([DEFAULTSECT, "tox", *original.sections(), *formatted.sections()]):
+        was, now = _values(original, name), _values(formatted, name)
+        if was == now:  # formatting left the section as it was
+            continue
+        was, now = _model(name, was), _model(name, now)
+        changes.extend(f"[{name}] {key}" for key in sorted(was.keys() | now.keys()) if was.get(key) != now.get(key))
+    if changes:
+        msg = f"formatting changes the meaning of {', '.join(changes)}"
+        raise SemanticChangeError(msg)
+
+
+def _parse(text: str) -> ConfigParser:
+    parser = ConfigParser(interpolation=None)
+    parser.read_string(text)
+    return parser
+
+
+def _values(parser: ConfigParser, name: str) -> dict[str, str]:
+    # a missing section reads as an empty one, which inherits the default values
+    return dict(parser[name]) if name == DEFAULTSECT or parser.has_section(name) else dict(parser.defaults())
+
+
+def _model(name: str, values: Mapping[str, str]) -> dict[str, str]:
+    if name == "tox":
+        current = {TOX_UPGRADE.get(key, key): value for key, value in values.items() if key not in _PROVISION}
+    elif name == "testenv" or name.startswith("testenv:"):
+        current = {TEST_ENV_UPGRADE.get(key, key): value for key, value in values.items()}
+        use_develop = next((current.pop(key) for key in ("usedevelop", "use_develop") if key in current), "false")
+        if _boolean(use_develop) == "true":
+            current.setdefault("package", "editable")  # an explicit package takes precedence
+    else:  # configures another tool, taken as text
+        return dict(values)
+    result: dict[str, str] = {}
+    for key, value in current.items():
+        kind = _KINDS.get(key, "text")
+        model = model_value(kind, value)
+        if name == "tox" and key == "requires":  # the tox version requirement is raised to tox 4 on purpose
+            model = "\n".join(line for line in model.splitlines() if not line.startswith("tox["))
+        if model or kind == "text":  # an empty list is the same as no list
+            result[key] = model
+    return result
+
+
+@memoize
+def model_value(kind: str, value: str) -> str:
+    """
+    Model what tox reads from a value, values that tox reads the same have the same model.
+
+    :param kind: how tox reads the value - ``boolean``, ``set``, ``requirements``, ``envs``, ``commands``,
+        ``set_env`` or ``text``
+    :param value: the raw value
+    :return: the model
+    """
+    if kind == "text":
+        return value
+    if kind == "boolean":
+        return _boolean(value)
+    if kind == "commands":
+        return "\n".join(_commands(value))
+    if kind == "set_env":
+        return "\n".join(sorted(_set_env(value)))
+    entries: set[str] = set()
+    for factors, content in _lines(value):
+        if kind == "requirements":
+            entries.add(f"{factors}{_requirement(content)}")
+        elif kind == "envs" and not _SUBSTITUTION.fullmatch(content):
+            entries.update(f"{factors}{env}" for entry in _TOP_LEVEL_COMMA.split(content) for env in _envs(entry))
+        else:
+            entries.update(f"{factors}{part}" for part in _SEPARATORS.split(content) if part)
+    return "\n".join(sorted(entries))
+
+
+def _boolean(value: str) -> str:  # as tox converts it, a value tox rejects is kept as it is
+    normalized = value.strip().lower()
+    if normalized in _TRUE:
+        return "true"
+    return "false" if normalized in _FALSE else value
+
+
+def _lines(value: str) -> Iterator[tuple[str, str]]:
+    for raw in value.splitlines():
+        if not (line := raw.strip()):
+            continue
+        if match := _CONDITION.match(line):
+            yield f"{_factors(match['factors'])}: ", line[match.end() :].strip()
+        else:
+            yield "", line
+
+
+def _factors(expression: str) -> str:
+    # the environments a line applies to, the order of the alternatives and of the factors within one is irrelevant
+    alternatives = {
+        "-".join(sorted(alternative.split("-")))
+        for group in _TOP_LEVEL_COMMA.split(expression)
+        for alternative in expand_env(group.strip())
+    }
+    return ",".join(sorted(alternatives))
+
+
+def _envs(entry: str) -> list[str]:
+    return [env for env in expand_env(entry.strip()) if env]
+
+
+def _requirement(text: str) -> str:
+    try:
+        requirement = parse_requirement(text)
+    except InvalidRequirement:  # e.g. an option for pip or a path
+        return " ".join(text.split())
+    extras = ",".join(sorted(canonicalize_name(extra) for extra in requirement.extras))
+    specifiers = ",".join(sorted(map(_specifier, requirement.specifier)))
+    url = f"@{requirement.url}" if requirement.url else ""
+    marker = f";{requirement.marker}" if requirement.marker else ""
+    return f"{canonicalize_name(requirement.name)}[{extras}]{specifiers}{url}{marker}"
+
+
+def _specifier(specifier: Specifier) -> str:
+    version = specifier.version
+    if specifier.operator in _VERSION_PADDED and not version.endswith(".*"):
+        version = canonicalize_version(version, strip_trailing_zero=True)
+    return f"{specifier.operator}{version}"
+
+
+def _set_env(value: str) -> set[str]:
+    entries: set[str] = set()
+    assigned: dict[tuple[str, str], str] = {}  # a later line overrides an earlier one for the same name
+    for factors, content in _lines(value):
+        name, equals, assigned_value = content.partition("=")
+        if content.startswith("file|") or _SUBSTITUTION.fullmatch(content) or not equals:
+            entries.add(f"{factors}{content}")
+        else:
+            assigned[factors, name.strip()] = assigned_value.strip()
+    entries.update(f"{factors}{name}={assigned_value}" for (factors, name), assigned_value in assigned.items())
+    return entries
+
+
+def _commands(value: str) -> Iterator[str]:
+    # the whitespace within a line is kept, as it may be quoted; only the one around the continuations is not
+    parts: list[str] = []
+    for raw in value.splitlines():
+        if not (line := raw.strip()):
+            continue
+        if line.endswith("\\"):  # continues on the next line
+            if part := line[:-1].rstrip():
+                parts.append(part)
+        else:
+            yield " ".join([*parts, line])
+            parts.clear()
+    if parts:
+        yield " ".join(parts)
+
+
+__all__ = [
+    "SemanticChangeError",
+    "verify_tox_ini",
+]
@@ -0,0 +1,153 @@
+"""Query the local git repository."""
+
+from __future__ import annotations
+
+import subprocess  # ruff:ignore[suspicious-subprocess-import]
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, cast
+
+if TYPE_CHECKING:
+    from types import TracebackType
+    from typing import Self
+
+
+class GitError(RuntimeError):
+    """Failed to query git."""
+
+
+def changed_tox_ini(ref: str, cwd: Path) -> list[Path]:
+    """
+    List the tox.ini files modified, added or renamed since a git reference.
+
+    :param ref: the git reference to compare the working tree against (e.g. ``origin/main`` or ``origin/main...HEAD``)
+    :param cwd: a directory within the repository
+    :return: the absolute paths of the changed tox.ini files
+    """
+    root = toplevel(cwd)
+    # --end-of-options: a reference starting with a dash must not be taken as an option (e.g. --output)
+    args = ["diff", "--name-only", "-z", "--diff-filter=AMR", "--end-of-options", ref, "--", ":(top,glob)**/tox.ini"]
+    names = _git(args, cwd)
+    return [root / name for name in names.split("\0") if name]
+
+
+def toplevel(cwd: Path) -> Path:
+    """
+    Find the root of the repository.
+
+    :param cwd: a directory within the repository
+    :return: the root directory of the working tree
+    """
+    return Path(_git(["rev-parse", "--show-toplevel"], cwd).rstrip("\n"))
+
+
+def verify_commit(rev: str, cwd: Path) -> str:
+    """
+    Resolve a revision to a commit.
+
+    :param rev: the revision (e.g. a branch, tag or commit)
+    :param cwd: a directory within the repository
+    :return: the commit id
+    """
+    return _git(["rev-parse", "--verify", "--end-of-options", f"{rev}^{{commit}}"], cwd).rstrip("\n")
+
+
+def tox_ini_in_revision(rev: str, cwd: Path) -> list[str]:
+    """
+    List the tox.ini files of a revision.
+
+    :param rev: the revision
+    :param cwd: a directory within the repository
+    :return: the paths of the files, relative to the root of the repository
+    """
+    names = _git(["ls-tree", "-r", "-z", "--name-only", "--full-tree", "--end-of-options", rev], cwd)
+    return [name for name in names.split("\0") if name.rpartition("/")[2] == "tox.ini"]
+
+
+class BlobReader:
+    """Reads the files of revisions through one long-lived ``git cat-file --batch`` process, not the working tree."""
+
+    def __init__(self, cwd: Path) -> None:
+        """
+        Start the reader.
+
+        :param cwd: a directory within the repository
+        """
+        try:
+            self._process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],  # ruff:ignore[start-process-with-partial-path]
+                cwd=cwd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+        except FileNotFoundError as exc:
+            msg = "git executable not found"
+            raise GitError(msg) from exc
+        self._stdin = cast("IO[bytes]", self._process.stdin)  # both are pipes
+        self._stdout = cast("IO[bytes]", self._process.stdout)
+
+    def __enter__(self) -> Self:
+        """:return: the reader"""
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None
+    ) -> None:
+        """Stop the reader."""
+        self.close()
+
+    def read(self, rev: str, path: str) -> bytes | None:
+        """
+        Read a file of a revision.
+
+        :param rev: the revision
+        :param path: the path of the file, relative to the root of the repository
+        :return: the content of the file, ``None`` if the revision has no such file
+        """
+        try:
+            self._stdin.write(f"{rev}:{path}\n".encode())
+            self._stdin.flush()
+        except BrokenPipeError:
+            pass  # git exited, reported as no header follows
+        header = self._stdout.readline()  # <object> <type> <size> or <object> missing
+        if not header:
+            msg = f"git cat-file exited with code {self._process.wait()}"
+            raise GitError(msg)
+        parts = header.split()
+        if len(parts) != 3:  # ruff:ignore[magic-value-comparison] # <object> missing or <object> ambiguous
+            return None
+        content = self._stdout.read(int(parts[2]) + 1)[:-1]  # the content is followed by a line feed
+        return content if parts[1] == b"blob" else None  # not a file, e.g. a directory
+
+    def close(self) -> None:
+        """Stop the reader."""
+        self._stdin.close()
+        self._process.wait()
+        self._stdout.close()
+
+
+def _git(args: list[str], cwd: Path) -> str:
+    try:
+        result = subprocess.run(  # ruff:ignore[subprocess-without-shell-equals-true]
+            ["git", *args],  # ruff:ignore[start-process-with-partial-path]
+            cwd=cwd,
+            capture_output=True,
+            check=True,
+            encoding="utf-8",
+        )
+    except FileNotFoundError as exc:
+        msg = "git executable not found"
+        raise GitError(msg) from exc
+    except subprocess.CalledProcessError as exc:
+        msg = exc.stderr.strip() or f"git {args[0]} failed with exit code {exc.returncode}"
+        raise GitError(msg) from exc
+    return result.stdout
+
+
+__all__ = [
+    "BlobReader",
+    "GitError",
+    "changed_tox_ini",
+    "toplevel",
+    "tox_ini_in_revision",
+    "verify_commit",
+]
@@ -0,0 +1,188 @@
+"""Language server, keeps the formatter resident for editors - speaks the Language Server Protocol over stdio."""
+
+from __future__ import annotations
+
+import json
+import re
+import sys
+from configparser import ConfigParser
+from typing import TYPE_CHECKING, Any
+
+from tox_ini_fmt.formatter import Document, format_tox_ini, format_tox_ini_document
+from tox_ini_fmt.version import __version__
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import BinaryIO
+
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")  # the line breaks of the protocol
+_METHOD_NOT_FOUND = -32601
+_INTERNAL_ERROR = -32603
+_FULL_SYNC = 1
+
+
+class LanguageServer:
+    """Serves the formatting requests of a client, for the documents it opened."""
+
+    def __init__(self, reader: BinaryIO, writer: BinaryIO) -> None:
+        """
+        Create the server.
+
+        :param reader: the stream of messages from the client
+        :param writer: the stream of messages to the client
+        """
+        self._reader = reader
+        self._writer = writer
+        self._documents: dict[str, str] = {}
+        self._shut_down = False
+        self._requests: dict[str, Callable[[Any], Any]] = {
+            "initialize": self._initialize,
+            "shutdown": self._shutdown,
+            "textDocument/formatting": self._formatting,
+            "textDocument/rangeFormatting": self._range_formatting,
+        }
+        self._notifications: dict[str, Callable[[Any], None]] = {
+            "textDocument/didOpen": self._did_open,
+            "textDocument/didChange": self._did_change,
+            "textDocument/didClose": self._did_close,
+        }
+
+    def serve(self) -> int:
+        """:return: exit code, once the client asked to exit or closed the stream"""
+        while (message := _read_message(self._reader)) is not None:
+            method, params = message.get("method"), message.get("params")
+            if method == "exit":
+                return 0 if self._shut_down else 1
+            if method is None:  # a response, we send no requests
+                continue
+            if "id" in message:
+                self._respond(message["id"], method, params)
+            elif (notification := self._notifications.get(method)) is not None:
+                notification(params)
+        return 1
+
+    def _respond(self, request_id: int | str, method: str, params: Any) -> None:  # ruff:ignore[any-type]
+        response: dict[str, Any] = {"jsonrpc": "2.0", "id": request_id}
+        if (handler := self._requests.get(method)) is None:
+            response["error"] = {"code": _METHOD_NOT_FOUND, "message": f"method not found: {method}"}
+        else:
+            try:
+                response["result"] = handler(params)
+            # report to the client and keep serving, e.g. when a file does not parse
+            except Exception as exc:  # ruff:ignore[blind-except]
+                response["error"] = {"code": _INTERNAL_ERROR, "message": str(exc)}
+        _write_message(self._writer, response)
+
+    @staticmethod
+    def _initialize(_: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "capabilities": {
+                "textDocumentSync": _FULL_SYNC,
+                "documentFormattingProvider": True,
+                "documentRangeFormattingProvider": True,
+            },
+            "serverInfo": {"name": "tox-ini-fmt", "version": __version__},
+        }
+
+    def _shutdown(self, _: None) -> None:
+        self._shut_down = True
+
+    def _did_open(self, params: dict[str, Any]) -> None:
+        self._documents[params["textDocument"]["uri"]] = params["textDocument"]["text"]
+
+    def _did_change(self, params: dict[str, Any]) -> None:
+        self._documents[params["textDocument"]["uri"]] = params["contentChanges"][-1]["text"]
+
+    def _did_close(self, params: dict[str, Any]) -> None:
+        self._documents.pop(params["textDocument"]["uri"], None)
+
+    def _formatting(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        text = self._documents[params["textDocument"]["uri"]]
+        lines = _LINE_BREAK.split(text)
+        newline = _newline(text)
+        formatted = format_tox_ini("\n".join(lines)).replace("\n", newline)
+        if formatted == text:
+            return []
+        return [_edit(0, (len(lines) - 1, _utf16_length(lines[-1])), formatted)]
+
+    def _range_formatting(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        text = self._documents[params["textDocument"]["uri"]]
+        lines = _LINE_BREAK.split(text)
+        newline = _newline(text)
+        start, end = params["range"]["start"]["line"], params["range"]["end"]
+        # a range ending at the start of a line does not include that line
+        last = end["line"] - 1 if end["character"] == 0 and end["line"] > start else end["line"]
+        sections = {section.name: section for section in format_tox_ini_document("\n".join(lines)).sections}
+        edits: list[dict[str, Any]] = []
+        for header, following, name in _section_blocks(lines):
+            if header > last or (following is not None and following <= start):
+                continue  # the block does not intersect the range
+            if (section := sections.get(name)) is None:  # an empty DEFAULT section is not kept
+                continue
+            if following is None:
+                end_at, old_text = (len(lines) - 1, _utf16_length(lines[-1])), newline.join(lines[header:])
+                new_text = Document((section,)).to_text()
+            else:
+                end_at, old_text = (following, 0), newline.join(lines[header:following]) + newline
+                new_text = Document((section,)).to_text() + "\n"  # the blank line separating the sections
+            if (new_text := new_text.replace("\n", newline)) != old_text:
+                edits.append(_edit(header, end_at, new_text))
+        return edits
+
+
+def _section_blocks(lines: list[str]) -> list[tuple[int, int | None, str]]:
+    headers = [(at, match["header"]) for at, line in enumerate(lines) if (match := ConfigParser.SECTCRE.match(line))]
+    return [
+        (at, headers[index + 1][0] if index + 1 < len(headers) else None, name)
+        for index, (at, name) in enumerate(headers)
+    ]
+
+
+def _newline(text: str) -> str:
+    return match.group() if (match := _LINE_BREAK.search(text)) else "\n"
+
+
+def _utf16_length(text: str) -> int:  # positions count UTF-16 code units
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _edit(start_line: int, end: tuple[int, int], new_text: str) -> dict[str, Any]:
+    return {
+        "range": {"start": {"line": start_line, "character": 0}, "end": {"line": end[0], "character": end[1]}},
+        "newText": new_text,
+    }
+
+
+def _read_message(reader: BinaryIO) -> dict[str, Any] | None:
+    length = 0
+    while (line := reader.readline()).strip():
+        name, _, value = line.decode("ascii").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    if not line:
+        return None
+    return json.loads(reader.read(length))
+
+
+def _write_message(writer: BinaryIO, message: dict[str, Any]) -> None:
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    writer.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+    writer.flush()
+
+
+def main() -> int:
+    """
+    Run the language server on the standard streams.
+
+    :return: exit code
+    """
+    return LanguageServer(sys.stdin.buffer, sys.stdout.buffer).serve()
+
+
+__all__ = [
+    "LanguageServer",
+    "main",
+]
+
+if __name__ == "__main__":
+    raise SystemExit(main())
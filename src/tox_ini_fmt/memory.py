@@ -0,0 +1,106 @@
+"""Attribute memory allocations to the formatting phases."""
+
+from __future__ import annotations
+
+import sys
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from operator import itemgetter
+from typing import TYPE_CHECKING, TextIO
+
+from .tracing import Tracer
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+class _PhaseStats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.peak = 0
+        self.retained = 0
+        self.sites: defaultdict[str, int] = defaultdict(int)
+
+
+class MemoryReport(Tracer):
+    """
+    Take a :mod:`tracemalloc` snapshot around every phase span.
+
+    Reports per phase the highest peak of memory allocated while the phase ran, the memory it allocated and did not
+    free by its end (retained), and the source lines responsible for the most retained memory.
+    """
+
+    def __init__(self, stream: TextIO | None = None, top: int = 5) -> None:
+        """
+        Create the report, starts tracing memory allocations.
+
+        :param stream: where to write the report on close, defaults to the standard error
+        :param top: number of allocation sites to show per phase
+        """
+        self._stream = stream
+        self._top = top
+        self._phases: dict[str, _PhaseStats] = {}
+        self._stop = not tracemalloc.is_tracing()
+        if self._stop:
+            tracemalloc.start()
+        self._filters = [
+            tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__),
+            tracemalloc.Filter(inclusive=False, filename_pattern=__file__),
+        ]
+        self._start, _ = tracemalloc.get_traced_memory()
+
+    @contextmanager
+    def span(self, name: str, category: str, **args: str) -> Generator[None]:  # ruff:ignore[unused-method-argument]
+        """
+        Mark a unit of work, only phases are measured.
+
+        :param name: name of the span
+        :param category: category of the span - ``file``, ``phase`` or ``section``
+        :param args: extra information to attach to the span
+        """
+        if category != "phase":
+            yield
+            return
+        before = tracemalloc.take_snapshot().filter_traces(self._filters)
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot().filter_traces(self._filters)
+            stats = self._phases.setdefault(name, _PhaseStats())
+            stats.calls += 1
+            stats.peak = max(stats.peak, peak - start)
+            stats.retained += current - start
+            for diff in after.compare_to(before, "lineno"):
+                if diff.size_diff > 0:
+                    frame = diff.traceback[0]
+                    stats.sites[f"{frame.filename}:{frame.lineno}"] += diff.size_diff
+
+    def close(self) -> None:
+        """Stop tracing and write the report."""
+        current, _ = tracemalloc.get_traced_memory()
+        if self._stop:
+            tracemalloc.stop()
+        lines = [f"{'phase':<10} {'calls':>6} {'peak':>12} {'retained':>12}"]
+        lines.extend(
+            f"{name:<10} {stats.calls:>6} {_size(stats.peak):>12} {_size(stats.retained):>12}"
+            for name, stats in self._phases.items()
+        )
+        lines.append(f"retained by the whole run: {_size(current - self._start)}")
+        for name, stats in self._phases.items():
+            sites = sorted(stats.sites.items(), key=itemgetter(1), reverse=True)[: self._top]
+            lines.append(f"top allocation sites of {name}:")
+            lines.extend(f"  {_size(size):>12} {site}" for site, size in sites)
+        print("\n".join(lines), file=self._stream or sys.stderr)
+
+
+def _size(value: int) -> str:
+    return f"{value / 1024:.1f} KiB"
+
+
+__all__ = [
+    "MemoryReport",
+]
@@ -0,0 +1,139 @@
+"""Aggregate counters of a run, for capacity planning across CI runs."""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any
+
+from .formatter.memo import cache_stats
+from .formatter.requires import requirement_parses
+from .tracing import Tracer
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+_PREFIX = "tox_ini_fmt"
+_COUNTERS = {  # the counters of the run, with their description
+    "files": "files processed",
+    "files_changed": "files not formatted",
+    "files_failed": "files that could not be formatted",
+    "read_bytes": "bytes read",
+    "written_bytes": "bytes written back",
+    "requirement_parses": "requirements parsed",
+}
+
+
+class Metrics(Tracer):
+    """
+    Count the files, bytes, requirement parses and transform cache hits of a run, and time its phases and formatters.
+
+    The counters are written on close, as JSON when the path ends with ``.json`` and in the Prometheus text format
+    otherwise (e.g. for the textfile collector of the node exporter). Times spent on multiple threads are summed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Create the metrics.
+
+        :param path: the file to write the counters to
+        """
+        self._path = path
+        self._lock = threading.Lock()  # spans and counts arrive from the worker threads with --jobs and --io-window
+        self._counters: defaultdict[str, int] = defaultdict(int)
+        self._phases: defaultdict[str, int] = defaultdict(int)
+        self._formatters: defaultdict[str, int] = defaultdict(int)
+        self._caches = cache_stats()  # the process wide counters are reported relative to the start of the run
+        self._parses = requirement_parses()
+        self._start = perf_counter_ns()
+
+    @contextmanager
+    def span(self, name: str, category: str, **args: str) -> Generator[None]:  # ruff:ignore[unused-method-argument]
+        """
+        Mark a unit of work, files are counted and phases and sections timed.
+
+        :param name: name of the span
+        :param category: category of the span - ``file``, ``phase`` or ``section``
+        :param args: extra information to attach to the span
+        """
+        start = perf_counter_ns()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter_ns() - start
+            with self._lock:
+                if category == "file":
+                    self._counters["files"] += 1
+                elif category == "phase":
+                    self._phases[name] += elapsed
+                else:  # sections, by the formatter handling them
+                    self._formatters["tox_section" if name == "tox" else "test_env"] += elapsed
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Add to a counter of the run.
+
+        :param name: name of the counter, e.g. ``read_bytes``
+        :param value: the amount to add
+        """
+        with self._lock:
+            self._counters[name] += value
+
+    def close(self) -> None:
+        """Write the counters."""
+        metrics = self._collect()
+        text = json.dumps(metrics, indent=2) + "\n" if self._path.suffix == ".json" else _prometheus(metrics)
+        self._path.write_text(text, encoding="utf-8")
+
+    def _collect(self) -> dict[str, Any]:
+        seconds = (perf_counter_ns() - self._start) / 1e9
+        counters = {name: self._counters[name] for name in _COUNTERS}
+        counters["requirement_parses"] = requirement_parses() - self._parses
+        caches: dict[str, dict[str, float]] = {}
+        for name, stats in cache_stats().items():
+            before = self._caches.get(name)
+            hits = stats.hits - (before.hits if before else 0)
+            misses = stats.misses - (before.misses if before else 0)
+            caches[name] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            }
+        return {
+            **counters,
+            "seconds": seconds,
+            "files_per_second": counters["files"] / seconds,
+            "phase_seconds": {name: value / 1e9 for name, value in self._phases.items()},
+            "formatter_seconds": {name: value / 1e9 for name, value in self._formatters.items()},
+            "caches": caches,
+        }
+
+
+def _prometheus(metrics: dict[str, Any]) -> str:
+    lines: list[str] = []
+
+    def add(name: str, kind: str, description: str, samples: dict[str, float]) -> None:
+        lines.extend((f"# HELP {_PREFIX}_{name} {description}", f"# TYPE {_PREFIX}_{name} {kind}"))
+        lines.extend(f"{_PREFIX}_{name}{labels} {value}" for labels, value in samples.items())
+
+    for name, description in _COUNTERS.items():
+        add(f"{name}_total", "counter", description.capitalize(), {"": metrics[name]})
+    add("seconds", "gauge", "Duration of the run", {"": metrics["seconds"]})
+    add("files_per_second", "gauge", "Files processed per second of the run", {"": metrics["files_per_second"]})
+    for group in ("phase", "formatter"):
+        samples = {f'{{{group}="{name}"}}': value for name, value in metrics[f"{group}_seconds"].items()}
+        add(f"{group}_seconds_total", "counter", f"Time spent per {group}, summed over threads", samples)
+    caches = metrics["caches"]
+    for field in ("hits", "misses"):
+        samples = {f'{{transform="{name}"}}': stats[field] for name, stats in caches.items()}
+        add(f"cache_{field}_total", "counter", f"Transform cache {field}", samples)
+    return "\n".join(lines) + "\n"
+
+
+__all__ = [
+    "Metrics",
+]
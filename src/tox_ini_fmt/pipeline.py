@@ -0,0 +1,118 @@
+"""Overlap reading and writing files with formatting them."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import islice
+from typing import TYPE_CHECKING, TypeVar, cast
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Callable, Generator, Iterable, Iterator
+    from concurrent.futures import Future
+
+Item = TypeVar("Item")
+Loaded = TypeVar("Loaded")
+Result = TypeVar("Result")
+
+_DONE = object()
+
+
+def pipeline(
+    items: Iterable[Item],
+    *,
+    window: int,
+    load: Callable[[Item], Loaded],
+    process: Callable[[Item, Loaded], tuple[Result, Callable[[], None] | None]],
+) -> Generator[Result]:
+    """
+    Process items in order, while loading the next ones and storing the previous ones in the background.
+
+    The loads run on worker threads, at most ``window`` ahead of the item being processed, so memory stays bounded by
+    the window. The processing runs on the calling thread as the results are consumed; it returns the result and an
+    optional store callable, which runs on a worker thread with at most ``window`` of them pending.
+
+    :param items: the items to process
+    :param window: the maximum number of items loaded ahead and of stores pending
+    :param load: load an item (I/O bound)
+    :param process: process a loaded item (CPU bound)
+    :return: the results in the order of the items
+    """
+    loop = asyncio.new_event_loop()
+    with ThreadPoolExecutor(max_workers=window * 2) as executor:
+        results = _pipeline(executor, iter(items), window=window, load=load, process=process)
+        try:
+            while (result := loop.run_until_complete(anext(results, _DONE))) is not _DONE:
+                yield cast("Result", result)
+        finally:
+            loop.run_until_complete(results.aclose())  # wait for the pending stores, even if the caller stops early
+            loop.close()
+
+
+def ordered_map(
+    executor: Executor, function: Callable[[Item], Result], items: Iterable[Item], *, window: int
+) -> Generator[Result]:
+    """
+    Map the items on the executor like :meth:`Executor.map`, but submit them as the results are consumed.
+
+    At most ``window`` items are submitted ahead of the result being consumed, so the items can come from a lazy stream
+    of any length; the ones submitted but not started yet are cancelled when the caller stops early.
+
+    :param executor: the executor to run the function on
+    :param function: the function to map
+    :param items: the items to map
+    :param window: the maximum number of items submitted and not yet consumed
+    :return: the results in the order of the items
+    """
+    remaining = iter(items)
+    submitted: deque[Future[Result]] = deque(executor.submit(function, item) for item in islice(remaining, window))
+    try:
+        while submitted:
+            future = submitted.popleft()
+            submitted.extend(executor.submit(function, item) for item in islice(remaining, 1))
+            yield future.result()
+    finally:
+        for future in submitted:
+            future.cancel()
+
+
+async def _pipeline(
+    executor: ThreadPoolExecutor,
+    items: Iterator[Item],
+    *,
+    window: int,
+    load: Callable[[Item], Loaded],
+    process: Callable[[Item, Loaded], tuple[Result, Callable[[], None] | None]],
+) -> AsyncGenerator[Result]:
+    loop = asyncio.get_running_loop()
+    loading: deque[tuple[Item, asyncio.Future[Loaded]]] = deque()
+    storing: set[asyncio.Future[None]] = set()
+
+    def prefetch() -> None:
+        loading.extend(
+            (item, loop.run_in_executor(executor, load, item)) for item in islice(items, window - len(loading))
+        )
+
+    try:
+        prefetch()
+        while loading:
+            item, loaded = loading.popleft()
+            value = await loaded
+            prefetch()  # the next loads start before processing this one
+            result, store = process(item, value)
+            if store is not None:
+                if len(storing) >= window:
+                    done, storing = await asyncio.wait(storing, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        future.result()  # surface store failures
+                storing.add(loop.run_in_executor(executor, store))
+            yield result
+    finally:
+        await asyncio.gather(*storing)
+
+
+__all__ = [
+    "ordered_map",
+    "pipeline",
+]
@@ -0,0 +1,72 @@
+"""Split the files across independent runners."""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def select_shard(paths: Sequence[Path], index: int, count: int, *, by_size: bool = False) -> list[Path]:
+    """
+    Select the files of a shard, every runner computes the same assignment without coordinating with the others.
+
+    The assignment depends only on the paths relative to the current working directory (and their size when
+    balancing by size), so runners with checkouts at different locations agree on it.
+
+    :param paths: all the files
+    :param index: the shard to select, from 1 to ``count``
+    :param count: the number of shards
+    :param by_size: balance the total size of the shards, instead of assigning the files by a hash of their path
+    :return: the files of the shard, in the order of the paths
+    """
+    keys = [_key(path) for path in paths]
+    if by_size:
+        shards = _balance(keys, [path.stat().st_size for path in paths], count)
+    else:
+        shards = [_hashed(key, count) for key in keys]
+    return [path for path, shard in zip(paths, shards, strict=True) if shard == index - 1]
+
+
+def in_shard(path: Path, index: int, count: int) -> bool:
+    """
+    Check if a file belongs to a shard by the hash of its path, as :func:`select_shard` assigns it.
+
+    :param path: the file
+    :param index: the shard, from 1 to ``count``
+    :param count: the number of shards
+    :return: the file belongs to the shard
+    """
+    return _hashed(_key(path), count) == index - 1
+
+
+def _hashed(key: str, count: int) -> int:
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "big") % count
+
+
+def _key(path: Path) -> str:
+    try:
+        return path.relative_to(Path.cwd()).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def _balance(keys: list[str], sizes: list[int], count: int) -> list[int]:
+    # largest first onto the least loaded shard, ties broken by the key and the shard index to stay deterministic
+    shards = [0] * len(keys)
+    loads = [(0, shard) for shard in range(count)]
+    for at in sorted(range(len(keys)), key=lambda at: (-sizes[at], keys[at])):
+        load, shard = heapq.heappop(loads)
+        shards[at] = shard
+        heapq.heappush(loads, (load + sizes[at], shard))
+    return shards
+
+
+__all__ = [
+    "in_shard",
+    "select_shard",
+]
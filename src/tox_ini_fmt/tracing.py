@@ -0,0 +1,157 @@
+"""Tracing of the formatting phases."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from contextlib import ExitStack, contextmanager, nullcontext
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Sequence
+    from contextlib import AbstractContextManager
+    from pathlib import Path
+
+_NO_SPAN = nullcontext()
+
+
+class Tracer:
+    """Receives the spans of the formatting work, this base implementation ignores them."""
+
+    def span(  # ruff:ignore[no-self-use]
+        self,
+        name: str,  # ruff:ignore[unused-method-argument]
+        category: str,  # ruff:ignore[unused-method-argument]
+        **args: str,  # ruff:ignore[unused-method-argument]
+    ) -> AbstractContextManager[None]:
+        """
+        Mark a unit of work.
+
+        :param name: name of the span
+        :param category: category of the span - ``file``, ``phase`` or ``section``
+        :param args: extra information to attach to the span
+        :return: context manager delimiting the span
+        """
+        return _NO_SPAN
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Add to a counter of the run.
+
+        :param name: name of the counter, e.g. ``read_bytes``
+        :param value: the amount to add
+        """
+
+    def close(self) -> None:
+        """Finish tracing, called once all work is done."""
+
+
+NO_TRACE = Tracer()
+
+
+class TracerGroup(Tracer):
+    """Forwards the spans to multiple tracers."""
+
+    def __init__(self, tracers: Sequence[Tracer]) -> None:
+        """
+        Create the group.
+
+        :param tracers: the tracers to forward to
+        """
+        self._tracers = tracers
+
+    @contextmanager
+    def span(self, name: str, category: str, **args: str) -> Generator[None]:
+        """
+        Mark a unit of work.
+
+        :param name: name of the span
+        :param category: category of the span - ``file``, ``phase`` or ``section``
+        :param args: extra information to attach to the span
+        """
+        with ExitStack() as stack:
+            for tracer in self._tracers:
+                stack.enter_context(tracer.span(name, category, **args))
+            yield
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Add to a counter of the run.
+
+        :param name: name of the counter, e.g. ``read_bytes``
+        :param value: the amount to add
+        """
+        for tracer in self._tracers:
+            tracer.count(name, value)
+
+    def close(self) -> None:
+        """Close all tracers."""
+        for tracer in self._tracers:
+            tracer.close()
+
+
+def combine(tracers: Sequence[Tracer]) -> Tracer:
+    """
+    Combine tracers into one.
+
+    :param tracers: the tracers to combine
+    :return: a tracer forwarding to all of them
+    """
+    if not tracers:
+        return NO_TRACE
+    return tracers[0] if len(tracers) == 1 else TracerGroup(tracers)
+
+
+class ChromeTracer(Tracer):
+    """Collects spans as Chrome trace events, view them with ``chrome://tracing`` or https://ui.perfetto.dev."""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Create the tracer.
+
+        :param path: the file to write the trace events to
+        """
+        self._path = path
+        self._events: list[dict[str, Any]] = []
+        self._pid = os.getpid()
+        self._start = perf_counter_ns()
+
+    @contextmanager
+    def span(self, name: str, category: str, **args: str) -> Generator[None]:
+        """
+        Mark a unit of work.
+
+        :param name: name of the span
+        :param category: category of the span - ``file``, ``phase`` or ``section``
+        :param args: extra information to attach to the span
+        """
+        start = perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = perf_counter_ns()
+            self._events.append({
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self._start) / 1_000,
+                "dur": (end - start) / 1_000,
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+                "args": args,
+            })
+
+    def close(self) -> None:
+        """Write the collected trace events."""
+        self._path.write_text(json.dumps({"traceEvents": self._events, "displayTimeUnit": "ms"}), encoding="utf-8")
+
+
+__all__ = [
+    "NO_TRACE",
+    "ChromeTracer",
+    "Tracer",
+    "TracerGroup",
+    "combine",
+]
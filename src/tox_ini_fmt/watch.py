@@ -0,0 +1,137 @@
+"""Watch files for content changes."""
+
+from __future__ import annotations
+
+import ctypes
+import os
+import select
+import struct
+import sys
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Sequence
+    from pathlib import Path
+
+# see inotify(7)
+_IN_MODIFY = 0x2
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_TO = 0x80  # editors that save atomically rename a temporary file over the original
+_IN_CREATE = 0x100
+_IN_Q_OVERFLOW = 0x4000
+_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+_EVENT = struct.Struct("iIII")  # watch descriptor, mask, cookie, length of the name that follows
+
+
+def watch(paths: Sequence[Path], *, debounce: float = 0.1, interval: float = 0.5) -> Generator[list[Path]]:
+    """
+    Watch files, uses inotify when available and falls back to polling their status otherwise.
+
+    A burst of events is collected until no new one arrives for the debounce period; then only the files whose content
+    differs from when last seen are reported. The content is captured again once the caller asks for the next batch,
+    so the changes made by the caller itself (e.g. writing back the formatted text) are not reported.
+
+    :param paths: the files to watch
+    :param debounce: seconds to wait for further events before reporting a burst of them
+    :param interval: seconds between two polls of the file status, when inotify is not available
+    :return: the files changed, in the order of the paths, for every burst of events
+    """
+    source = _Inotify.create(paths) or _Polling(paths, interval)
+    contents = {path: _content(path) for path in paths}
+    try:
+        while True:
+            touched = source.changes(None)
+            while more := source.changes(debounce):
+                touched |= more
+            if changed := [path for path in paths if path in touched and _content(path) != contents[path]]:
+                yield changed
+                contents.update((path, _content(path)) for path in changed)
+    finally:
+        source.close()
+
+
+def _content(path: Path) -> bytes | None:
+    try:
+        return path.read_bytes()
+    except OSError:  # e.g. removed while an editor saves it
+        return None
+
+
+class _Inotify:
+    def __init__(self, libc: ctypes.CDLL, fd: int, paths: Sequence[Path]) -> None:
+        self._fd = fd
+        self._paths = set(paths)
+        self._directories: dict[int, Path] = {}
+        for directory in {path.parent for path in paths}:  # watch directories, files can be replaced by renames
+            if (wd := libc.inotify_add_watch(fd, os.fsencode(directory), _MASK)) < 0:
+                self.close()
+                raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()), str(directory))
+            self._directories[wd] = directory
+
+    @classmethod
+    def create(cls, paths: Sequence[Path]) -> _Inotify | None:
+        if sys.platform != "linux":  # pragma: linux no cover
+            return None
+        libc = ctypes.CDLL(None, use_errno=True)  # the running process links the C library
+        if not hasattr(libc, "inotify_init1") or (fd := libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)) < 0:
+            return None
+        try:
+            return cls(libc, fd, paths)
+        except OSError:  # e.g. out of watches
+            return None
+
+    def changes(self, timeout: float | None) -> set[Path]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        data, touched, offset = os.read(self._fd, 64 * 1024), set(), 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            if mask & _IN_Q_OVERFLOW:  # events were dropped, any of the files may have changed
+                touched |= self._paths
+            elif wd in self._directories:
+                touched.add(self._directories[wd] / os.fsdecode(data[offset : offset + length].rstrip(b"\0")))
+            offset += length
+        return touched & self._paths
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _Polling:
+    def __init__(self, paths: Sequence[Path], interval: float) -> None:
+        self._interval = interval
+        self._status = {path: self._stat(path) for path in paths}
+
+    @staticmethod
+    def _stat(path: Path) -> tuple[int, int, int] | None:
+        try:
+            status = path.stat()
+        except OSError:
+            return None
+        return status.st_mtime_ns, status.st_size, status.st_ino
+
+    def changes(self, timeout: float | None) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            touched: set[Path] = set()
+            for path, before in self._status.items():
+                if (after := self._stat(path)) != before:
+                    self._status[path] = after
+                    touched.add(path)
+            if touched:
+                return touched
+            remaining = self._interval if deadline is None else min(self._interval, deadline - time.monotonic())
+            if remaining <= 0:
+                return touched
+            time.sleep(remaining)
+
+    def close(self) -> None:
+        pass  # nothing to release
+
+
+__all__ = [
+    "watch",
+]
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import pytest
+
+from tox_ini_fmt.formatter import format_tox_ini, format_tox_ini_bytes
+
+SOURCE = "[tox]\nenv_list=py39\n[testenv]\ndescription=é\n"
+FORMATTED = format_tox_ini(SOURCE)
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"])
+def test_format_bytes_keeps_newlines(newline: str) -> None:
+    content = SOURCE.replace("\n", newline).encode()
+
+    assert format_tox_ini_bytes(content) == FORMATTED.replace("\n", newline).encode()
+
+
+def test_format_bytes_mixed_newlines_follow_the_first() -> None:
+    assert (
+        format_tox_ini_bytes(b"[tox]\r\nenv_list=py39\n[testenv]\rdescription=\xc3\xa9\r\n")
+        == FORMATTED.replace("\n", "\r\n").encode()
+    )
+
+
+def test_format_bytes_without_newline() -> None:
+    assert format_tox_ini_bytes(b"[tox]") == format_tox_ini("[tox]").encode()
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_format_bytes_formatted_returns_the_content(newline: str) -> None:
+    content = FORMATTED.replace("\n", newline).encode()
+
+    assert format_tox_ini_bytes(content) is content
+
+
+def test_format_bytes_memoryview() -> None:
+    content = bytearray(SOURCE.encode())
+
+    assert format_tox_ini_bytes(memoryview(content)) == FORMATTED.encode()
+    assert format_tox_ini_bytes(memoryview(FORMATTED.encode())) == FORMATTED.encode()
+
+
+def test_format_bytes_not_utf8() -> None:
+    with pytest.raises(UnicodeDecodeError):
+        format_tox_ini_bytes(b"[tox]\n# \xff\n")
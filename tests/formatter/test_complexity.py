@@ -0,0 +1,86 @@
+"""
+Check the formatter hot paths scale near linearly.
+
+Each function runs at several input sizes and the exponent of the growth is fitted on a log-log scale, so the check
+does not depend on how fast the machine is, only on how the runtime grows with the input.
+"""
+
+from __future__ import annotations
+
+import gc
+import math
+from configparser import ConfigParser
+from functools import partial
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tox_ini_fmt.formatter import format_tox_ini
+from tox_ini_fmt.formatter.memo import clear_caches
+from tox_ini_fmt.formatter.section_order import explode_env_list, order_sections
+from tox_ini_fmt.formatter.test_env import to_pass_env, to_set_env
+from tox_ini_fmt.formatter.util import collect_multi_line, compact_env_list, to_list_of_env_values
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+SIZES = (250, 500, 1000, 2000)
+REPEAT = 5
+MAX_EXPONENT = 1.4  # n log n fits well below this, quadratic lands close to 2
+
+
+def _exponent(prepare: Callable[[int], Callable[[], object]]) -> float:
+    best = dict.fromkeys(SIZES, math.inf)
+    for _ in range(REPEAT):  # interleave the sizes, so a busy machine slows down all of them alike
+        for size in SIZES:
+            call = prepare(size)  # build the input outside the timed region
+            clear_caches()  # measure the transforms, not the memo lookup
+            gc.disable()
+            try:
+                start = perf_counter()
+                call()
+                best[size] = min(best[size], perf_counter() - start)
+            finally:
+                gc.enable()
+    xs, ys = [math.log(size) for size in SIZES], [math.log(best[size]) for size in SIZES]
+    x_mean, y_mean = sum(xs) / len(xs), sum(ys) / len(ys)
+    return sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys, strict=True)) / sum((x - x_mean) ** 2 for x in xs)
+
+
+def _order_sections(size: int) -> Callable[[], object]:
+    parser = ConfigParser(interpolation=None)
+    parser.read_string(
+        "[tox]\nenv_list = {}\n".format("\n ".join(f"e{i}" for i in range(0, size, 2)))
+        + "".join(f"[testenv:e{i}]\na = b\n[other{i}]\nc = d\n" for i in range(size)),
+    )
+    return partial(order_sections, parser, [])
+
+
+def _format_tox_ini(size: int) -> Callable[[], object]:
+    text = "[tox]\nenv_list = {}\n".format(",".join(f"e{i}" for i in range(size))) + "".join(
+        f"[testenv:e{i}]\ndeps = a\n" for i in range(size)
+    )
+    return partial(format_tox_ini, text)
+
+
+CASES = {
+    "order_sections": _order_sections,
+    "collect_multi_line": lambda size: partial(collect_multi_line, " ".join(f"V{i}" for i in range(size))),
+    "to_list_of_env_values": lambda size: partial(
+        to_list_of_env_values, (), ",".join(f"py3{i % 10}-{{a,b}}-f{i}" for i in range(size))
+    ),
+    "compact_env_list": lambda size: partial(
+        compact_env_list, [f"py3{i % 10}-f{i // 20}-{'ab'[i // 10 % 2]}" for i in range(size)], ()
+    ),
+    "explode_env_list": lambda size: partial(explode_env_list, "\n".join(f"{{py1,py2}}-f{i}" for i in range(size))),
+    "to_pass_env": lambda size: partial(to_pass_env, "\n".join(f"V{i}" for i in range(size, 0, -1))),
+    "to_set_env": lambda size: partial(to_set_env, "\n".join(f"K{i} = {i}" for i in range(size, 0, -1))),
+    "format_tox_ini": _format_tox_ini,
+}
+
+
+@pytest.mark.parametrize("prepare", CASES.values(), ids=CASES.keys())
+def test_near_linear_growth(prepare: Callable[[int], Callable[[], object]]) -> None:
+    exponent = _exponent(prepare)
+    assert exponent < MAX_EXPONENT, f"grows with n^{exponent:.2f}"
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from configparser import ConfigParser
+from io import StringIO
+
+import pytest
+
+from tox_ini_fmt.formatter import INDENTATION, Document, Section, format_tox_ini, format_tox_ini_document
+
+
+def _written(document: Document) -> str:  # what the parser would emit for the same sections
+    parser = ConfigParser(interpolation=None)
+    for section in document.sections:
+        parser[section.name] = dict(zip(section.keys, section.values, strict=True))
+    output = StringIO()
+    parser.write(output)
+    return (output.getvalue().strip() + "\n").replace("\t", INDENTATION).replace(" \n", "\n")
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        pytest.param("", id="empty"),
+        pytest.param("[tox]\nenv_list=py39,py38\n[testenv]\ndeps=b\n  a\ncommands=\n", id="multi-line"),
+        pytest.param("[testenv]\ndescription=a\tb\n[magic]\nx=1\n", id="tab-and-other-section"),
+        pytest.param("[DEFAULT]\nbase=1\n[testenv]\ncommands=pytest\n", id="default-section"),
+    ],
+)
+def test_document_text_matches_parser(text: str) -> None:
+    document = format_tox_ini_document(text)
+
+    assert document.to_text() == _written(document)
+    assert document.to_text() == format_tox_ini(text)
+
+
+def test_document_sections() -> None:
+    document = format_tox_ini_document("[testenv:b]\ncommands=b\n[testenv:a]\ncommands=a\n[tox]\nenv_list=a,b\n")
+
+    assert document.sections == (
+        Section("tox", ("requires", "env_list"), ("\ntox>=4.2", "\na\nb")),
+        Section("testenv:a", ("commands",), ("\na",)),
+        Section("testenv:b", ("commands",), ("\nb",)),
+    )
+
+
+def test_document_is_compact() -> None:
+    document = format_tox_ini_document("[tox]\nenv_list=a\n")
+
+    assert not hasattr(document, "__dict__")
+    assert not hasattr(document.sections[0], "__dict__")
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+
+from tox_ini_fmt.formatter import format_tox_ini
+from tox_ini_fmt.formatter.memo import MAX_SIZE, CacheStats, cache_stats, clear_caches
+from tox_ini_fmt.formatter.test_env import to_set_env
+from tox_ini_fmt.formatter.util import to_list_of_env_values
+
+
+@pytest.fixture
+def _clear() -> None:
+    clear_caches()
+
+
+@pytest.mark.usefixtures("_clear")
+def test_cache_shared_across_files() -> None:
+    text = "[tox]\nenv_list=py\n[testenv]\npass_env=CI HOME\ndeps=a\n[testenv:py]\npass_env=CI HOME\n"
+
+    first = format_tox_ini(text)
+    assert format_tox_ini(text) == first
+
+    stats = cache_stats()
+    assert set(stats) == {
+        "model_value",
+        "to_commands",
+        "to_list_of_env_values",
+        "to_ordered_list",
+        "to_pass_env",
+        "to_py_dependencies",
+        "to_set_env",
+    }
+    assert stats["to_pass_env"] == CacheStats(hits=3, misses=1, size=1, max_size=MAX_SIZE)
+    assert stats["to_pass_env"].hit_rate == pytest.approx(0.75)
+    assert stats["to_commands"].hit_rate == pytest.approx(0.0)
+
+
+@pytest.mark.usefixtures("_clear")
+def test_cache_keyed_on_pins() -> None:
+    assert to_list_of_env_values(("b",), "a,b") == "\nb\na"
+    assert to_list_of_env_values(("a",), "a,b") == "\na\nb"
+    assert cache_stats()["to_list_of_env_values"].misses == 2
+
+
+@pytest.mark.usefixtures("_clear")
+def test_cache_takes_pins_as_list() -> None:
+    assert to_list_of_env_values(["b"], "a,b") == "\nb\na"
+    assert to_list_of_env_values(("b",), "a,b") == "\nb\na"
+    assert cache_stats()["to_list_of_env_values"] == CacheStats(hits=1, misses=1, size=1, max_size=MAX_SIZE)
+
+
+@pytest.mark.usefixtures("_clear")
+def test_cache_does_not_keep_errors() -> None:
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="invalid line A in setenv"):
+            to_set_env("A")
+    assert cache_stats()["to_set_env"] == CacheStats(hits=0, misses=2, size=0, max_size=MAX_SIZE)
+
+
+@pytest.mark.usefixtures("_clear")
+def test_clear_caches() -> None:
+    format_tox_ini("[testenv]\npass_env=A\n")
+    clear_caches()
+    assert cache_stats()["to_pass_env"] == CacheStats(hits=0, misses=0, size=0, max_size=MAX_SIZE)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from tox_ini_fmt.formatter import SymbolTable, format_tox_ini, format_tox_ini_document
+
+if TYPE_CHECKING:
+    from tox_ini_fmt.formatter import Document
+
+
+def test_symbol_table_intern() -> None:
+    symbols = SymbolTable()
+    version = 312
+    first, second = f"py{version}", f"py{version}"  # equal but distinct objects
+
+    assert symbols.intern(first) is first
+    assert symbols.intern(second) is first
+    assert symbols.intern(first) is first  # the same object is not a duplicate
+
+    assert symbols.deduplicated == 1
+    assert len(symbols) == 1
+
+
+def _texts() -> list[str]:
+    return [
+        f"[tox]\nenv_list=py312\n[testenv:py312]\ndescription=run tests\ndeps=pytest\npass_env=HOME\nset_env=X={i}\n"
+        for i in range(2)
+    ]
+
+
+def _description(document: Document) -> str:
+    section = document.sections[1]
+    return section.values[section.keys.index("description")]
+
+
+def test_documents_share_strings() -> None:
+    symbols = SymbolTable()
+    texts = _texts()
+
+    first, second = (format_tox_ini_document(text, symbols=symbols) for text in texts)
+
+    for section, other in zip(first.sections, second.sections, strict=True):
+        assert section.name is other.name
+        assert all(a is b for a, b in zip(section.keys, other.keys, strict=True))
+    assert _description(first) is _description(second)  # no memoized transform touches it
+    assert first.sections[1].values[-1] is not second.sections[1].values[-1]  # set_env differs
+    assert symbols.deduplicated > 0
+    assert [first.to_text(), second.to_text()] == [format_tox_ini(text) for text in texts]
+
+
+def test_documents_share_strings_only_with_table() -> None:
+    first, second = (format_tox_ini_document(text) for text in _texts())
+
+    assert _description(first) == _description(second)
+    assert _description(first) is not _description(second)
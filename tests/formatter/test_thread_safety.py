@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from tox_ini_fmt.cli import ToxIniFmtNamespace
+from tox_ini_fmt.formatter import format_tox_ini
+
+
+def _tox_ini(at: int) -> str:
+    envs = ",".join(f"py3{i}" for i in range(at % 7 + 1))
+    sections = "".join(
+        f"[testenv:py3{i}]\ndeps=pytest>={at}.0\n  {{[testenv]deps}}\npass_env=B A\nset_env=X={i}\n"
+        for i in range(at % 5)
+    )
+    return f"[tox]\nenv_list={envs}\n[testenv]\ncommands=pytest {{posargs}}\nbasepython=python3\n{sections}"
+
+
+def test_format_concurrently_matches_sequential() -> None:
+    sources = [_tox_ini(i) for i in range(64)]
+    opts = ToxIniFmtNamespace(pin_toxenvs=["py30"])
+    expected = [format_tox_ini(source, opts) for source in sources]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        result = list(executor.map(format_tox_ini, sources, [opts] * len(sources)))
+
+    assert result == expected
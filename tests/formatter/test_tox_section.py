@@ -5,8 +5,10 @@ from typing import TYPE_CHECKING
 
 import pytest
 
+from tox_ini_fmt.cli import ToxIniFmtNamespace
 from tox_ini_fmt.formatter import format_tox_ini
-from tox_ini_fmt.formatter.util import order_env_list
+from tox_ini_fmt.formatter.section_order import explode_env_list
+from tox_ini_fmt.formatter.util import compact_env_list, order_env_list, to_list_of_env_values
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -194,3 +196,63 @@ def test_upgrade_conflict(tox_ini: Path) -> None:
     tox_ini.write_text(dedent(text), encoding="utf-8")
     with pytest.raises(RuntimeError, match="upgrade alias env_list also present for envlist"):
         format_tox_ini(tox_ini)
+
+
+def test_format_env_list_compact() -> None:
+    text = "[tox]\nenv_list=py39-a,py38-a,py39-b,py38-b,py39-c,lint,{py39,py38}-x,py38-c-d,,py39-c-d\n"
+    outcome = format_tox_ini(text, ToxIniFmtNamespace(pin_toxenvs=[], compact_envlist=True))
+    msg = """\
+    [tox]
+    requires =
+        tox>=4.2
+    env_list =
+        py39-{a, b, c}
+        py39-c-d
+        py38-{a, b}
+        py38-c-d
+        lint
+        {py39, py38}-x
+    """
+    assert outcome == dedent(msg)
+
+
+@pytest.mark.parametrize(
+    "env_list",
+    [
+        pytest.param("py39-a, py38-a, py39-b", id="partial"),
+        pytest.param("py38-b, py39-b, py39-a, py38-a", id="product"),
+        pytest.param("lint-b, py39-a-x, lint-a, py38-a-x, pin-a", id="pinned"),
+        pytest.param("py39-a,py38-a,py39-b,py38-b,py39-c,lint,{py39,py38}-x,py38-c-d,py39-c-d", id="mixed"),
+    ],
+)
+def test_compact_env_list_keeps_the_order(env_list: str) -> None:
+    expanded = to_list_of_env_values(("pin",), env_list)
+    compacted = to_list_of_env_values(("pin",), env_list, compact=True)
+
+    assert compacted != expanded
+    assert explode_env_list(compacted) == explode_env_list(expanded)
+
+
+@pytest.mark.parametrize(
+    "envs",
+    [
+        pytest.param([f"py3{a}-django{b}-{c}" for a in range(8, 14) for b in (40, 42, 50) for c in "xy"], id="product"),
+        pytest.param([f"py3{a}-django{b}" for a in range(8, 14) for b in range(40, 40 + a)], id="triangle"),
+        pytest.param(["a-b-c", "a-b-d", "a-e-c", "f-b-c", "f-e-d", "g-b"], id="partial"),
+        pytest.param(["py39-a", "py39-a", "py39-b"], id="duplicate"),
+    ],
+)
+def test_compact_env_list_keeps_the_envs(envs: list[str]) -> None:
+    compacted = compact_env_list(envs, [])
+
+    assert len(compacted) < len(envs)
+    assert sorted(explode_env_list("\n".join(compacted))) == sorted(set(envs))
+
+
+def test_compact_env_list_pins_first() -> None:
+    assert compact_env_list(["a-x", "b-x", "pin-x"], ["pin"]) == ["{pin, a, b}-x"]
+
+
+def test_compact_env_list_not_by_default() -> None:
+    outcome = format_tox_ini("[tox]\nenv_list=py39-a,py39-b\n")
+    assert outcome == "[tox]\nrequires =\n    tox>=4.2\nenv_list =\n    py39-a\n    py39-b\n"
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+from textwrap import dedent
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tox_ini_fmt.__main__ import run
+from tox_ini_fmt.cli import cli_args
+from tox_ini_fmt.formatter import format_tox_ini_document, to_tox_toml
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _convert(text: str) -> str:
+    return to_tox_toml(format_tox_ini_document(text))
+
+
+def test_to_tox_toml() -> None:
+    text = """
+    [tox]
+    envlist = py{39,38}-{a,b}, lint
+    skip_missing_interpreters = true
+    [testenv]
+    description = run tests under {env_name}
+    deps =
+        pytest>=7
+        -r requirements.txt
+    setenv =
+        COVERAGE_FILE = {env:COVERAGE_FILE:{work_dir}/.coverage}
+        HOME = {env:HOME}
+        TOKEN = {env:TOKEN:secret}
+        file|.env
+    passenv = PYTEST_*, HOME
+    commands =
+        pytest --cov "src dir" {posargs:tests -x} \\
+          --junitxml {work_dir}{/}junit.xml --log-format '%(message)s'
+        python -c 'print("done")'
+    suicide_timeout = 0.5
+    interrupt_timeout = {env:TIMEOUT}
+    [testenv:.pkg]
+    skip_install = true
+    deps = {[testenv]deps}
+        ruff
+    commands =
+        {[testenv]commands}
+        ruff check {posargs} "unclosed
+    [pytest]
+    addopts = -ra
+    """
+    result = _convert(dedent(text))
+
+    expected = """\
+    requires = [ "tox>=4.2" ]
+    env_list = [ "lint", "py39-a", "py39-b", "py38-a", "py38-b" ]
+    skip_missing_interpreters = true
+
+    [env_run_base]
+    description = "run tests under {env_name}"
+    deps = [ "-r requirements.txt", "pytest>=7" ]
+    pass_env = [ "HOME", "PYTEST_*" ]
+    set_env.COVERAGE_FILE = "{env:COVERAGE_FILE:{work_dir}/.coverage}"
+    set_env.HOME = { replace = "env", name = "HOME" }
+    set_env.TOKEN = { replace = "env", name = "TOKEN", default = "secret" }
+    set_env.file = ".env"
+    commands = [
+      [
+        "pytest",
+        "--cov",
+        "src dir",
+        { replace = "posargs", extend = true, default = [ "tests", "-x" ] },
+        "--junitxml",
+        "{work_dir}{/}junit.xml",
+        "--log-format",
+        "%(message)s",
+      ],
+      [ "python", "-c", "print(\\"done\\")" ],
+    ]
+    suicide_timeout = 0.5
+    interrupt_timeout = { replace = "env", name = "TIMEOUT" }
+
+    [env.".pkg"]
+    skip_install = true
+    deps = [ { replace = "ref", of = [ "env_run_base", "deps" ], extend = true }, "ruff" ]
+    commands = [
+      { replace = "ref", of = [ "env_run_base", "commands" ], extend = true },
+      [ "ruff", "check", { replace = "posargs", extend = true }, "\\"unclosed" ],
+    ]
+    """
+    assert result == dedent(expected)
+    tomllib = pytest.importorskip("tomllib")  # from Python 3.11
+    assert tomllib.loads(result)["env"][".pkg"]["skip_install"] is True
+
+
+def test_to_tox_toml_escapes_strings() -> None:
+    tomllib = pytest.importorskip("tomllib")  # from Python 3.11
+    result = _convert("[testenv]\ndescription = a \x7f \\ b\n")
+
+    assert tomllib.loads(result)["env_run_base"]["description"] == "a \x7f \\ b"
+
+
+def test_to_tox_toml_empty_list() -> None:
+    assert _convert("[testenv]\ndeps =\n").endswith("[env_run_base]\ndeps = []\n")
+
+
+def test_to_tox_toml_typed_keys() -> None:
+    text = """
+    [tox]
+    labels =
+        test = py310, py{39,38}
+        lint = ruff
+    [testenv]
+    basepython = python3
+    labels =
+        test
+        ci
+    dependency_groups = test
+    base = base
+    install_command = python -I -m pip install {opts} {packages}
+    use_frozen_constraints = true
+    """
+    result = _convert(dedent(text))
+
+    expected = """\
+    labels.test = [ "py310", "py39", "py38" ]
+    labels.lint = [ "ruff" ]
+
+    [env_run_base]
+    base_python = [ "python3" ]
+    base = [ "base" ]
+    dependency_groups = [ "test" ]
+    install_command = [ "python", "-I", "-m", "pip", "install", "{opts}", "{packages}" ]
+    labels = [ "test", "ci" ]
+    use_frozen_constraints = true
+    """
+    assert result.endswith(dedent(expected))
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        pytest.param("True", "true", id="title-case"),
+        pytest.param("1", "true", id="one"),
+        pytest.param("YES", "true", id="yes"),
+        pytest.param("on", "true", id="on"),
+        pytest.param("False", "false", id="false"),
+        pytest.param("0", "false", id="zero"),
+        pytest.param("no", "false", id="no"),
+        pytest.param(" Off ", "false", id="off"),
+    ],
+)
+def test_to_tox_toml_boolean(value: str, expected: str) -> None:
+    result = _convert(f"[testenv]\nfresh_subprocess = {value}\nconstrain_package_deps = {value}\n")
+
+    assert result.endswith(f"constrain_package_deps = {expected}\nfresh_subprocess = {expected}\n")
+
+
+def test_to_tox_toml_comma_separated() -> None:
+    text = """
+    [testenv]
+    base_python = python3.12, python3.11
+    dependency_groups = test, type
+    labels = test, lint
+    """
+    result = _convert(dedent(text))
+
+    expected = """    base_python = [ "python3.12", "python3.11" ]
+    dependency_groups = [ "test", "type" ]
+    labels = [ "test", "lint" ]
+    """
+    assert result.endswith(dedent(expected))
+
+
+@pytest.mark.parametrize(
+    ("text", "error"),
+    [
+        pytest.param("[DEFAULT]\na = 1\n", r"\[DEFAULT\]: values inherited by every section", id="default"),
+        pytest.param("[testenv:py{39,38}]\n", r"\[testenv:py\{39,38\}\]: generative section names", id="generative"),
+        pytest.param(
+            "[testenv]\ndeps =\n    py39: pytest\n",
+            r"\[testenv\] deps: factor conditional line 'py39: pytest'",
+            id="factor",
+        ),
+        pytest.param(
+            "[testenv]\ndescription = a {[tox]b}\n", r"substituting a setting within 'a \{\[tox\]b\}'", id="inline-ref"
+        ),
+        pytest.param("[testenv]\nset_env = {[tox]env}\n", r"substituting '\{\[tox\]env\}'", id="set-env-ref"),
+        pytest.param("[testenv]\nset_env =\n    file|a\n    file|b\n", "more than one environment file", id="files"),
+        pytest.param("[testenv]\ndeps = {[flake8]deps}\n", r"the section of '\{\[flake8\]deps\}'", id="other-section"),
+        pytest.param(
+            "[testenv]\nfresh_subprocess = {env:FRESH}\n",
+            r"\[testenv\] fresh_subprocess: '\{env:FRESH\}' is not a boolean",
+            id="not-boolean",
+        ),
+    ],
+)
+def test_to_tox_toml_no_equivalent(text: str, error: str) -> None:
+    with pytest.raises(ValueError, match=error):
+        _convert(text)
+
+
+def test_main_to_toml(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    tox_ini = tmp_path / "tox.ini"
+    tox_ini.write_text("[tox]\nenv_list=py39\n")
+
+    assert run([str(tox_ini), "--to-toml"]) == 0
+
+    assert capsys.readouterr().out == 'requires = [ "tox>=4.2" ]\nenv_list = [ "py39" ]\n'
+    assert tox_ini.read_text() == "[tox]\nenv_list=py39\n"
+
+
+def test_main_to_toml_keep_going(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    tox_ini = tmp_path / "tox.ini"
+    tox_ini.write_text("[testenv:py{39,38}]\n")
+
+    assert run([str(tox_ini), "--to-toml", "--keep-going"]) == 3
+
+    assert "generative section names have no tox.toml equivalent" in capsys.readouterr().err
+
+
+def test_cli_to_toml_not_with_quiet(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    (tmp_path / "tox.ini").write_text("")
+    with pytest.raises(SystemExit):
+        cli_args([str(tmp_path / "tox.ini"), "--to-toml", "--quiet"])
+    assert "argument -q/--quiet: not allowed with argument --to-toml" in capsys.readouterr().err
+
+
+def test_to_tox_toml_command_continued_at_the_end() -> None:
+    assert _convert("[testenv]\ncommands = pytest \\\n").endswith('commands = [ [ "pytest" ] ]\n')
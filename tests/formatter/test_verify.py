@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from textwrap import dedent
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tox_ini_fmt.__main__ import run
+from tox_ini_fmt.cli import ToxIniFmtNamespace, cli_args
+from tox_ini_fmt.formatter import SemanticChangeError, format_tox_ini, verify_tox_ini
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        pytest.param(
+            """
+            [tox]
+            envlist = py38,py{39,310}-django{40,41}
+            minversion = 3.20
+            isolated_build = true
+            requires = virtualenv>=20.0.0
+            """,
+            id="tox",
+        ),
+        pytest.param("[testenv:a]\ndeps = pytest\n", id="no-tox-section"),
+        pytest.param(
+            """
+            [testenv]
+            usedevelop = true
+            basepython = python3
+            sitepackages = true
+            setenv =
+                B = 2
+                A=1
+                py38: C=3
+                file|.env
+            passenv = HOME, PATH USER
+            allowlist_externals = make,bash
+            deps =
+                pytest==7.0.0
+                Django[argon2]>=4.0
+                py38,py39: mock
+                -r requirements.txt
+                {[base]deps}
+            commands =
+                pytest   \\
+                  \\
+                  --cov {posargs} -k 'a  or b'
+
+                coverage report
+                coverage html \\
+            depends = py{39,38}
+            """,
+            id="test-env",
+        ),
+        pytest.param("[DEFAULT]\nshared = 1\n[testenv:a]\nrecreate = TRUE\n[pytest]\naddopts = -ra\n", id="default"),
+    ],
+)
+def test_verify_formatted(text: str) -> None:
+    before = dedent(text)
+    after = format_tox_ini(before)
+
+    assert after != before
+    verify_tox_ini(before, after)
+
+
+def test_verify_compact_env_list() -> None:
+    before = "[tox]\nenv_list = py39-a, py39-b, py38-a, py38-b, lint\n"
+    after = format_tox_ini(before, ToxIniFmtNamespace(pin_toxenvs=[], compact_envlist=True))
+
+    assert "{py39, py38}-{a, b}" in after
+    verify_tox_ini(before, after)
+
+
+@pytest.mark.parametrize(
+    ("before", "after", "changes"),
+    [
+        pytest.param(
+            "[testenv]\nskip_install = yes\n",
+            "[testenv]\nskip_install = false\n",
+            "[testenv] skip_install",
+            id="boolean",
+        ),
+        pytest.param(
+            "[testenv]\nskip_install = maybe\n",
+            "[testenv]\nskip_install = false\n",
+            "[testenv] skip_install",
+            id="invalid-boolean",
+        ),
+        pytest.param(
+            "[testenv]\nset_env =\n    A = 2\n    A = 1\n",
+            "[testenv]\nset_env =\n    A = 1\n    A = 2\n",
+            "[testenv] set_env",
+            id="set-env-override",
+        ),
+        pytest.param(
+            "[testenv]\nusedevelop = true\npackage = wheel\n",
+            "[testenv]\npackage = editable\n",
+            "[testenv] package",
+            id="explicit-package",
+        ),
+        pytest.param(
+            "[testenv]\ndeps =\n    a~=1.0\n    py39:b\n",
+            "[testenv]\ndeps =\n    a~=1\n    py39: b\n",
+            "[testenv] deps",
+            id="deps",
+        ),
+        pytest.param(
+            "[tox]\nenv_list = py{39,38}\n[testenv]\ncommands = pytest -x\n",
+            "[tox]\nenv_list =\n    py39\n[testenv]\ncommands =\n    pytest -X\n",
+            "[tox] env_list, [testenv] commands",
+            id="lists",
+        ),
+        pytest.param(
+            "[testenv]\ncommands = python -c 'print(\"a  b\")'\n",
+            "[testenv]\ncommands =\n    python -c 'print(\"a b\")'\n",
+            "[testenv] commands",
+            id="quoted-whitespace",
+        ),
+        pytest.param(
+            "[tox]\nrequires = tox>=4.2\n    virtualenv\n[testenv:a]\n[pytest]\naddopts = -ra\n",
+            "[tox]\nrequires = tox>=4.2\n[pytest]\naddopts = -r a\n",
+            "[tox] requires, [pytest] addopts",
+            id="sections",
+        ),
+    ],
+)
+def test_verify_changed_meaning(before: str, after: str, changes: str) -> None:
+    with pytest.raises(
+        SemanticChangeError, match=rf"^formatting changes the meaning of {changes}$".replace("[", r"\[")
+    ):
+        verify_tox_ini(before, after)
+
+
+def test_verify_models_only_changed_sections(mocker: MockerFixture) -> None:
+    before = "[tox]\nrequires =\n    tox>=4.2\n[testenv:a]\ndeps =\n    a\n[testenv:b]\ndeps = b,\n"
+    model = mocker.patch("tox_ini_fmt.formatter.verify._model", return_value={})
+
+    verify_tox_ini(before, format_tox_ini(before))
+
+    assert [call.args[0] for call in model.call_args_list] == ["testenv:b", "testenv:b"]
+
+
+def test_verify_cli_not_with_to_toml(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    path = tmp_path / "tox.ini"
+    path.write_text("")
+
+    with pytest.raises(SystemExit):
+        cli_args([str(path), "--verify", "--to-toml"])
+
+    assert "argument --verify: not allowed with argument --to-toml" in capsys.readouterr().err
+
+
+def test_verify_run(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    kept, changed = tmp_path / "kept.ini", tmp_path / "changed.ini"
+    kept.write_text("[tox]\nrequires=tox>=4.2\n")
+    changed.write_text("[testenv]\nskip_install = yes\n")
+
+    assert run([str(kept), str(changed), "--verify", "--quiet"]) == 3
+
+    out, err = capsys.readouterr()
+    assert out == f"{kept}\n"
+    assert err.splitlines() == [
+        "failed to format 1 file(s):",
+        f"  {changed}: formatting changes the meaning of [testenv] skip_install",
+    ]
+    assert kept.read_text() == "[tox]\nrequires =\n    tox>=4.2\n"
+    assert changed.read_text() == "[testenv]\nskip_install = yes\n"
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import io
+import tarfile
+import zipfile
+from typing import TYPE_CHECKING, Literal
+
+import pytest
+
+from tox_ini_fmt.__main__ import run
+from tox_ini_fmt.archive import tox_ini_members
+from tox_ini_fmt.cli import cli_args
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+MEMBERS = {
+    "pkg-1.0/tox.ini": b"[tox]\r\nrequires=tox>=4.2\r\n",
+    "pkg-1.0/setup.cfg": b"[metadata]\n",
+    "pkg-1.0/sub/tox.ini": b"[tox]\nrequires =\n    tox>=4.2\n",
+}
+
+
+def _tar(path: Path, mode: Literal["w", "w:gz"]) -> Path:
+    with tarfile.open(path, mode) as archive:
+        directory = tarfile.TarInfo("pkg-1.0/docs/tox.ini")
+        directory.type = tarfile.DIRTYPE
+        archive.addfile(directory)
+        for name, content in MEMBERS.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    return path
+
+
+def _zip(path: Path) -> Path:
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("pkg-1.0/docs/tox.ini/", b"")
+        for name, content in MEMBERS.items():
+            archive.writestr(name, content)
+    return path
+
+
+@pytest.mark.parametrize(
+    "create",
+    [
+        pytest.param(lambda tmp_path: _tar(tmp_path / "pkg-1.0.tar.gz", "w:gz"), id="tar.gz"),
+        pytest.param(lambda tmp_path: _tar(tmp_path / "pkg-1.0.tar", "w"), id="tar"),
+        pytest.param(lambda tmp_path: _zip(tmp_path / "pkg-1.0.zip"), id="zip"),
+    ],
+)
+def test_tox_ini_members(tmp_path: Path, create: Callable[[Path], Path]) -> None:
+    assert list(tox_ini_members(create(tmp_path))) == [
+        ("pkg-1.0/tox.ini", MEMBERS["pkg-1.0/tox.ini"]),
+        ("pkg-1.0/sub/tox.ini", MEMBERS["pkg-1.0/sub/tox.ini"]),
+    ]
+
+
+def test_main_archive(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    monkeypatch.chdir(tmp_path)
+    _tar(tmp_path / "pkg-1.0.tar.gz", "w:gz")
+    _zip(tmp_path / "pkg-1.0.zip")
+
+    assert run(["--archive", "--quiet", "pkg-1.0.tar.gz", "pkg-1.0.zip"]) == 1
+
+    out, err = capsys.readouterr()
+    assert not err
+    assert out == "pkg-1.0.tar.gz:pkg-1.0/tox.ini\npkg-1.0.zip:pkg-1.0/tox.ini\n"
+
+
+def test_main_archive_no_change(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    with zipfile.ZipFile(tmp_path / "pkg.zip", "w") as archive:
+        archive.writestr("tox.ini", MEMBERS["pkg-1.0/sub/tox.ini"])
+
+    assert run(["--archive", "pkg.zip"]) == 0
+
+    assert capsys.readouterr().out == "no change for pkg.zip:tox.ini\n"
+
+
+def test_main_archive_corrupt(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "bad.tar.gz").write_bytes(b"not an archive")
+    _zip(tmp_path / "pkg-1.0.zip")
+
+    assert run(["--archive", "--keep-going", "--quiet", "bad.tar.gz", "pkg-1.0.zip"]) == 3
+
+    out, err = capsys.readouterr()
+    assert out == "pkg-1.0.zip:pkg-1.0/tox.ini\n"
+    assert err.startswith("failed to format 1 file(s):\n  bad.tar.gz: ")
+
+    with pytest.raises(tarfile.ReadError):
+        run(["--archive", "bad.tar.gz"])
+
+
+def test_main_archive_not_utf8(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    with zipfile.ZipFile(tmp_path / "pkg.zip", "w") as archive:
+        archive.writestr("a/tox.ini", b"[tox]\nrequires=\xff\n")
+        archive.writestr("b/tox.ini", MEMBERS["pkg-1.0/tox.ini"])
+
+    assert run(["--archive", "--keep-going", "--quiet", "pkg.zip"]) == 3
+
+    out, err = capsys.readouterr()
+    assert out == "pkg.zip:b/tox.ini\n"
+    assert err.startswith("failed to format 1 file(s):\n  pkg.zip:a/tox.ini: 'utf-8' codec can't decode byte 0xff")
+
+
+@pytest.mark.parametrize(
+    ("args", "error"),
+    [
+        (["--archive", "--jobs", "2"], "argument --archive: not allowed with arguments"),
+        (["--archive", "--rev", "HEAD"], "argument --archive: not allowed with argument --rev"),
+    ],
+)
+def test_cli_archive_combinations(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], args: list[str], error: str
+) -> None:
+    path = _zip(tmp_path / "pkg.zip")
+    with pytest.raises(SystemExit):
+        cli_args([str(path), *args])
+    assert error in capsys.readouterr().err
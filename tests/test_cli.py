@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import sys
 from stat import S_IREAD, S_IWRITE
 from typing import TYPE_CHECKING
@@ -7,6 +8,7 @@ from typing import TYPE_CHECKING
 import pytest
 
 from tox_ini_fmt.cli import cli_args
+from tox_ini_fmt.deadline import SUPPORTED
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -73,6 +75,46 @@ def test_cli_tox_ini_permission_fail(tmp_path: Path, capsys: pytest.CaptureFixtu
     assert f"argument tox_ini: cannot {error} path" in err
 
 
+def test_cli_tox_ini_errors_reported_together(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    path = tmp_path / "tox.ini"
+    path.write_text("")
+    missing = tmp_path / "missing.ini"
+    with pytest.raises(SystemExit) as context:
+        cli_args([str(missing), str(path), str(tmp_path)])
+    assert context.value.code != 0
+    out, err = capsys.readouterr()
+    assert not out
+    assert f"argument tox_ini: path does not exists: {missing}\n" in err
+    assert f"argument tox_ini: path is not a file: {tmp_path}\n" in err
+    assert str(path) not in err.replace(str(missing), "")
+
+
+@pytest.mark.parametrize(
+    ("args", "error"),
+    [
+        pytest.param([], "argument tox_ini: cannot write path", id="in-place"),
+        pytest.param(["--check"], None, id="check"),
+        pytest.param(["--stdout"], None, id="stdout"),
+    ],
+)
+def test_cli_tox_ini_write_check_only_in_place(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+    args: list[str],
+    error: str | None,
+) -> None:
+    path = tmp_path / "tox.ini"
+    path.write_text("")
+    monkeypatch.setattr("tox_ini_fmt.cli.os.access", lambda _, mode: not mode & os.W_OK)
+    if error is None:
+        assert cli_args([str(path), *args]).tox_ini == [path]
+    else:
+        with pytest.raises(SystemExit):
+            cli_args([str(path), *args])
+        assert error in capsys.readouterr().err
+
+
 def test_tox_ini_resolved(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.chdir(tmp_path)
     path = tmp_path / "tox.ini"
@@ -103,3 +145,79 @@ def test_cli_check_and_stdout_are_exclusive(tmp_path: Path, capsys: pytest.Captu
     out, err = capsys.readouterr()
     assert not out
     assert "not allowed with argument" in err
+
+
+@pytest.mark.parametrize(("args", "jobs"), [pytest.param([], 1, id="default"), pytest.param(["-j", "4"], 4, id="set")])
+def test_cli_jobs(tmp_path: Path, args: list[str], jobs: int) -> None:
+    path = tmp_path / "tox.ini"
+    path.write_text("")
+    assert cli_args([str(path), *args]).jobs == jobs
+
+
+@pytest.mark.parametrize("value", ["0", "-1", "many"])
+def test_cli_jobs_invalid(tmp_path: Path, capsys: pytest.CaptureFixture[str], value: str) -> None:
+    path = tmp_path / "tox.ini"
+    path.write_text("")
+    with pytest.raises(SystemExit) as context:
+        cli_args([str(path), "--jobs", value])
+    assert context.value.code != 0
+    out, err = capsys.readouterr()
+    assert not out
+    assert f"argument -j/--jobs: must be a positive integer, got {value!r}" in err
+
+
+@pytest.mark.parametrize("value", ["0", "-1.5", "nan", "inf", "soon"])
+def test_cli_timeout_per_file_invalid(tmp_path: Path, capsys: pytest.CaptureFixture[str], value: str) -> None:
+    path = tmp_path / "tox.ini"
+    path.write_text("")
+    with pytest.raises(SystemExit) as context:
+        cli_args([str(path), "--timeout-per-file", value])
+    assert context.value.code != 0
+    out, err = capsys.readouterr()
+    assert not out
+    assert f"argument --timeout-per-file: must be a positive number, got {value!r}" in err
+
+
+@pytest.mark.skipif(not SUPPORTED, reason="no interval timers on this platform")
+def test_cli_timeout_per_file_not_with_jobs(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    path = tmp_path / "tox.ini"
+    path.write_text("")
+    with pytest.raises(SystemExit) as context:
+        cli_args([str(path), "--timeout-per-file", "1.5", "--jobs", "2"])
+    assert context.value.code != 0
+    out, err = capsys.readouterr()
+    assert not out
+    assert "argument --timeout-per-file: not allowed with argument -j/--jobs above 1" in err
+
+
+def test_cli_fail_fast_requires_check(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    path = tmp_path / "tox.ini"
+    path.write_text("")
+    with pytest.raises(SystemExit) as context:
+        cli_args([str(path), "--fail-fast"])
+    assert context.value.code != 0
+    out, err = capsys.readouterr()
+    assert not out
+    assert "argument --fail-fast: only allowed with argument --check" in err
+
+
+def test_cli_quiet_and_stdout_are_exclusive(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    path = tmp_path / "tox.ini"
+    path.write_text("")
+    with pytest.raises(SystemExit) as context:
+        cli_args([str(path), "--quiet", "--stdout"])
+    assert context.value.code != 0
+    out, err = capsys.readouterr()
+    assert not out
+    assert "argument -q/--quiet: not allowed with argument -s/--stdout" in err
+
+
+def test_cli_watch_and_fail_fast_are_exclusive(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    path = tmp_path / "tox.ini"
+    path.write_text("")
+    with pytest.raises(SystemExit) as context:
+        cli_args([str(path), "--check", "--fail-fast", "--watch"])
+    assert context.value.code != 0
+    out, err = capsys.readouterr()
+    assert not out
+    assert "argument --watch: not allowed with argument --fail-fast" in err
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import signal
+import time
+
+import pytest
+
+from tox_ini_fmt.deadline import SUPPORTED, FileTimeoutError, deadline
+
+pytestmark = pytest.mark.skipif(not SUPPORTED, reason="no interval timers on this platform")
+
+
+def _busy() -> None:
+    with deadline(0.01):
+        while True:
+            time.sleep(0.001)
+
+
+def test_deadline_aborts() -> None:
+    previous = signal.getsignal(signal.SIGALRM)
+
+    with pytest.raises(FileTimeoutError, match=r"^timed out after 0\.01 seconds$"):
+        _busy()
+
+    assert signal.getsignal(signal.SIGALRM) is previous
+
+
+def test_deadline_within_budget() -> None:
+    previous = signal.getsignal(signal.SIGALRM)
+
+    with deadline(60):
+        pass
+
+    assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+    assert signal.getsignal(signal.SIGALRM) is previous
+
+
+def test_deadline_none() -> None:
+    with deadline(None):
+        assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
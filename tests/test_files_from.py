@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import sys
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tox_ini_fmt.__main__ import run
+from tox_ini_fmt.cli import cli_args
+from tox_ini_fmt.files_from import read_paths
+from tox_ini_fmt.shard import in_shard
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+
+@pytest.mark.parametrize("chunk_size", [8, 64 * 1024], ids=["chunked", "whole"])
+@pytest.mark.parametrize(
+    ("content", "names"),
+    [
+        pytest.param(b"a/tox.ini\nb.ini\n\nc d.ini", ["a/tox.ini", "b.ini", "c d.ini"], id="newline"),
+        pytest.param(b"a.ini\r\nb.ini\r\n", ["a.ini", "b.ini"], id="crlf"),
+        pytest.param(b"a.ini\0b\nc.ini\0\0d.ini\0", ["a.ini", "b\nc.ini", "d.ini"], id="nul"),
+        pytest.param(b"", [], id="empty"),
+    ],
+)
+def test_read_paths(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, content: bytes, names: list[str], chunk_size: int
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    listing = tmp_path / "files"
+    listing.write_bytes(content)
+
+    assert list(read_paths(str(listing), chunk_size=chunk_size)) == [tmp_path / name for name in names]
+
+
+def test_read_paths_streams_the_stdin(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    stdin = BytesIO(b"".join(f"tox{at}.ini\0".encode() for at in range(1000)))
+    monkeypatch.setattr(sys, "stdin", SimpleNamespace(buffer=stdin))
+
+    paths = read_paths("-", chunk_size=64)
+
+    assert next(paths) == tmp_path / "tox0.ini"
+    assert stdin.tell() == 64  # only the first chunk is read
+    assert len(list(paths)) == 999
+
+
+def _write_files(root: Path, count: int) -> list[str]:
+    names = [f"p{at}/tox.ini" for at in range(count)]
+    for name in names:
+        (root / name).parent.mkdir()
+        (root / name).write_text("[tox]\nenv_list=a,b\n")
+    return names
+
+
+@pytest.mark.parametrize("mode", [[], ["--jobs", "2"], ["--io-window", "2"]], ids=["sequential", "jobs", "io-window"])
+def test_main_files_from(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch, mode: list[str]
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    names = _write_files(tmp_path, 6)
+    (tmp_path / "files").write_text("\n".join([*names[:3], "missing.ini", "p0", *names[3:]]))
+
+    assert run(["--files-from", "files", "--quiet", *mode]) == 3
+
+    out, err = capsys.readouterr()
+    assert out.splitlines() == names
+    assert err.splitlines() == [
+        "failed to format 2 file(s):",
+        "  missing.ini: path does not exists",
+        "  p0: path is not a file",
+    ]
+    assert all((tmp_path / name).read_text().endswith("env_list =\n    a\n    b\n") for name in names)
+
+
+def test_main_files_from_shard(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    names = _write_files(tmp_path, 10)
+    monkeypatch.setattr(sys, "stdin", SimpleNamespace(buffer=BytesIO("\0".join(names).encode())))
+    mocker.patch("tox_ini_fmt.__main__.color_diff", lambda diff: diff)
+
+    assert run(["--files-from", "-", "--check", "--quiet", "--shard", "2/3"]) == 1
+
+    out, _ = capsys.readouterr()
+    assert out.splitlines() == [name for name in names if in_shard(Path(name).absolute(), 2, 3)]
+    assert out
+
+
+@pytest.mark.parametrize(
+    ("args", "error"),
+    [
+        pytest.param(["tox.ini"], "argument --files-from: not allowed with arguments tox_ini", id="tox-ini"),
+        pytest.param(["--watch"], "argument --files-from: not allowed with arguments tox_ini", id="watch"),
+        pytest.param(["--archive"], "argument --files-from: not allowed with arguments tox_ini", id="archive"),
+        pytest.param(["--rev", "HEAD"], "argument --files-from: not allowed with argument --rev", id="rev"),
+        pytest.param(
+            ["--shard", "1/2", "--shard-by", "size"],
+            "argument --shard-by: size not allowed with argument --files-from",
+            id="shard-by-size",
+        ),
+    ],
+)
+def test_cli_files_from_conflicts(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch, args: list[str], error: str
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "tox.ini").write_text("")
+    with pytest.raises(SystemExit):
+        cli_args(["--files-from", "-", *args])
+    assert error in capsys.readouterr().err
+
+
+def test_cli_files_from_not_readable(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit):
+        cli_args(["--files-from", str(tmp_path / "missing")])
+    assert f"argument --files-from: cannot read path: {tmp_path / 'missing'}" in capsys.readouterr().err
+
+
+def test_cli_files_from(tmp_path: Path) -> None:
+    (tmp_path / "files").write_text("")
+
+    result = cli_args(["--files-from", str(tmp_path / "files")])
+
+    assert result.files_from == str(tmp_path / "files")
+    assert result.tox_ini == []
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import subprocess
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tox_ini_fmt.__main__ import RED, run
+from tox_ini_fmt.cli import cli_args
+from tox_ini_fmt.git import BlobReader, GitError, changed_tox_ini, tox_ini_in_revision
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+
+def _git(root: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=a", "-c", "user.email=a@b.c", *args], cwd=root, check=True, capture_output=True
+    )
+
+
+@pytest.fixture
+def repo(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    _git(tmp_path, "init", "-q")
+    for name in ("tox.ini", "a/tox.ini", "b/tox.ini", "c/tox.ini", "d/tox.ini"):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text("[tox]\n", encoding="utf-8")
+    (tmp_path / "setup.cfg").write_text("", encoding="utf-8")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    (tmp_path / "a" / "tox.ini").write_text("[tox]\nenv_list=py\n", encoding="utf-8")  # modified
+    (tmp_path / "setup.cfg").write_text("[x]\n", encoding="utf-8")  # not a tox.ini
+    (tmp_path / "e").mkdir()
+    (tmp_path / "e" / "tox.ini").write_text("[tox]\n", encoding="utf-8")  # added
+    _git(tmp_path, "mv", "b", "f")  # renamed
+    _git(tmp_path, "rm", "-q", "c/tox.ini")  # deleted
+    _git(tmp_path, "add", ".")
+    return tmp_path
+
+
+def test_changed_tox_ini(repo: Path) -> None:
+    result = changed_tox_ini("HEAD", repo / "d")
+    assert sorted(result) == [repo / "a" / "tox.ini", repo / "e" / "tox.ini", repo / "f" / "tox.ini"]
+
+
+def test_cli_changed_since_all(repo: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(repo)
+    result = cli_args(["--changed-since", "HEAD"])
+    assert sorted(result.tox_ini) == [repo / "a" / "tox.ini", repo / "e" / "tox.ini", repo / "f" / "tox.ini"]
+
+
+def test_cli_changed_since_filters_paths(repo: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(repo)
+    result = cli_args(["--changed-since", "HEAD", "tox.ini", "e/tox.ini", "d/tox.ini", "a/tox.ini"])
+    assert result.tox_ini == [repo / "e" / "tox.ini", repo / "a" / "tox.ini"]
+
+
+def test_cli_changed_since_bad_ref(
+    repo: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.chdir(repo)
+    with pytest.raises(SystemExit):
+        cli_args(["--changed-since", "no-such-ref"])
+    assert "argument --changed-since: fatal: " in capsys.readouterr().err
+
+
+def test_cli_changed_since_option_like_ref(
+    repo: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.chdir(repo)
+    output = repo / "diff.txt"
+    with pytest.raises(SystemExit):
+        cli_args([f"--changed-since=--output={output}"])
+    assert "argument --changed-since: fatal: " in capsys.readouterr().err
+    assert not output.exists()
+
+
+def test_git_failure_without_stderr(repo: Path, mocker: MockerFixture) -> None:
+    mocker.patch("subprocess.run", side_effect=subprocess.CalledProcessError(128, ["git"], stderr=""))
+    with pytest.raises(GitError, match="git rev-parse failed with exit code 128"):
+        changed_tox_ini("HEAD", repo)
+
+
+def test_git_missing(tmp_path: Path, mocker: MockerFixture) -> None:
+    mocker.patch("subprocess.run", side_effect=FileNotFoundError)
+    with pytest.raises(GitError, match="git executable not found"):
+        changed_tox_ini("HEAD", tmp_path)
+
+
+def test_cli_tox_ini_required(capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit):
+        cli_args([])
+    assert "the following arguments are required: tox_ini" in capsys.readouterr().err
+
+
+FORMATTED = "[tox]\nrequires =\n    tox>=4.2\n"
+
+
+@pytest.fixture
+def history(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "tox.ini").write_bytes(b"[tox]\r\nrequires=tox>=4.2\r\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "first")
+    _git(tmp_path, "tag", "first")
+    (tmp_path / "tox.ini").write_text(FORMATTED, encoding="utf-8")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "tox.ini").write_text("[tox]\nrequires=tox>=4.2\n", encoding="utf-8")
+    (tmp_path / "sub" / "setup.cfg").write_text("", encoding="utf-8")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "second")
+    (tmp_path / "tox.ini").write_text("[tox]\nrequires=x\n", encoding="utf-8")  # the working tree is never used
+    return tmp_path
+
+
+def test_tox_ini_in_revision(history: Path) -> None:
+    assert tox_ini_in_revision("first", history) == ["tox.ini"]
+    assert tox_ini_in_revision("HEAD", history / "sub") == ["sub/tox.ini", "tox.ini"]
+
+
+def test_blob_reader(history: Path) -> None:
+    with BlobReader(history) as blobs:
+        assert blobs.read("first", "tox.ini") == b"[tox]\r\nrequires=tox>=4.2\r\n"
+        assert blobs.read("HEAD", "tox.ini") == FORMATTED.encode()
+        assert blobs.read("first", "sub/tox.ini") is None
+        assert blobs.read("HEAD", "sub") is None  # a directory
+        assert blobs.read("HEAD", "sub/setup.cfg") == b""
+
+
+def test_blob_reader_git_exited(history: Path) -> None:
+    blobs = BlobReader(history)
+    blobs._process.kill()  # ruff:ignore[private-member-access]
+    blobs._process.wait()  # ruff:ignore[private-member-access]
+    with pytest.raises(GitError, match="git cat-file exited with code"):
+        blobs.read("HEAD", "tox.ini")
+
+
+def test_blob_reader_git_missing(tmp_path: Path, mocker: MockerFixture) -> None:
+    mocker.patch("subprocess.Popen", side_effect=FileNotFoundError)
+    with pytest.raises(GitError, match="git executable not found"):
+        BlobReader(tmp_path)
+
+
+def test_main_rev(history: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    monkeypatch.chdir(history / "sub")
+
+    assert run(["--rev", "first", "--rev", "HEAD", "--quiet"]) == 1
+
+    out, err = capsys.readouterr()
+    assert not err
+    assert out == "first:tox.ini\nHEAD:sub/tox.ini\n"
+    assert (history / "tox.ini").read_text(encoding="utf-8") == "[tox]\nrequires=x\n"
+    assert (history / "sub" / "tox.ini").read_text(encoding="utf-8") == "[tox]\nrequires=tox>=4.2\n"
+
+
+def test_main_rev_paths(history: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    monkeypatch.chdir(history / "sub")
+
+    assert run(["--rev", "first", "--rev", "HEAD", "../tox.ini", "tox.ini"]) == 1
+
+    out, _ = capsys.readouterr()
+    lines = out.splitlines()
+    assert lines[0] == f"{RED}--- first:tox.ini"
+    assert "first:sub/tox.ini does not exist" in lines
+    assert "no change for HEAD:tox.ini" in lines
+    assert f"{RED}--- HEAD:sub/tox.ini" in lines
+
+
+def test_main_rev_not_utf8(history: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    monkeypatch.chdir(history)
+    (history / "sub" / "tox.ini").write_bytes(b"[tox]\nrequires=\xff\n")
+    _git(history, "commit", "-q", "-am", "third")
+
+    assert run(["--rev", "HEAD", "--keep-going", "--quiet", "sub/tox.ini"]) == 3
+
+    out, err = capsys.readouterr()
+    assert not out
+    assert err.startswith("failed to format 1 file(s):\n  HEAD:sub/tox.ini: 'utf-8' codec can't decode byte 0xff")
+
+
+def test_cli_rev_bad_revision(
+    history: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.chdir(history)
+    with pytest.raises(SystemExit):
+        cli_args(["--rev", "no-such-rev"])
+    assert "argument --rev: fatal: " in capsys.readouterr().err
+
+
+def test_cli_rev_outside_repository(
+    history: Path,
+    tmp_path_factory: pytest.TempPathFactory,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    monkeypatch.chdir(history)
+    outside = tmp_path_factory.mktemp("outside") / "tox.ini"
+    with pytest.raises(SystemExit):
+        cli_args(["--rev", "HEAD", str(outside)])
+    assert f"argument tox_ini: path is outside of the repository: {outside}" in capsys.readouterr().err
+
+
+def test_cli_rev_not_with_watch(
+    history: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.chdir(history)
+    with pytest.raises(SystemExit):
+        cli_args(["--rev", "HEAD", "--watch"])
+    assert "argument --rev: not allowed with arguments" in capsys.readouterr().err
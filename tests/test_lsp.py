@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import json
+import sys
+from io import BytesIO
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from tox_ini_fmt.formatter import format_tox_ini
+from tox_ini_fmt.lsp import LanguageServer, main
+
+URI = "file:///project/tox.ini"
+SOURCE = "[testenv:b]\ncommands=b\n[testenv:a]\ncommands=a\n[tox]\nenv_list=a,b\n"
+
+
+def _encode(*messages: dict[str, Any]) -> bytes:
+    result = b""
+    for message in messages:
+        body = json.dumps({"jsonrpc": "2.0", **message}).encode()
+        result += b"Content-Type: application/vscode-jsonrpc; charset=utf-8\r\n"
+        result += f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    return result
+
+
+def _decode(data: bytes) -> list[dict[str, Any]]:
+    stream, result = BytesIO(data), []
+    while header := stream.readline():
+        length = int(header.split(b":")[1])
+        stream.readline()
+        result.append(json.loads(stream.read(length)))
+    return result
+
+
+def _serve(*messages: dict[str, Any]) -> tuple[int, list[dict[str, Any]]]:
+    writer = BytesIO()
+    code = LanguageServer(BytesIO(_encode(*messages)), writer).serve()
+    return code, _decode(writer.getvalue())
+
+
+def _open(text: str) -> dict[str, Any]:
+    return {"method": "textDocument/didOpen", "params": {"textDocument": {"uri": URI, "text": text, "version": 1}}}
+
+
+def _format(request_id: int = 1) -> dict[str, Any]:
+    return {"id": request_id, "method": "textDocument/formatting", "params": {"textDocument": {"uri": URI}}}
+
+
+def _format_range(start: tuple[int, int], end: tuple[int, int]) -> dict[str, Any]:
+    selection = {"start": {"line": start[0], "character": start[1]}, "end": {"line": end[0], "character": end[1]}}
+    return {
+        "id": 1,
+        "method": "textDocument/rangeFormatting",
+        "params": {"textDocument": {"uri": URI}, "range": selection},
+    }
+
+
+def test_lsp_lifecycle() -> None:
+    code, responses = _serve(
+        {"id": 1, "method": "initialize", "params": {"capabilities": {}}},
+        {"method": "initialized", "params": {}},
+        {"id": 2, "method": "shutdown"},
+        {"method": "exit"},
+    )
+
+    assert code == 0
+    capabilities = responses[0]["result"]["capabilities"]
+    assert capabilities["documentFormattingProvider"] is True
+    assert capabilities["documentRangeFormattingProvider"] is True
+    assert responses[1] == {"jsonrpc": "2.0", "id": 2, "result": None}
+
+
+@pytest.mark.parametrize("messages", [[{"method": "exit"}], []], ids=["exit-without-shutdown", "stream-closed"])
+def test_lsp_exit_without_shutdown(messages: list[dict[str, Any]]) -> None:
+    assert _serve(*messages) == (1, [])
+
+
+def test_lsp_formatting() -> None:
+    text = "[tox]\nenv_list=py39,py38\n# é ☃\n"
+    _, responses = _serve(_open(text), _format())
+
+    assert responses[0]["result"] == [
+        {
+            "range": {"start": {"line": 0, "character": 0}, "end": {"line": 3, "character": 0}},
+            "newText": format_tox_ini(text),
+        }
+    ]
+
+
+def test_lsp_formatting_utf16_end() -> None:
+    text = "[tox]\nenv_list=a\n# 😀"
+    _, responses = _serve(_open(text), _format())
+
+    assert responses[0]["result"][0]["range"]["end"] == {"line": 2, "character": 4}
+
+
+def test_lsp_formatting_keeps_line_endings() -> None:
+    text = "[tox]\r\nenv_list=a\r\n"
+    _, responses = _serve(_open(text), _format())
+
+    assert responses[0]["result"][0]["newText"] == format_tox_ini(text).replace("\n", "\r\n")
+
+
+def test_lsp_formatting_no_change() -> None:
+    text = format_tox_ini(SOURCE)
+    _, responses = _serve(_open(text), _format(), _format_range((0, 0), (20, 0)))
+
+    assert [response["result"] for response in responses] == [[], []]
+
+
+def test_lsp_formatting_follows_changes() -> None:
+    changed = {
+        "method": "textDocument/didChange",
+        "params": {"textDocument": {"uri": URI, "version": 2}, "contentChanges": [{"text": "[tox]\nenv_list=x\n"}]},
+    }
+    _, responses = _serve(_open(SOURCE), changed, _format())
+
+    assert responses[0]["result"][0]["newText"] == format_tox_ini("[tox]\nenv_list=x\n")
+
+
+def test_lsp_formatting_closed_document() -> None:
+    closed = {"method": "textDocument/didClose", "params": {"textDocument": {"uri": URI}}}
+    _, responses = _serve(_open(SOURCE), closed, _format())
+
+    assert responses[0]["error"]["code"] == -32603
+
+
+def test_lsp_formatting_invalid_document() -> None:
+    _, responses = _serve(_open("key = value\n"), _format())
+
+    assert responses[0]["error"]["code"] == -32603
+    assert "File contains no section headers" in responses[0]["error"]["message"]
+
+
+def test_lsp_unknown_request() -> None:
+    _, responses = _serve({"id": 7, "method": "textDocument/hover", "params": {}}, {"id": 8, "result": None})
+
+    assert responses == [
+        {"jsonrpc": "2.0", "id": 7, "error": {"code": -32601, "message": "method not found: textDocument/hover"}}
+    ]
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "edited"),
+    [
+        pytest.param((3, 0), (3, 5), [(2, (4, 0), "[testenv:a]\ncommands =\n    a\n\n")], id="second-section"),
+        pytest.param((0, 3), (2, 0), [(0, (2, 0), "[testenv:b]\ncommands =\n    b\n\n")], id="ends-at-next-header"),
+        pytest.param(
+            (5, 0),
+            (6, 0),
+            [(4, (6, 0), "[tox]\nrequires =\n    tox>=4.2\nenv_list =\n    a\n    b\n")],
+            id="last-section",
+        ),
+    ],
+)
+def test_lsp_range_formatting(
+    start: tuple[int, int], end: tuple[int, int], edited: list[tuple[int, tuple[int, int], str]]
+) -> None:
+    _, responses = _serve(_open(SOURCE), _format_range(start, end))
+
+    assert responses[0]["result"] == [
+        {
+            "range": {"start": {"line": line, "character": 0}, "end": {"line": to[0], "character": to[1]}},
+            "newText": text,
+        }
+        for line, to, text in edited
+    ]
+
+
+def test_lsp_range_formatting_skips_empty_default_section() -> None:
+    _, responses = _serve(_open("[DEFAULT]\n[tox]\nenv_list=a\n"), _format_range((0, 0), (0, 1)))
+
+    assert responses[0]["result"] == []
+
+
+def test_lsp_main(monkeypatch: pytest.MonkeyPatch) -> None:
+    reader, writer = BytesIO(_encode({"id": 1, "method": "shutdown"}, {"method": "exit"})), BytesIO()
+    monkeypatch.setattr(sys, "stdin", SimpleNamespace(buffer=reader))
+    monkeypatch.setattr(sys, "stdout", SimpleNamespace(buffer=writer))
+
+    assert main() == 0
+
+    assert _decode(writer.getvalue()) == [{"jsonrpc": "2.0", "id": 1, "result": None}]
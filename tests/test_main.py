@@ -3,17 +3,25 @@ from __future__ import annotations
 import difflib
 import subprocess
 import sys
+import time
 from typing import TYPE_CHECKING
 
 import pytest
 
+import tox_ini_fmt.__main__
 from tox_ini_fmt.__main__ import GREEN, RED, RESET, color_diff, run
+from tox_ini_fmt.deadline import SUPPORTED
+from tox_ini_fmt.formatter import format_tox_ini as original
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from pathlib import Path
 
     from pytest_mock import MockerFixture
 
+    from tox_ini_fmt.cli import ToxIniFmtNamespace
+    from tox_ini_fmt.tracing import Tracer
+
 
 def test_color_diff() -> None:
     # Arrange
@@ -192,3 +200,209 @@ def test_main_check(  # ruff:ignore[too-many-arguments]
     out, err = capsys.readouterr()
     assert not err
     assert out == output
+
+
+def test_main_jobs_keeps_order(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    names = [f"tox{i}.ini" for i in range(8)]
+    for at, name in enumerate(names):
+        (tmp_path / name).write_text(f"[tox]\nrequires =\n    tox>=4.2\nenv_list =\n    py3{at}\n")
+
+    assert run([*names, "--jobs", "3"]) == 0
+
+    out, err = capsys.readouterr()
+    assert not err
+    assert out == "".join(f"no change for {name}\n" for name in names)
+
+
+def test_main_no_change_after_change(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch("tox_ini_fmt.__main__.color_diff", no_color)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.ini").write_text("[tox]\nrequires=tox>=4.2\n")
+    (tmp_path / "b.ini").write_text("[tox]\nrequires =\n    tox>=4.2\n")
+
+    assert run(["a.ini", "b.ini", "--check"]) == 1
+
+    out, _ = capsys.readouterr()
+    assert out.endswith("+    tox>=4.2\nno change for b.ini\n")
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_main_check_fail_fast(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch, jobs: str
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.ini").write_text("[tox]\nrequires =\n    tox>=4.2\n")
+    (tmp_path / "b.ini").write_text("[tox]\nrequires=tox>=4.2\n")
+    (tmp_path / "c.ini").write_text("[tox]\nrequires=tox>=4.2\n")
+
+    assert run(["a.ini", "b.ini", "c.ini", "--check", "--fail-fast", "--quiet", "--jobs", jobs]) == 1
+
+    out, err = capsys.readouterr()
+    assert not err
+    assert out == "b.ini\n"
+
+
+def test_main_quiet_writes(tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.ini").write_text("[tox]\nrequires=tox>=4.2\n")
+    (tmp_path / "b.ini").write_text("[tox]\nrequires =\n    tox>=4.2\n")
+
+    assert run(["a.ini", "b.ini", "--quiet"]) == 1
+
+    out, err = capsys.readouterr()
+    assert not err
+    assert out == "a.ini\n"
+    assert (tmp_path / "a.ini").read_text() == "[tox]\nrequires =\n    tox>=4.2\n"
+
+
+def test_main_watch(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.ini").write_text("[tox]\nrequires =\n    tox>=4.2\n")
+    (tmp_path / "b.ini").write_text("[tox]\nrequires =\n    tox>=4.2\n")
+
+    def watch(paths: list[Path]) -> Iterator[list[Path]]:
+        paths[1].write_text("[tox]\nrequires=tox>=4.2\n")
+        yield [paths[1]]
+        raise KeyboardInterrupt
+
+    mocker.patch("tox_ini_fmt.__main__.watch", watch)
+
+    assert run(["a.ini", "b.ini", "--watch", "--quiet"]) == 0
+
+    out, err = capsys.readouterr()
+    assert not err
+    assert out == "b.ini\n"
+    assert (tmp_path / "b.ini").read_text() == "[tox]\nrequires =\n    tox>=4.2\n"
+
+
+def test_main_watch_survives_unparsable_save(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    tox_ini = tmp_path / "tox.ini"
+    tox_ini.write_text("[tox]\nrequires =\n    tox>=4.2\n")
+
+    def watch(paths: list[Path]) -> Iterator[list[Path]]:
+        paths[0].write_text("garbage no section\n")
+        yield [paths[0]]
+        paths[0].write_text("[tox]\nrequires=tox>=4.2\n")
+        yield [paths[0]]
+        raise KeyboardInterrupt
+
+    mocker.patch("tox_ini_fmt.__main__.watch", watch)
+
+    assert run(["tox.ini", "--watch", "--quiet"]) == 0
+
+    out, err = capsys.readouterr()
+    assert out == "tox.ini\n"
+    assert err.splitlines()[0] == "failed to format 1 file(s):"
+    assert err.splitlines()[1].startswith("  tox.ini: File contains no section headers.")
+    assert tox_ini.read_text() == "[tox]\nrequires =\n    tox>=4.2\n"
+
+
+@pytest.mark.parametrize("mode", [[], ["--jobs", "2"], ["--io-window", "2"]], ids=["sequential", "jobs", "io-window"])
+def test_main_keep_going(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch, mode: list[str]
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.ini").write_text("no section\n")
+    (tmp_path / "b.ini").write_text("[tox]\nrequires=tox>=4.2\n")
+    (tmp_path / "c.ini").write_text("[testenv]\nset_env=invalid\n")
+    (tmp_path / "d.ini").write_text("[tox]\nrequires =\n    tox>=4.2\n")
+
+    assert run(["a.ini", "b.ini", "c.ini", "d.ini", "--keep-going", "--quiet", *mode]) == 3
+
+    out, err = capsys.readouterr()
+    assert out == "b.ini\n"
+    assert err.splitlines() == [
+        "failed to format 2 file(s):",
+        "  a.ini: File contains no section headers. file: '<string>', line: 1 'no section\\n'",
+        "  c.ini: invalid line invalid in setenv",
+    ]
+    assert (tmp_path / "b.ini").read_text() == "[tox]\nrequires =\n    tox>=4.2\n"
+
+
+@pytest.mark.skipif(not SUPPORTED, reason="no interval timers on this platform")
+@pytest.mark.parametrize(
+    "mode", [[], ["--io-window", "2"], ["--keep-going"]], ids=["sequential", "io-window", "keep-going"]
+)
+def test_main_timeout_per_file(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+    mocker: MockerFixture,
+    mode: list[str],
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.ini").write_text("[tox]\nrequires=tox>=4.2\n")
+    (tmp_path / "slow.ini").write_text("[tox]\nrequires=slow\n")
+    (tmp_path / "c.ini").write_text("[tox]\nrequires=tox>=4.2\n")
+
+    def format_tox_ini(text: str, opts: ToxIniFmtNamespace, *, tracer: Tracer) -> str:
+        while "slow" in text:  # stands for a file taking too long to format
+            time.sleep(0.001)
+        return original(text, opts, tracer=tracer)
+
+    mocker.patch("tox_ini_fmt.__main__.format_tox_ini", format_tox_ini)
+
+    assert run(["a.ini", "slow.ini", "c.ini", "--timeout-per-file", "0.05", "--quiet", *mode]) == 3
+
+    out, err = capsys.readouterr()
+    assert out == "a.ini\nc.ini\n"
+    assert err.splitlines() == ["failed to format 1 file(s):", "  slow.ini: timed out after 0.05 seconds"]
+    assert (tmp_path / "slow.ini").read_text() == "[tox]\nrequires=slow\n"
+    assert (tmp_path / "c.ini").read_text() == "[tox]\nrequires =\n    tox>=4.2\n"
+
+
+@pytest.mark.parametrize("mode", [[], ["--jobs", "2"], ["--io-window", "2"]], ids=["sequential", "jobs", "io-window"])
+def test_main_keep_going_unreadable(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+    mocker: MockerFixture,
+    mode: list[str],
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.ini").write_text("[tox]\nrequires=tox>=4.2\n")
+    (tmp_path / "b.ini").write_bytes(b"[tox]\nrequires=\xff\n")
+    (tmp_path / "c.ini").write_text("[tox]\nrequires=tox>=4.2\n")
+    read = tox_ini_fmt.__main__._read  # ruff:ignore[private-member-access]
+
+    def flaky_read(tox_ini: Path, tracer: Tracer) -> tuple[str, str | None]:
+        if tox_ini.name == "c.ini":
+            msg = "[Errno 5] Input/output error"
+            raise OSError(msg)
+        return read(tox_ini, tracer)
+
+    mocker.patch("tox_ini_fmt.__main__._read", flaky_read)
+
+    assert run(["a.ini", "b.ini", "c.ini", "--check", "--keep-going", "--quiet", *mode]) == 3
+
+    out, err = capsys.readouterr()
+    assert out == "a.ini\n"
+    assert err.splitlines() == [
+        "failed to format 2 file(s):",
+        "  b.ini: 'utf-8' codec can't decode byte 0xff in position 15: invalid start byte",
+        "  c.ini: [Errno 5] Input/output error",
+    ]
+
+    with pytest.raises(UnicodeDecodeError):
+        run(["b.ini", "--check", *mode])
+
+
+def test_main_stops_on_error(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.ini").write_text("[testenv]\nset_env=invalid\n")
+
+    with pytest.raises(RuntimeError, match="invalid line invalid in setenv"):
+        run(["a.ini"])
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import io
+import tracemalloc
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tox_ini_fmt.__main__ import run
+from tox_ini_fmt.cli import cli_args
+from tox_ini_fmt.memory import MemoryReport
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_memory_report(tox_ini: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    tox_ini.write_text("[tox]\nenv_list=py\n[testenv]\ndeps=b\n  a\n", encoding="utf-8")
+
+    assert run([str(tox_ini), "--check", "--memory-report", "--profile", str(tox_ini.parent / "trace.json")]) == 1
+
+    _, err = capsys.readouterr()
+    lines = err.splitlines()
+    assert lines[0].split() == ["phase", "calls", "peak", "retained"]
+    assert [line.split()[:2] for line in lines[1:7]] == [
+        ["read", "1"],
+        ["parse", "1"],
+        ["format", "1"],
+        ["order", "1"],
+        ["generate", "1"],
+        ["diff", "1"],
+    ]
+    assert lines[7].startswith("retained by the whole run: ")
+    assert "top allocation sites of parse:" in lines
+    assert not tracemalloc.is_tracing()
+    assert (tox_ini.parent / "trace.json").exists()
+
+
+def test_memory_report_keeps_tracing_started_by_others() -> None:
+    tracemalloc.start()
+    try:
+        stream = io.StringIO()
+        report = MemoryReport(stream, top=1)
+        with report.span("file", "file"), report.span("grow", "phase"):
+            kept = [str(i) * 1024 for i in range(10, 26)]
+        report.close()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    assert kept
+    lines = stream.getvalue().splitlines()
+    assert lines[1].split()[:2] == ["grow", "1"]
+    assert float(lines[1].split()[-2]) >= 16
+    assert lines[3] == "top allocation sites of grow:"
+    assert len(lines) == 5
+
+
+def test_memory_report_not_with_jobs(tox_ini: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    tox_ini.write_text("", encoding="utf-8")
+    with pytest.raises(SystemExit):
+        cli_args([str(tox_ini), "--memory-report", "--jobs", "2"])
+    assert "argument --memory-report: not allowed with argument -j/--jobs above 1" in capsys.readouterr().err
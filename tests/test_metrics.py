@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tox_ini_fmt.__main__ import run
+from tox_ini_fmt.formatter.memo import clear_caches
+from tox_ini_fmt.formatter.requires import parse_requirement, requirement_parses
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CHANGED = "[tox]\nenv_list=py\n[testenv]\ndeps=b\n  a\ncommands=pytest\n[testenv:py]\ndeps=a\n"
+SAME = "[tox]\nrequires =\n    tox>=4.2\n"
+
+
+@pytest.fixture
+def files(tmp_path: Path) -> list[Path]:
+    changed, same = tmp_path / "changed.ini", tmp_path / "same.ini"
+    changed.write_text(CHANGED)
+    same.write_text(SAME)
+    return [changed, same]
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        pytest.param([], id="sequential"),
+        pytest.param(["--jobs", "2"], id="jobs"),
+        pytest.param(["--io-window", "2"], id="io-window"),
+    ],
+)
+def test_metrics_json(tmp_path: Path, files: list[Path], capsys: pytest.CaptureFixture[str], args: list[str]) -> None:
+    clear_caches()
+    metrics = tmp_path / "metrics.json"
+
+    assert run([*map(str, files), "--metrics", str(metrics), *args]) == 1
+    capsys.readouterr()
+
+    result = json.loads(metrics.read_text(encoding="utf-8"))
+    assert result["files"] == 2
+    assert result["files_changed"] == 1
+    assert result["files_failed"] == 0
+    assert result["read_bytes"] == len(CHANGED) + len(SAME)
+    assert result["written_bytes"] == files[0].stat().st_size
+    assert result["requirement_parses"] > 0
+    assert result["files_per_second"] > 0
+    assert set(result["phase_seconds"]) == {"read", "parse", "format", "order", "generate", "diff", "write"}
+    assert set(result["formatter_seconds"]) == {"tox_section", "test_env"}
+    dependencies = result["caches"]["to_py_dependencies"]
+    assert dependencies["misses"] > 0
+    assert dependencies["hit_rate"] == pytest.approx(
+        dependencies["hits"] / (dependencies["hits"] + dependencies["misses"])
+    )
+
+
+def test_metrics_prometheus(tmp_path: Path, files: list[Path], capsys: pytest.CaptureFixture[str]) -> None:
+    metrics, profile = tmp_path / "tox_ini_fmt.prom", tmp_path / "trace.json"
+
+    assert run([*map(str, files), "--metrics", str(metrics), "--profile", str(profile), "--check"]) == 1
+    capsys.readouterr()
+
+    lines = metrics.read_text(encoding="utf-8").splitlines()
+    samples = dict(line.rsplit(" ", 1) for line in lines if not line.startswith("#"))
+    assert "# TYPE tox_ini_fmt_files_total counter" in lines
+    assert samples["tox_ini_fmt_files_total"] == "2"
+    assert samples["tox_ini_fmt_written_bytes_total"] == "0"
+    assert "# TYPE tox_ini_fmt_files_per_second gauge" in lines
+    assert 'tox_ini_fmt_phase_seconds_total{phase="parse"}' in samples
+    assert 'tox_ini_fmt_formatter_seconds_total{formatter="test_env"}' in samples
+    assert 'tox_ini_fmt_cache_hits_total{transform="to_commands"}' in samples
+    assert profile.exists()
+
+
+def test_metrics_failed_files(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    tox_ini, metrics = tmp_path / "tox.ini", tmp_path / "metrics.json"
+    tox_ini.write_text("[testenv]\nset_env = A\n")
+
+    assert run([str(tox_ini), "--keep-going", "--metrics", str(metrics)]) == 3
+    capsys.readouterr()
+
+    assert json.loads(metrics.read_text(encoding="utf-8"))["files_failed"] == 1
+
+
+def test_requirement_parses_counted() -> None:
+    before = requirement_parses()
+
+    assert parse_requirement("tox>=4").name == "tox"
+
+    assert requirement_parses() == before + 1
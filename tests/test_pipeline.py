@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tox_ini_fmt.__main__ import run
+from tox_ini_fmt.cli import cli_args
+from tox_ini_fmt.pipeline import ordered_map, pipeline
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+
+class _Probe:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.loaded = self.processed = self.ahead = 0
+        self.pending = self.most_pending = 0
+        self.stored: list[int] = []
+
+    def load(self, item: int) -> int:
+        with self.lock:
+            self.loaded += 1
+            self.ahead = max(self.ahead, self.loaded - self.processed)
+        return item * 10
+
+    def process(self, item: int, value: int) -> tuple[int, Callable[[], None] | None]:
+        with self.lock:
+            self.processed += 1
+            self.pending += 1
+            self.most_pending = max(self.most_pending, self.pending)
+        return value + 1, (lambda: self.store(item)) if item % 2 else None
+
+    def store(self, item: int) -> None:
+        time.sleep(0.001)
+        with self.lock:
+            self.stored.append(item)
+            self.pending -= 1
+
+
+@pytest.mark.parametrize("window", [1, 3])
+def test_pipeline_keeps_order_and_window(window: int) -> None:
+    probe = _Probe()
+
+    result = list(pipeline(range(20), window=window, load=probe.load, process=probe.process))
+
+    assert result == [i * 10 + 1 for i in range(20)]
+    assert probe.ahead <= window + 1  # the one being processed plus the ones prefetched
+    assert sorted(probe.stored) == list(range(1, 20, 2))
+
+
+def test_pipeline_stop_early_waits_for_stores() -> None:
+    probe = _Probe()
+
+    results = pipeline(range(20), window=4, load=probe.load, process=probe.process)
+    assert [next(results) for _ in range(4)] == [1, 11, 21, 31]
+    results.close()
+
+    assert sorted(probe.stored) == [1, 3]  # the stores run concurrently
+
+
+def test_pipeline_store_failure() -> None:
+    def process(item: int, value: int) -> tuple[int, Callable[[], None]]:
+        def store() -> None:
+            msg = f"cannot store {item}"
+            raise OSError(msg)
+
+        return value, store
+
+    with pytest.raises(OSError, match="cannot store 0"):
+        list(pipeline(range(5), window=1, load=lambda i: i, process=process))
+
+
+def test_main_io_window(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch("tox_ini_fmt.__main__.color_diff", lambda diff: diff)
+    monkeypatch.chdir(tmp_path)
+    names = [f"tox{i}.ini" for i in range(6)]
+    for at, name in enumerate(names):
+        (tmp_path / name).write_text(f"[tox]\nrequires =\n    tox>=4.2\nenv_list = py3{at}\n", encoding="utf-8")
+
+    assert run([*names, "--io-window", "2"]) == 1
+
+    out, _ = capsys.readouterr()
+    assert [line for line in out.splitlines() if line.startswith("--- ")] == [f"--- {name}" for name in names]
+    for at, name in enumerate(names):
+        assert (tmp_path / name).read_text(encoding="utf-8").endswith(f"env_list =\n    py3{at}\n")
+
+
+@pytest.mark.parametrize(
+    ("args", "error"),
+    [
+        pytest.param(["--jobs", "2"], "argument --io-window: not allowed with argument -j/--jobs above 1", id="jobs"),
+        pytest.param(["--memory-report"], "argument --memory-report: not allowed with argument", id="memory"),
+    ],
+)
+def test_cli_io_window_conflicts(
+    tox_ini: Path, capsys: pytest.CaptureFixture[str], args: list[str], error: str
+) -> None:
+    tox_ini.write_text("", encoding="utf-8")
+    with pytest.raises(SystemExit):
+        cli_args([str(tox_ini), "--io-window", "2", *args])
+    assert error in capsys.readouterr().err
+
+
+def test_ordered_map_submits_within_the_window() -> None:
+    consumed, most_ahead = 0, 0
+
+    def work(item: int) -> int:
+        nonlocal most_ahead
+        most_ahead = max(most_ahead, item - consumed)
+        return item * 2
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = []
+        for result in ordered_map(executor, work, iter(range(50)), window=3):
+            results.append(result)
+            consumed += 1
+
+    assert results == [i * 2 for i in range(50)]
+    assert most_ahead <= 3
+
+
+def test_ordered_map_stop_early_cancels_the_pending() -> None:
+    started: list[int] = []
+    running, hold = threading.Event(), threading.Event()
+
+    def work(item: int) -> int:
+        started.append(item)
+        if item:
+            running.set()
+            hold.wait()
+        return item
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        results = ordered_map(executor, work, range(10), window=4)
+        assert next(results) == 0
+        running.wait()
+        results.close()
+        hold.set()
+
+    assert started == [0, 1]  # the one running when stopped completes, the queued ones never start
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tox_ini_fmt.cli import cli_args
+from tox_ini_fmt.shard import in_shard, select_shard
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _files(root: Path, count: int) -> list[Path]:
+    result = []
+    for at in range(count):
+        path = root / f"p{at}" / "tox.ini"
+        path.parent.mkdir(parents=True)
+        path.write_text("x" * (at * 7 % 23 + 1))
+        result.append(path)
+    return result
+
+
+@pytest.mark.parametrize("by_size", [False, True], ids=["hash", "size"])
+def test_shards_partition_the_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, by_size: bool) -> None:
+    monkeypatch.chdir(tmp_path)
+    paths = _files(tmp_path, 40)
+
+    shards = [select_shard(paths, index, 4, by_size=by_size) for index in range(1, 5)]
+
+    assert sorted(path for shard in shards for path in shard) == sorted(paths)
+    assert all(shard == sorted(shard, key=paths.index) for shard in shards)  # the input order is kept
+    assert all(shard for shard in shards)
+
+
+@pytest.mark.parametrize("by_size", [False, True], ids=["hash", "size"])
+def test_shards_do_not_depend_on_the_checkout_location(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, by_size: bool
+) -> None:
+    first, second = _files(tmp_path / "one", 20), _files(tmp_path / "two", 20)
+
+    monkeypatch.chdir(tmp_path / "one")
+    selected = [first.index(path) for path in select_shard(first, 2, 3, by_size=by_size)]
+    monkeypatch.chdir(tmp_path / "two")
+    assert [second.index(path) for path in select_shard(second, 2, 3, by_size=by_size)] == selected
+
+
+def test_in_shard_matches_select_shard(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    paths = _files(tmp_path, 20)
+
+    assert [path for path in paths if in_shard(path, 3, 4)] == select_shard(paths, 3, 4)
+
+
+def test_shards_balanced_by_size(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    paths = _files(tmp_path, 40)
+
+    totals = [sum(path.stat().st_size for path in select_shard(paths, index, 4, by_size=True)) for index in range(1, 5)]
+
+    assert max(totals) - min(totals) <= max(path.stat().st_size for path in paths)
+
+
+def test_shard_outside_working_directory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    paths = _files(tmp_path / "files", 10)
+    (tmp_path / "cwd").mkdir()
+    monkeypatch.chdir(tmp_path / "cwd")
+
+    assert sorted(select_shard(paths, 1, 2) + select_shard(paths, 2, 2)) == sorted(paths)
+
+
+def test_cli_shard(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    paths = _files(tmp_path, 10)
+    args = [str(path) for path in paths]
+
+    result = [cli_args([*args, "--shard", f"{index}/3", "--shard-by", "size"]).tox_ini for index in range(1, 4)]
+
+    assert sorted(path for shard in result for path in shard) == sorted(paths)
+
+
+@pytest.mark.parametrize("value", ["0/2", "3/2", "1", "a/b", "1/0"])
+def test_cli_shard_invalid(tmp_path: Path, capsys: pytest.CaptureFixture[str], value: str) -> None:
+    path = tmp_path / "tox.ini"
+    path.write_text("")
+    with pytest.raises(SystemExit):
+        cli_args([str(path), "--shard", value])
+    assert f"argument --shard: must be INDEX/COUNT with 1 <= INDEX <= COUNT, got {value!r}" in capsys.readouterr().err
+
+
+def test_cli_shard_not_with_rev(capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit):
+        cli_args(["--rev", "HEAD", "--shard", "1/2"])
+    assert "argument --shard: not allowed with argument --rev" in capsys.readouterr().err
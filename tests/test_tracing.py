@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tox_ini_fmt.__main__ import run
+from tox_ini_fmt.tracing import NO_TRACE
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_no_trace_span() -> None:
+    with NO_TRACE.span("a", "phase", file="b"):
+        pass
+
+
+@pytest.mark.parametrize("args", [pytest.param([], id="in-place"), pytest.param(["--jobs", "2"], id="jobs")])
+def test_profile(tmp_path: Path, capsys: pytest.CaptureFixture[str], args: list[str]) -> None:
+    changed, same = tmp_path / "changed.ini", tmp_path / "same.ini"
+    changed.write_text("[tox]\nenv_list=py\n[testenv]\ncommands=pytest\n[testenv:py]\ndeps=a\n")
+    same.write_text("[tox]\nrequires =\n    tox>=4.2\n")
+    profile = tmp_path / "trace.json"
+
+    assert run([str(changed), str(same), "--profile", str(profile), *args]) == 1
+    capsys.readouterr()
+
+    events = json.loads(profile.read_text(encoding="utf-8"))["traceEvents"]
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+    spans = [(event["cat"], event["name"]) for event in events]
+    assert spans.count(("file", str(changed))) == 1
+    assert spans.count(("file", str(same))) == 1
+    for phase in ("read", "parse", "format", "order", "generate"):
+        assert spans.count(("phase", phase)) == 2
+    assert spans.count(("phase", "write")) == 1
+    assert spans.count(("phase", "diff")) == 1
+    assert sorted(name for category, name in spans if category == "section") == ["testenv", "testenv:py", "tox", "tox"]
+
+
+def test_profile_written_on_failure(tmp_path: Path) -> None:
+    tox_ini = tmp_path / "tox.ini"
+    tox_ini.write_text("[testenv]\nset_env = A\n")
+    profile = tmp_path / "trace.json"
+
+    with pytest.raises(RuntimeError, match="invalid line A in setenv"):
+        run([str(tox_ini), "--profile", str(profile)])
+
+    events = json.loads(profile.read_text(encoding="utf-8"))["traceEvents"]
+    assert ("section", "testenv") in [(event["cat"], event["name"]) for event in events]
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import os
+import struct
+import threading
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tox_ini_fmt.watch import _IN_CLOSE_WRITE, _IN_Q_OVERFLOW, _Inotify, watch
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+
+@pytest.fixture(params=["inotify", "polling"])
+def source(request: pytest.FixtureRequest, mocker: MockerFixture) -> str:
+    if request.param == "polling":
+        mocker.patch.object(_Inotify, "create", return_value=None)
+    return str(request.param)
+
+
+def _later(action: Callable[[], object], delay: float = 0.05) -> None:
+    timer = threading.Timer(delay, action)
+    timer.daemon = True
+    timer.start()
+
+
+@pytest.mark.usefixtures("source")
+def test_watch_reports_content_changes(tmp_path: Path) -> None:
+    first, second = tmp_path / "a.ini", tmp_path / "b.ini"
+    first.write_text("a")
+    second.write_text("b")
+    changes = watch([first, second], debounce=0.2, interval=0.01)
+
+    def edit() -> None:
+        first.write_text("a")  # saved without change
+        second.write_text("B")
+
+    _later(edit)
+    assert next(changes) == [second]
+    changes.close()
+
+
+@pytest.mark.usefixtures("source")
+def test_watch_debounces_bursts(tmp_path: Path) -> None:
+    first, second = tmp_path / "a.ini", tmp_path / "b.ini"
+    first.write_text("a")
+    second.write_text("b")
+    changes = watch([first, second], debounce=0.2, interval=0.01)
+
+    def edit() -> None:
+        second.write_text("B")
+        first.write_text("A")
+
+    _later(edit)
+    assert next(changes) == [first, second]
+    changes.close()
+
+
+@pytest.mark.usefixtures("source")
+def test_watch_ignores_changes_of_the_caller(tmp_path: Path) -> None:
+    first, second = tmp_path / "a.ini", tmp_path / "b.ini"
+    first.write_text("a")
+    second.write_text("b")
+    changes = watch([first, second], debounce=0.2, interval=0.01)
+
+    _later(lambda: first.write_text("A"))
+    assert next(changes) == [first]
+    first.write_text("formatted A")  # as when writing back the formatted text
+    _later(lambda: second.write_text("B"))
+    assert next(changes) == [second]
+    changes.close()
+
+
+def test_inotify_events(tmp_path: Path) -> None:
+    read, write = os.pipe()
+    libc = SimpleNamespace(inotify_add_watch=lambda *_: 1)
+    path = tmp_path / "tox.ini"
+    inotify = _Inotify(libc, read, [path])  # ty: ignore[invalid-argument-type]
+    try:
+        name = b"tox.ini\0"
+        os.write(write, struct.pack("iIII", 2, _IN_CLOSE_WRITE, 0, len(name)) + name)  # unknown watch
+        assert inotify.changes(0) == set()
+        os.write(write, struct.pack("iIII", -1, _IN_Q_OVERFLOW, 0, 0))
+        assert inotify.changes(0) == {path}
+    finally:
+        inotify.close()
+        os.close(write)
+
+
+def test_inotify_unavailable(mocker: MockerFixture, tmp_path: Path) -> None:
+    mocker.patch("tox_ini_fmt.watch.ctypes.CDLL", return_value=SimpleNamespace())
+    assert _Inotify.create([tmp_path / "tox.ini"]) is None
+
+
+def test_inotify_init_fails(mocker: MockerFixture, tmp_path: Path) -> None:
+    mocker.patch("tox_ini_fmt.watch.ctypes.CDLL", return_value=SimpleNamespace(inotify_init1=lambda _: -1))
+    assert _Inotify.create([tmp_path / "tox.ini"]) is None
+
+
+def test_inotify_add_watch_fails(mocker: MockerFixture, tmp_path: Path) -> None:
+    read, write = os.pipe()
+    os.close(write)
+    libc = SimpleNamespace(inotify_init1=lambda _: read, inotify_add_watch=lambda *_: -1)
+    mocker.patch("tox_ini_fmt.watch.ctypes.CDLL", return_value=libc)
+    assert _Inotify.create([tmp_path / "tox.ini"]) is None
+    with pytest.raises(OSError, match="Bad file descriptor"):
+        os.close(read)  # closed on failure
+
+
+def test_watch_missing_file(tmp_path: Path, mocker: MockerFixture) -> None:
+    mocker.patch.object(_Inotify, "create", return_value=None)
+    path = tmp_path / "tox.ini"
+    changes = watch([path], debounce=0.05, interval=0.01)
+
+    _later(lambda: path.write_text("a"))
+    assert next(changes) == [path]
+    changes.close()
+
+
+@pytest.mark.usefixtures("source")
+def test_watch_skips_bursts_without_content_change(tmp_path: Path) -> None:
+    path = tmp_path / "tox.ini"
+    path.write_text("a")
+    changes = watch([path], debounce=0.05, interval=0.01)
+
+    def edit() -> None:
+        path.write_text("a")
+        _later(lambda: path.write_text("A"), delay=0.3)  # after the first burst settled
+
+    _later(edit)
+    assert next(changes) == [path]
+    assert path.read_text() == "A"
+    changes.close()